@@ -1,9 +1,14 @@
 from enum import Enum
-import heapq
+import asyncio
+import os
+import threading
+import time
 from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from typing import Callable, Optional
 
 class TaskType(Enum):
     CPU = "CPU"
@@ -21,6 +26,7 @@ class Task:
     started_at: Optional[datetime] = None    # When it started running (None until it runs)
     completed_at: Optional[datetime] = None  # When it finished (None until done)
     execution_time: Optional[float] = None   # How long it took in seconds
+    error: Optional[str] = None              # Why it FAILED (None otherwise)
 
     def __post_init__(self):
         """Set created_at automatically when task is created."""
@@ -91,103 +97,634 @@ class TaskQueue:
         return f"TaskQueue(size={self.size()}, tasks={task_names})"
 
 class PriorityTaskQueue:
-    """Priority Queue using heapq - Lower priority number = Higher urgency"""
-    def __init__(self):
-        """Initialize empty priority queue."""
-        self._heap = []        # The heap (min-heap by default)
+    """
+    Priority Queue using a binary heap - Lower priority number = Higher urgency
+
+    Indexed heap: besides the heap list, a position map {task id: index in
+    the heap} is kept up to date on every swap. That makes finding a task
+    by id O(1), so it can be cancelled or reprioritized in O(log n) by
+    sifting just that one entry - no O(n) scan and no full re-heapify.
+    Cancelled entries are removed right away (swap with the last entry,
+    sift), so there are no dead entries to skip or compact later.
+
+    Aging (aging_rate > 0): a waiting task's effective priority improves by
+    aging_rate levels per second, so a stream of urgent tasks can't starve
+    the low-priority ones forever:
+
+        effective = priority - aging_rate * (now - created)
+                  = (priority + aging_rate * created) - aging_rate * now
+
+    The last term is the same for every task, so ordering by the first
+    part - fixed when the task is enqueued - gives the same order at any
+    moment. The heap key is that fixed part: nothing is ever recomputed.
+    """
+    def __init__(self, aging_rate: float = 0.0):
+        """Initialize empty priority queue (aging_rate: levels per second of waiting)."""
+        if aging_rate < 0:
+            raise ValueError("aging_rate can't be negative")
+        self.aging_rate = aging_rate
+        self._heap = []        # The heap (min-heap): (key, counter, task) entries
+        self._index = {}       # task id → position of its entry in _heap
         self._counter = 0      # For tie-breaking (FIFO for same priority)
 
+    def _key(self, task: Task) -> float:
+        """Heap key: the priority, minus the aging credit (see class docstring)."""
+        if not self.aging_rate:
+            return task.priority
+        return task.priority + self.aging_rate * task.created_at.timestamp()
+
     def is_empty(self) -> bool:
         """Check if priority queue is empty."""
-        # TODO: Return True if _heap is empty
         return not self._heap
 
     def size(self) -> int:
         """Return number of tasks in queue."""
-        # TODO: Return length of _heap
         return len(self._heap)
 
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._index
+
+    def contains(self, task_id: str) -> bool:
+        """Is a task with this id waiting in the queue? O(1)"""
+        return task_id in self._index
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """The waiting task with this id, or None. O(1)"""
+        pos = self._index.get(task_id)
+        return None if pos is None else self._heap[pos][2]
+
     def enqueue(self, task: Task) -> None:
         """Add task to priority queue. Lower priority = higher urgency."""
-        # heapq uses tuples: (priority, counter, task)
-        # - priority: Task's priority (1=urgent, 5=low)
+        # Entries are tuples: (key, counter, task)
+        # - key: Task's priority (1=urgent, 5=low), adjusted for aging
         # - counter: Prevents comparison of Task objects (FIFO tie-breaker)
         # - task: The actual Task object
-
-        # TODO: 
-        # 1. Increment self._counter
-        # 2. Create entry: (task.priority, self._counter, task)
-        # 3. heapq.heappush(self._heap, entry)
-
+        if task.id in self._index:
+            raise ValueError(f"task {task.id} is already in the queue")
         self._counter += 1
-        entry = (task.priority, self._counter, task)
-        heapq.heappush(self._heap, entry)
+        self._heap.append((self._key(task), self._counter, task))
+        self._sift_up(len(self._heap) - 1)
 
     def dequeue(self) -> Optional[Task]:
         """Remove and return highest priority task (lowest number)."""
-        # TODO:
-        # 1. Check if empty (return None)
-        # 2. heapq.heappop(self._heap) returns (priority, counter, task)
-        # 3. Extract and return just the task
         if self.is_empty():
             return None
-
-        priority, counter, task = heapq.heappop(self._heap)
-        return task
+        return self._remove_at(0)
 
     def peek(self) -> Optional[Task]:
         """Look at highest priority task without removing."""
-        # TODO:
-        # 1. Check if empty (return None)
-        # 2. self._heap[0] is (priority, counter, task)
-        # 3. Extract and return just the task
         if self.is_empty():
             return None
         priority, counter, task = self._heap[0]
         return task
 
+    def cancel(self, task_id: str) -> Optional[Task]:
+        """Remove a waiting task by id and return it (None if not queued). O(log n)"""
+        pos = self._index.get(task_id)
+        if pos is None:
+            return None
+        return self._remove_at(pos)
+
+    def update_priority(self, task_id: str, priority: int) -> Optional[Task]:
+        """
+        Change a waiting task's priority and move it to its new place. O(log n)
+
+        It keeps its original counter: among tasks of the new priority it
+        goes where its arrival time puts it. Returns the task (None if not queued).
+        """
+        pos = self._index.get(task_id)
+        if pos is None:
+            return None
+        old_key, counter, task = self._heap[pos]
+        task.priority = priority
+        key = self._key(task)
+        self._heap[pos] = (key, counter, task)
+        if key < old_key:
+            self._sift_up(pos)
+        else:
+            self._sift_down(pos)
+        return task
+
+    def clear(self) -> None:
+        """Remove every task."""
+        self._heap.clear()
+        self._index.clear()
+
+    def _remove_at(self, pos: int) -> Task:
+        """Take out the entry at pos: move the last entry into the hole, re-sift it."""
+        heap = self._heap
+        task = heap[pos][2]
+        del self._index[task.id]
+        last = heap.pop()
+        if pos < len(heap):
+            heap[pos] = last
+            self._index[last[2].id] = pos
+            # The moved entry may belong above or below the hole
+            if pos > 0 and last < heap[(pos - 1) >> 1]:
+                self._sift_up(pos)
+            else:
+                self._sift_down(pos)
+        return task
+
+    def _sift_up(self, pos: int) -> None:
+        """Move the entry at pos up while it is smaller than its parent."""
+        heap, index = self._heap, self._index
+        entry = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not entry < heap[parent]:  # counters are unique: Tasks are never compared
+                break
+            heap[pos] = heap[parent]
+            index[heap[pos][2].id] = pos
+            pos = parent
+        heap[pos] = entry
+        index[entry[2].id] = pos
+
+    def _sift_down(self, pos: int) -> None:
+        """Move the entry at pos down while a child is smaller."""
+        heap, index = self._heap, self._index
+        size = len(heap)
+        entry = heap[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[pos] = heap[child]
+            index[heap[pos][2].id] = pos
+            pos = child
+        heap[pos] = entry
+        index[entry[2].id] = pos
+
     def __str__(self) -> str:
         """String representation for debugging."""
-        # TODO: Similar to TaskQueue but show priorities
         if self.is_empty():
             return "PriorityTaskQueue(empty)"
         # Extract task names and priorities
-        tasks_info = [(priority, task.name) for priority, counter, task in self._heap]
+        tasks_info = [(task.priority, task.name) for key, counter, task in self._heap]
         return f"PriorityTaskQueue(size={self.size()}, tasks={tasks_info})"
 
+
+class MultiLevelTaskQueue:
+    """
+    One PriorityTaskQueue per TaskType, shared out by weight.
+
+    With weights {CPU: 3, IO: 1}, while both levels have work, CPU tasks get
+    3 of every 4 dequeues - no level is starved by another's backlog.
+    Within a level, tasks come out by priority (with optional aging).
+
+    Weighted fair sharing by stride scheduling: each level has a "pass"
+    value that grows by 1/weight every time it is served, and the waiting
+    level with the lowest pass goes next. A level that was empty starts
+    again from the current pass, so idle time doesn't bank up credit.
+
+    Per-level wait metrics (time from creation to dequeue) are kept in
+    wait_stats(): count, total and max over every dequeue, and the p95 over
+    the last WAIT_SAMPLE_SIZE - memory stays fixed however long it runs.
+    """
+
+    WAIT_SAMPLE_SIZE = 1000
+
+    def __init__(self, weights: Optional[dict] = None, aging_rate: float = 0.0):
+        self.weights = {task_type: 1 for task_type in TaskType}
+        self.weights.update(weights or {})
+        if min(self.weights.values()) <= 0:
+            raise ValueError("weights must be positive")
+        self.levels = {task_type: PriorityTaskQueue(aging_rate) for task_type in TaskType}
+        self._pass = {task_type: 0.0 for task_type in TaskType}
+        self._virtual_time = 0.0   # pass of the level served last
+        self._waits = {task_type: self._new_waits() for task_type in TaskType}
+
+    def is_empty(self) -> bool:
+        return all(level.is_empty() for level in self.levels.values())
+
+    def size(self) -> int:
+        return sum(level.size() for level in self.levels.values())
+
+    def _level_with(self, task_id: str) -> Optional[PriorityTaskQueue]:
+        for level in self.levels.values():
+            if level.contains(task_id):
+                return level
+        return None
+
+    def __contains__(self, task_id: str) -> bool:
+        return self._level_with(task_id) is not None
+
+    def contains(self, task_id: str) -> bool:
+        return self._level_with(task_id) is not None
+
+    def get(self, task_id: str) -> Optional[Task]:
+        level = self._level_with(task_id)
+        return level.get(task_id) if level else None
+
+    def enqueue(self, task: Task) -> None:
+        """Add task to its type's level."""
+        if self.contains(task.id):
+            raise ValueError(f"task {task.id} is already in the queue")
+        level = self.levels[task.task_type]
+        if level.is_empty():
+            # Waking up: no credit for the time it had nothing to do
+            self._pass[task.task_type] = max(self._pass[task.task_type], self._virtual_time)
+        level.enqueue(task)
+
+    def _next_type(self) -> Optional[TaskType]:
+        """The waiting level with the lowest pass (ties: TaskType order)."""
+        waiting = [task_type for task_type, level in self.levels.items() if not level.is_empty()]
+        if not waiting:
+            return None
+        return min(waiting, key=self._pass.__getitem__)
+
+    def dequeue(self) -> Optional[Task]:
+        """Remove and return the next task from the level whose turn it is."""
+        task_type = self._next_type()
+        if task_type is None:
+            return None
+        task = self.levels[task_type].dequeue()
+        self.record_dequeue(task_type, (datetime.now() - task.created_at).total_seconds())
+        return task
+
+    def record_dequeue(self, task_type: TaskType, wait: Optional[float] = None) -> None:
+        """Charge a level for one dequeue (also used to replay a logged one)."""
+        self._virtual_time = self._pass[task_type]
+        self._pass[task_type] += 1 / self.weights[task_type]
+        if wait is not None:
+            waits = self._waits[task_type]
+            waits["count"] += 1
+            waits["total"] += wait
+            waits["max"] = max(waits["max"], wait)
+            waits["recent"].append(wait)
+
+    def _new_waits(self, saved: Optional[dict] = None) -> dict:
+        """Wait metrics for one level: empty, or as saved by scheduler_state()."""
+        saved = saved or {}
+        return {"count": saved.get("count", 0), "total": saved.get("total", 0.0),
+                "max": saved.get("max", 0.0),
+                "recent": deque(saved.get("recent", ()), maxlen=self.WAIT_SAMPLE_SIZE)}
+
+    def scheduler_state(self) -> dict:
+        """The pass values and wait metrics, as JSON-friendly data for a snapshot."""
+        return {
+            "pass": {task_type.value: value for task_type, value in self._pass.items()},
+            "virtual_time": self._virtual_time,
+            "waits": {task_type.value: {**waits, "recent": list(waits["recent"])}
+                      for task_type, waits in self._waits.items()},
+        }
+
+    def restore_scheduler_state(self, state: dict) -> None:
+        """Put back pass values and wait metrics saved by scheduler_state()."""
+        for value, pass_value in state.get("pass", {}).items():
+            self._pass[TaskType(value)] = pass_value
+        self._virtual_time = state.get("virtual_time", 0.0)
+        for value, waits in state.get("waits", {}).items():
+            self._waits[TaskType(value)] = self._new_waits(waits)
+
+    def peek(self) -> Optional[Task]:
+        task_type = self._next_type()
+        return None if task_type is None else self.levels[task_type].peek()
+
+    def cancel(self, task_id: str) -> Optional[Task]:
+        level = self._level_with(task_id)
+        return level.cancel(task_id) if level else None
+
+    def update_priority(self, task_id: str, priority: int) -> Optional[Task]:
+        level = self._level_with(task_id)
+        return level.update_priority(task_id, priority) if level else None
+
+    def clear(self) -> None:
+        for level in self.levels.values():
+            level.clear()
+
+    def wait_stats(self) -> dict:
+        """{TaskType: {"dequeued", "avg_wait", "max_wait", "p95_wait"}} in seconds."""
+        stats = {}
+        for task_type, waits in self._waits.items():
+            if waits["count"]:
+                recent = sorted(waits["recent"])
+                stats[task_type] = {
+                    "dequeued": waits["count"],
+                    "avg_wait": waits["total"] / waits["count"],
+                    "max_wait": waits["max"],
+                    "p95_wait": recent[min(len(recent) - 1, int(len(recent) * 0.95))],
+                }
+        return stats
+
+    def __str__(self) -> str:
+        sizes = {task_type.value: level.size() for task_type, level in self.levels.items()}
+        weights = {task_type.value: weight for task_type, weight in self.weights.items()}
+        return f"MultiLevelTaskQueue(size={self.size()}, levels={sizes}, weights={weights})"
+
+# ============================================================================
+# Executor - actually run the tasks
+# ============================================================================
+# Each TaskType goes where that kind of work runs best:
+#   CPU     → process pool: one process per core, no GIL in the way
+#   IO      → thread pool:  threads wait on disks in parallel (the GIL is
+#             released while blocked)
+#   NETWORK → asyncio loop: thousands of sockets waiting in one thread
+# Each has its own concurrency limit, so a flood of one type can't starve
+# the others.
+
+DEFAULT_LIMITS = {
+    TaskType.CPU: os.cpu_count() or 1,
+    TaskType.IO: 32,
+    TaskType.NETWORK: 100,
+}
+
+
+def _timed_call(func, args):
+    """Run func(*args) in a worker; returns (result, error, start, end) timestamps."""
+    start = time.time()
+    try:
+        return func(*args), None, start, time.time()
+    except Exception as e:
+        return None, e, start, time.time()
+
+
+class TaskExecutor:
+    """
+    Runs Task work for real: CPU → processes, IO → threads, NETWORK → asyncio.
+
+    submit(task, func, *args) starts func(*args) and returns a Future with
+    its return value. CPU work must be picklable (a module-level function),
+    NETWORK work must be an async function. Before the Future finishes, the
+    task gets status COMPLETED/FAILED and real started_at, completed_at and
+    execution_time (started_at is when a worker picked it up, not when it
+    was submitted).
+
+    Usage:
+        with TaskExecutor({TaskType.CPU: 4}) as executor:
+            future = executor.submit(task, crunch_numbers, 10_000)
+        print(task)   # COMPLETED ✅ - Execution Time: (1.23s)
+    """
+
+    def __init__(self, limits: Optional[dict] = None):
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        for task_type, limit in self.limits.items():
+            if limit < 1:
+                raise ValueError(f"{task_type.value} limit must be at least 1")
+        # Pools and the event loop start on first use
+        self._processes = None
+        self._threads = None
+        self._loop = None
+        self._loop_thread = None
+        self._network_slots = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def submit(self, task: Task, func: Callable, *args) -> Future:
+        """Start running func(*args) for task on the right pool for its type."""
+        if task.task_type == TaskType.NETWORK:
+            if not asyncio.iscoroutinefunction(func):
+                raise TypeError("NETWORK tasks need an async function")
+            inner = asyncio.run_coroutine_threadsafe(self._run_async(func, args), self._event_loop())
+        elif task.task_type == TaskType.CPU:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(self.limits[TaskType.CPU])
+            inner = self._processes.submit(_timed_call, func, args)
+        else:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.limits[TaskType.IO],
+                                                   thread_name_prefix="io-task")
+            inner = self._threads.submit(_timed_call, func, args)
+
+        task.status = "RUNNING"
+        outer = Future()
+        with self._lock:
+            self._pending.add(outer)
+        inner.add_done_callback(partial(self._finish, task, outer))
+        return outer
+
+    def _event_loop(self):
+        """The asyncio loop for NETWORK tasks, running in its own thread."""
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                                 name="network-tasks", daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    async def _run_async(self, func, args):
+        if self._network_slots is None:  # created inside the loop it belongs to
+            self._network_slots = asyncio.Semaphore(self.limits[TaskType.NETWORK])
+        async with self._network_slots:
+            start = time.time()
+            try:
+                return await func(*args), None, start, time.time()
+            except Exception as e:
+                return None, e, start, time.time()
+
+    def _finish(self, task, outer, inner):
+        """Stamp the task with the real timings, then resolve the caller's Future."""
+        try:
+            result, error, start, end = inner.result()
+        except Exception as e:  # the worker itself broke (e.g. func can't be pickled)
+            result, error, start, end = None, e, None, time.time()
+        if start is not None:
+            task.started_at = datetime.fromtimestamp(start)
+            task.execution_time = end - start
+        task.completed_at = datetime.fromtimestamp(end)
+        task.status = "FAILED" if error else "COMPLETED"
+        task.error = repr(error) if error else None
+
+        with self._lock:
+            self._pending.discard(outer)
+        if error:
+            outer.set_exception(error)
+        else:
+            outer.set_result(result)
+
+    def shutdown(self, wait_for_tasks: bool = True) -> None:
+        """Stop the pools and the event loop (after running tasks finish)."""
+        if wait_for_tasks:
+            with self._lock:
+                pending = list(self._pending)
+            wait(pending)
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait_for_tasks)
+            self._processes = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=wait_for_tasks)
+            self._threads = None
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = self._loop_thread = self._network_slots = None
+
+
+# Simulated work for the CLI `run` command (module-level so processes can use it)
+
+def burn_cpu(seconds: float) -> int:
+    """Busy-loop for about `seconds` of CPU time; returns the loop count."""
+    deadline = time.perf_counter() + seconds
+    loops = 0
+    while time.perf_counter() < deadline:
+        loops += 1
+    return loops
+
+
+def simulate_work(task: Task, seconds: float = 0.5):
+    """(func, args) standing in for real work of the task's type."""
+    if task.task_type == TaskType.CPU:
+        return burn_cpu, (seconds,)
+    if task.task_type == TaskType.IO:
+        return time.sleep, (seconds,)
+    return asyncio.sleep, (seconds,)
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
 
 import argparse
 import json
-import os
 from pathlib import Path
 
+FSYNC_POLICIES = ("always", "interval", "never")
+
+
+def _fsync_dir(path: str) -> None:
+    """fsync the directory holding path, so a rename inside it is on disk too."""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:  # Windows can't open a directory
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _task_to_dict(task: Task) -> dict:
+    """Task → JSON-ready dict."""
+    return {
+        "id": task.id,
+        "name": task.name,
+        "task_type": task.task_type.value,
+        "priority": task.priority,
+        "status": task.status,
+        "created_at": task.created_at.isoformat() if task.created_at else None,
+        "started_at": task.started_at.isoformat() if task.started_at else None,
+        "completed_at": task.completed_at.isoformat() if task.completed_at else None,
+        "execution_time": task.execution_time,
+        "error": task.error
+    }
+
+
+def _task_from_dict(task_data: dict) -> Task:
+    """JSON dict → Task (the reverse of _task_to_dict)."""
+    return Task(
+        id=task_data["id"],
+        name=task_data["name"],
+        task_type=TaskType[task_data["task_type"]],
+        priority=task_data["priority"],
+        status=task_data["status"],
+        created_at=datetime.fromisoformat(task_data["created_at"]) if task_data.get("created_at") else None,
+        started_at=datetime.fromisoformat(task_data["started_at"]) if task_data.get("started_at") else None,
+        completed_at=datetime.fromisoformat(task_data["completed_at"]) if task_data.get("completed_at") else None,
+        execution_time=task_data.get("execution_time"),
+        error=task_data.get("error")
+    )
+
 
 class TaskManager:
-    """Manages tasks with both FIFO and Priority queues, includes persistence."""
+    """
+    Manages tasks with both FIFO and Priority queues, includes persistence.
+    
+    Persistence is a snapshot (tasks.json) plus a write-ahead log
+    (tasks.json.wal). Every change appends one small JSON line to the log
+    instead of rewriting the whole file:
+    
+        {"seq": 42, "op": "enqueue", "task": {...}, "counter": 17}
+        {"seq": 43, "op": "dequeue", "id": "3", "at": "..."}
+        {"seq": 44, "op": "start", "task": {...}}
+        {"seq": 45, "op": "complete", "task": {...}}     (or "fail")
+        {"seq": 46, "op": "cancel", "id": "5"}
+        {"seq": 47, "op": "priority", "id": "6", "priority": 1}
+        {"seq": 48, "op": "clear"}
+    
+    Every `snapshot_every` records, save() writes a fresh snapshot and
+    empties the log (compaction). load() reads the snapshot and replays
+    the log on top of it:
+    - The snapshot is written to a temp file and renamed over the old one,
+      so it is never half-written.
+    - The snapshot stores the last seq it includes; older log records are
+      skipped, so a crash between the rename and emptying the log is safe.
+    - A half-written last record (crash in the middle of a write) is dropped.
     
-    def __init__(self, filepath: str = "tasks.json", mode: str = "priority"):
+    fsync policy (when the log is forced from the OS cache to disk):
+    - "always":   after every change - nothing lost even on power failure
+    - "interval": at most every `fsync_interval` seconds (and on close)
+    - "never":    leave it to the OS
+    Records are flushed to the OS after every change in all three, so a
+    crash of the program itself never loses a change.
+    """
+    
+    def __init__(self, filepath: str = "tasks.json", mode: str = "priority",
+                 fsync: str = "interval", fsync_interval: float = 1.0,
+                 snapshot_every: int = 1000, aging_rate: float = 0.0,
+                 weights: Optional[dict] = None):
         """
         Initialize Task Manager.
         
         Args:
-            filepath: Path to JSON file for persistence
-            mode: 'fifo' for FIFO queue, 'priority' for priority queue
+            filepath: Path to JSON file for persistence (the log is filepath + ".wal")
+            mode: 'fifo' for FIFO queue, 'priority' for priority queue,
+                  'fair' for one priority queue per task type shared by weight
+            fsync: 'always', 'interval' or 'never' (see class docstring)
+            fsync_interval: Seconds between fsyncs for fsync='interval'
+            snapshot_every: Log records before the log is compacted into the snapshot
+            aging_rate: Priority levels a task gains per second of waiting ('priority'/'fair')
+            weights: {TaskType: weight} for 'fair' mode (default: 1 each)
         """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}")
         self.filepath = filepath
+        self.wal_path = filepath + ".wal"
         self.mode = mode
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
         self._task_counter = 0
+        self._seq = 0              # seq of the last change (logged or in the snapshot)
+        self._wal = None           # log file, opened on the first change
+        self._wal_records = 0      # records in the log since the last snapshot
+        self._last_fsync = time.monotonic()
         
         if mode == "fifo":
             self.queue = TaskQueue()
+        elif mode == "fair":
+            self.queue = MultiLevelTaskQueue(weights, aging_rate)
         else:
-            self.queue = PriorityTaskQueue()
+            self.queue = PriorityTaskQueue(aging_rate)
         
+        self.running_tasks = {}    # id → Task, taken from the queue and started
         self.completed_tasks = []
+        self._lock = threading.Lock()  # run_pending logs from the executor's threads
         self.load()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self) -> None:
+        """Sync and close the log."""
+        if self._wal is not None:
+            if self.fsync != "never":
+                os.fsync(self._wal.fileno())
+            self._wal.close()
+            self._wal = None
+    
     def add_task(self, name: str, task_type: str, priority: int) -> Task:
         """Add a new task to the queue."""
         self._task_counter += 1
@@ -199,14 +736,35 @@ class TaskManager:
             priority=priority
         )
         self.queue.enqueue(task)
-        self.save()
+        self._log({"op": "enqueue", "task": _task_to_dict(task), "counter": self._task_counter})
         return task
     
     def get_next_task(self) -> Optional[Task]:
         """Get (and remove) the next task from the queue."""
         task = self.queue.dequeue()
         if task:
-            self.save()
+            self._log({"op": "dequeue", "id": task.id, "at": datetime.now().isoformat()})
+        return task
+    
+    def start_task(self, task: Task) -> None:
+        """Mark a task (taken with get_next_task) as running."""
+        task.status = "RUNNING"
+        task.started_at = datetime.now()
+        self.running_tasks[task.id] = task
+        self._log({"op": "start", "task": _task_to_dict(task)})
+    
+    def cancel_task(self, task_id: str) -> Optional[Task]:
+        """Remove a pending task by id. Returns it, or None if it isn't pending."""
+        task = self._remove_pending(task_id)
+        if task:
+            self._log({"op": "cancel", "id": task_id})
+        return task
+    
+    def reprioritize_task(self, task_id: str, priority: int) -> Optional[Task]:
+        """Change a pending task's priority. Returns it, or None if it isn't pending."""
+        task = self._set_priority(task_id, priority)
+        if task:
+            self._log({"op": "priority", "id": task_id, "priority": priority})
         return task
     
     def peek_next_task(self) -> Optional[Task]:
@@ -219,14 +777,81 @@ class TaskManager:
         task.completed_at = datetime.now()
         if task.started_at:
             task.execution_time = (task.completed_at - task.started_at).total_seconds()
+        self.running_tasks.pop(task.id, None)
         self.completed_tasks.append(task)
-        self.save()
+        self._log({"op": "complete", "task": _task_to_dict(task)})
+    
+    def run_pending(self, work: Callable = simulate_work, limits: Optional[dict] = None,
+                    on_done: Optional[Callable] = None) -> list:
+        """
+        Run every pending task for real on a TaskExecutor.
+        
+        Tasks are dequeued in queue order (by priority in priority mode) and
+        all submitted at once; the per-type limits decide how many of each
+        run at the same time.
+        
+        Each task is logged as started when it is submitted and as completed
+        (or failed) the moment it finishes, so a crash part way through loses
+        nothing: reloading shows which tasks finished and which were running.
+        
+        Args:
+            work: work(task) -> (func, args), the work to run for a task
+            limits: {TaskType: max running} overrides for DEFAULT_LIMITS
+            on_done: called with each task as it finishes (one at a time)
+        
+        Returns:
+            The finished tasks (COMPLETED or FAILED), in the order they were run
+        """
+        def record_finish(task):
+            with self._lock:
+                self.running_tasks.pop(task.id, None)
+                self.completed_tasks.append(task)
+                self._log({"op": "fail" if task.status == "FAILED" else "complete",
+                           "task": _task_to_dict(task)})
+                if on_done:
+                    on_done(task)
+        
+        def finished(task, recorded, _):
+            try:
+                record_finish(task)
+            finally:
+                recorded.set_result(task)
+        
+        tasks = []
+        recorded = []  # resolved once each task's result is in the log
+        with TaskExecutor(limits) as executor:
+            while True:
+                with self._lock:
+                    task = self.get_next_task()
+                    if task is None:
+                        break
+                    self.start_task(task)
+                try:
+                    func, args = work(task)
+                    future = executor.submit(task, func, *args)
+                except Exception as e:
+                    # Never submitted: close its "start" record, and let the
+                    # tasks already running finish and be logged before raising
+                    task.status = "FAILED"
+                    task.error = repr(e)
+                    task.completed_at = datetime.now()
+                    record_finish(task)
+                    wait(recorded)
+                    raise
+                tasks.append(task)
+                recorded.append(Future())
+                future.add_done_callback(partial(finished, task, recorded[-1]))
+            wait(recorded)
+        return tasks
     
     def get_all_tasks(self) -> list:
         """Get all pending tasks (doesn't remove them)."""
         if isinstance(self.queue, PriorityTaskQueue):
             # Extract tasks from heap
             return [task for _, _, task in self.queue._heap]
+        elif isinstance(self.queue, MultiLevelTaskQueue):
+            # Extract tasks from every level's heap
+            return [task for level in self.queue.levels.values() for _, _, task in level._heap]
         else:
             # Extract tasks from deque
             return list(self.queue.queue)
@@ -234,11 +859,8 @@ class TaskManager:
     def clear_all(self) -> int:
         """Clear all pending tasks."""
         count = self.queue.size()
-        if isinstance(self.queue, PriorityTaskQueue):
-            self.queue._heap.clear()
-        else:
-            self.queue.queue.clear()
-        self.save()
+        self._clear_pending()
+        self._log({"op": "clear"})
         return count
     
     def get_statistics(self) -> dict:
@@ -270,190 +892,391 @@ class TaskManager:
             exec_times = [t.execution_time for t in self.completed_tasks if t.execution_time]
             if exec_times:
                 stats["avg_execution_time"] = sum(exec_times) / len(exec_times)
+            
+            # Queue wait per task type: created → started
+            waits = {}
+            for t in self.completed_tasks:
+                if t.started_at and t.created_at:
+                    waits.setdefault(t.task_type.value, []).append(
+                        (t.started_at - t.created_at).total_seconds())
+            if waits:
+                stats["wait_by_type"] = {
+                    task_type: {"count": len(w), "avg_wait": sum(w) / len(w), "max_wait": max(w)}
+                    for task_type, w in waits.items()
+                }
+        
+        if isinstance(self.queue, MultiLevelTaskQueue):
+            # Queue wait per level: created → dequeued (fair mode keeps these)
+            queue_waits = self.queue.wait_stats()
+            if queue_waits:
+                stats["queue_wait_by_type"] = {task_type.value: level
+                                               for task_type, level in queue_waits.items()}
         
         return stats
     
+    # ------------------------------------------------------------------
+    # Persistence: write-ahead log + snapshots
+    # ------------------------------------------------------------------
+    
+    def _log(self, *events: dict) -> None:
+        """Append change records to the write-ahead log (one JSON line each)."""
+        if not events:
+            return
+        if self._wal is None:
+            self._wal = open(self.wal_path, "a", encoding="utf-8")
+        lines = []
+        for event in events:
+            self._seq += 1
+            lines.append(json.dumps({"seq": self._seq, **event}) + "\n")
+        self._wal.write("".join(lines))
+        self._wal.flush()  # in the OS now: survives this process crashing
+        self._wal_records += len(events)
+        
+        now = time.monotonic()
+        if self.fsync == "always" or (self.fsync == "interval"
+                                      and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._wal.fileno())
+            self._last_fsync = now
+        if self._wal_records >= self.snapshot_every:
+            self.save()
+    
     def save(self) -> None:
-        """Save tasks to JSON file."""
+        """Write a full snapshot of all tasks and empty the log (compaction)."""
         data = {
             "mode": self.mode,
             "task_counter": self._task_counter,
-            "pending_tasks": [],
-            "completed_tasks": []
+            "last_seq": self._seq,
+            "pending_tasks": [_task_to_dict(task) for task in self._pending_in_order()],
+            "running_tasks": [_task_to_dict(task) for task in self.running_tasks.values()],
+            "completed_tasks": [_task_to_dict(task) for task in self.completed_tasks]
         }
+        if isinstance(self.queue, MultiLevelTaskQueue):
+            data["scheduler"] = self.queue.scheduler_state()
         
-        # Save pending tasks
-        for task in self.get_all_tasks():
-            data["pending_tasks"].append({
-                "id": task.id,
-                "name": task.name,
-                "task_type": task.task_type.value,
-                "priority": task.priority,
-                "status": task.status,
-                "created_at": task.created_at.isoformat() if task.created_at else None,
-                "started_at": task.started_at.isoformat() if task.started_at else None,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                "execution_time": task.execution_time
-            })
-        
-        # Save completed tasks
-        for task in self.completed_tasks:
-            data["completed_tasks"].append({
-                "id": task.id,
-                "name": task.name,
-                "task_type": task.task_type.value,
-                "priority": task.priority,
-                "status": task.status,
-                "created_at": task.created_at.isoformat() if task.created_at else None,
-                "started_at": task.started_at.isoformat() if task.started_at else None,
-                "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                "execution_time": task.execution_time
-            })
-        
-        with open(self.filepath, 'w') as f:
+        # Write aside, then rename: a crash leaves either the old or the new snapshot
+        tmp_path = self.filepath + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(data, f, indent=2)
+            f.flush()
+            if self.fsync != "never":
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.filepath)
+        if self.fsync != "never":
+            # The rename must be on disk before the log is emptied, or a
+            # crash could lose both
+            _fsync_dir(self.filepath)
+        
+        # Everything logged so far is in the snapshot (up to last_seq)
+        if self._wal is not None:
+            self._wal.close()
+        self._wal = open(self.wal_path, "w", encoding="utf-8")
+        self._wal_records = 0
+    
+    def _pending_in_order(self) -> list:
+        """Pending tasks in the order they'll be dequeued (keeps FIFO ties on reload)."""
+        if isinstance(self.queue, TaskQueue):
+            return list(self.queue.queue)
+        levels = self.queue.levels.values() if isinstance(self.queue, MultiLevelTaskQueue) else [self.queue]
+        return [task for level in levels
+                for _, _, task in sorted(level._heap, key=lambda entry: entry[:2])]
     
     def load(self) -> None:
-        """Load tasks from JSON file."""
-        if not os.path.exists(self.filepath):
+        """Load the snapshot, then replay the write-ahead log on top of it."""
+        if os.path.exists(self.filepath):
+            try:
+                with open(self.filepath, 'r') as f:
+                    data = json.load(f)
+                
+                self.mode = data.get("mode", self.mode)
+                self._task_counter = data.get("task_counter", 0)
+                self._seq = data.get("last_seq", 0)
+                
+                for task_data in data.get("pending_tasks", []):
+                    self.queue.enqueue(_task_from_dict(task_data))
+                if isinstance(self.queue, MultiLevelTaskQueue):
+                    self.queue.restore_scheduler_state(data.get("scheduler", {}))
+                for task_data in data.get("running_tasks", []):
+                    task = _task_from_dict(task_data)
+                    self.running_tasks[task.id] = task
+                for task_data in data.get("completed_tasks", []):
+                    self.completed_tasks.append(_task_from_dict(task_data))
+            
+            except (json.JSONDecodeError, KeyError) as e:
+                print(f"⚠️  Warning: Could not load tasks: {e}")
+        
+        self._replay()
+    
+    def _replay(self) -> None:
+        """Apply the log records newer than the snapshot."""
+        if not os.path.exists(self.wal_path):
             return
+        with open(self.wal_path, 'rb') as f:
+            content = f.read()
         
-        try:
-            with open(self.filepath, 'r') as f:
-                data = json.load(f)
-            
-            self.mode = data.get("mode", self.mode)
-            self._task_counter = data.get("task_counter", 0)
-            
-            # Load pending tasks
-            for task_data in data.get("pending_tasks", []):
-                task = Task(
-                    id=task_data["id"],
-                    name=task_data["name"],
-                    task_type=TaskType[task_data["task_type"]],
-                    priority=task_data["priority"],
-                    status=task_data["status"],
-                    created_at=datetime.fromisoformat(task_data["created_at"]) if task_data.get("created_at") else None,
-                    started_at=datetime.fromisoformat(task_data["started_at"]) if task_data.get("started_at") else None,
-                    completed_at=datetime.fromisoformat(task_data["completed_at"]) if task_data.get("completed_at") else None,
-                    execution_time=task_data.get("execution_time")
-                )
-                self.queue.enqueue(task)
-            
-            # Load completed tasks
-            for task_data in data.get("completed_tasks", []):
-                task = Task(
-                    id=task_data["id"],
-                    name=task_data["name"],
-                    task_type=TaskType[task_data["task_type"]],
-                    priority=task_data["priority"],
-                    status=task_data["status"],
-                    created_at=datetime.fromisoformat(task_data["created_at"]) if task_data.get("created_at") else None,
-                    started_at=datetime.fromisoformat(task_data["started_at"]) if task_data.get("started_at") else None,
-                    completed_at=datetime.fromisoformat(task_data["completed_at"]) if task_data.get("completed_at") else None,
-                    execution_time=task_data.get("execution_time")
-                )
-                self.completed_tasks.append(task)
+        # Only complete lines count: whatever follows the last newline is a
+        # record that was being written when the program died
+        lines = content.split(b"\n")
+        torn = lines.pop()
+        for number, line in enumerate(lines, 1):
+            try:
+                event = json.loads(line)
+                if event["seq"] > self._seq:
+                    self._apply(event)
+                    self._seq = event["seq"]
+                    self._wal_records += 1
+            except (ValueError, KeyError) as e:
+                print(f"⚠️  Warning: Skipping bad record {number} in {self.wal_path}: {e}")
         
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"⚠️  Warning: Could not load tasks: {e}")
+        if torn:
+            print(f"⚠️  Warning: Dropping a half-written record at the end of {self.wal_path}")
+            with open(self.wal_path, 'r+b') as f:
+                f.truncate(len(content) - len(torn))
+        if self._wal_records >= self.snapshot_every:
+            self.save()
+    
+    def _apply(self, event: dict) -> None:
+        """Redo one logged change."""
+        op = event["op"]
+        if op == "enqueue":
+            self.queue.enqueue(_task_from_dict(event["task"]))
+            self._task_counter = max(self._task_counter, event.get("counter", 0))
+        elif op == "dequeue":
+            task = self._remove_pending(event["id"])
+            if task and isinstance(self.queue, MultiLevelTaskQueue):
+                # Keep the shares going, and the wait metrics up to date
+                wait = None
+                if "at" in event:
+                    wait = (datetime.fromisoformat(event["at"]) - task.created_at).total_seconds()
+                self.queue.record_dequeue(task.task_type, wait)
+        elif op == "start":
+            task = _task_from_dict(event["task"])
+            self.running_tasks[task.id] = task
+        elif op in ("complete", "fail"):
+            task = _task_from_dict(event["task"])
+            self.running_tasks.pop(task.id, None)
+            self.completed_tasks.append(task)
+        elif op == "cancel":
+            self._remove_pending(event["id"])
+        elif op == "priority":
+            self._set_priority(event["id"], event["priority"])
+        elif op == "clear":
+            self._clear_pending()
+        else:
+            raise KeyError(f"unknown op {op!r}")
+    
+    def _remove_pending(self, task_id: str) -> Optional[Task]:
+        """Take a task out of the queue by id."""
+        if not isinstance(self.queue, TaskQueue):
+            return self.queue.cancel(task_id)
+        head = self.queue.peek()
+        if head is not None and head.id == task_id:
+            return self.queue.dequeue()
+        for task in self.queue.queue:
+            if task.id == task_id:
+                self.queue.queue.remove(task)
+                return task
+        return None
+    
+    def _set_priority(self, task_id: str, priority: int) -> Optional[Task]:
+        """Change a pending task's priority (FIFO mode: stored, order unchanged)."""
+        if not isinstance(self.queue, TaskQueue):
+            return self.queue.update_priority(task_id, priority)
+        for task in self.queue.queue:
+            if task.id == task_id:
+                task.priority = priority
+                return task
+        return None
+    
+    def _clear_pending(self) -> None:
+        if isinstance(self.queue, TaskQueue):
+            self.queue.queue.clear()
+        else:
+            self.queue.clear()
+
+
+def parse_weights(text: str) -> dict:
+    """'CPU=3,IO=1' → {TaskType.CPU: 3.0, TaskType.IO: 1.0} (for --weights)."""
+    weights = {}
+    try:
+        for part in text.split(','):
+            name, _, value = part.partition('=')
+            weights[TaskType[name.strip().upper()]] = float(value)
+    except (KeyError, ValueError):
+        raise argparse.ArgumentTypeError(f"expected TYPE=WEIGHT,... (e.g. CPU=3,IO=1), got {text!r}")
+    if min(weights.values()) <= 0:
+        raise argparse.ArgumentTypeError("weights must be positive")
+    return weights
+
+
+def open_manager(args) -> TaskManager:
+    """
+    TaskManager with the global CLI options.
+    
+    Use it as `with open_manager(args) as manager:` - closing syncs the log.
+    """
+    return TaskManager(mode=args.mode, fsync=args.fsync, aging_rate=args.aging,
+                       weights=args.weights)
 
 
 def cmd_add(args):
     """Add a new task."""
-    manager = TaskManager(mode=args.mode)
-    task = manager.add_task(args.name, args.type, args.priority)
-    print(f"✅ Task added: {task}")
+    with open_manager(args) as manager:
+        task = manager.add_task(args.name, args.type, args.priority)
+        print(f"✅ Task added: {task}")
 
 
 def cmd_list(args):
     """List all pending tasks."""
-    manager = TaskManager(mode=args.mode)
-    tasks = manager.get_all_tasks()
-    
-    if not tasks:
-        print("📭 No pending tasks!")
-        return
-    
-    print(f"\n📋 Pending Tasks ({len(tasks)}) - Mode: {manager.mode.upper()}")
-    print("=" * 60)
-    for task in tasks:
-        print(f"  {task}")
-    print()
+    with open_manager(args) as manager:
+        tasks = manager.get_all_tasks()
+        
+        if not tasks:
+            print("📭 No pending tasks!")
+            return
+        
+        print(f"\n📋 Pending Tasks ({len(tasks)}) - Mode: {manager.mode.upper()}")
+        print("=" * 60)
+        for task in tasks:
+            print(f"  {task}")
+        print()
 
 
 def cmd_next(args):
     """Get the next task."""
-    manager = TaskManager(mode=args.mode)
-    
-    if args.peek:
-        task = manager.peek_next_task()
-        action = "Next task (not removed)"
-    else:
-        task = manager.get_next_task()
-        action = "Got next task"
-    
-    if task:
-        print(f"🎯 {action}:")
-        print(f"  {task}")
+    with open_manager(args) as manager:
+        if args.peek:
+            task = manager.peek_next_task()
+            action = "Next task (not removed)"
+        else:
+            task = manager.get_next_task()
+            action = "Got next task"
         
-        if not args.peek and args.start:
-            task.status = "RUNNING"
-            task.started_at = datetime.now()
-            manager.save()
-            print(f"  ▶️  Started at {task.started_at.strftime('%H:%M:%S')}")
-    else:
-        print("📭 No tasks in queue!")
+        if task:
+            print(f"🎯 {action}:")
+            print(f"  {task}")
+        
+            if not args.peek and args.start:
+                manager.start_task(task)
+                print(f"  ▶️  Started at {task.started_at.strftime('%H:%M:%S')}")
+        else:
+            print("📭 No tasks in queue!")
 
 
 def cmd_complete(args):
     """Mark current task as complete."""
-    manager = TaskManager(mode=args.mode)
-    
-    # This is simplified - in a real app, you'd track "current" task
-    # For now, we complete the next task
-    task = manager.get_next_task()
-    if task:
-        if not task.started_at:
-            task.started_at = datetime.now()
-        manager.complete_task(task)
-        print(f"✅ Task completed: {task}")
-    else:
-        print("📭 No tasks to complete!")
+    with open_manager(args) as manager:
+        # This is simplified - in a real app, you'd track "current" task
+        # For now, we complete the next task
+        task = manager.get_next_task()
+        if task:
+            if not task.started_at:
+                task.started_at = datetime.now()
+            manager.complete_task(task)
+            print(f"✅ Task completed: {task}")
+        else:
+            print("📭 No tasks to complete!")
+
+
+def cmd_run(args):
+    """Run all pending tasks (simulated work) in parallel."""
+    with open_manager(args) as manager:
+        count = manager.queue.size()
+        if not count:
+            print("📭 No tasks to run!")
+            return
+        
+        limits = {
+            TaskType.CPU: args.cpu_workers or DEFAULT_LIMITS[TaskType.CPU],
+            TaskType.IO: args.io_workers,
+            TaskType.NETWORK: args.network_limit,
+        }
+        print(f"🚀 Running {count} tasks (CPU: {limits[TaskType.CPU]} processes, "
+              f"IO: {limits[TaskType.IO]} threads, NETWORK: {limits[TaskType.NETWORK]} at once)")
+        start = time.perf_counter()
+        tasks = manager.run_pending(partial(simulate_work, seconds=args.duration), limits,
+                                    on_done=lambda task: print(f"  {task}"))
+        elapsed = time.perf_counter() - start
+        
+        busy = sum(task.execution_time or 0 for task in tasks)
+        failed = sum(task.status == "FAILED" for task in tasks)
+        print(f"\n⏱️  {len(tasks)} tasks in {elapsed:.2f}s "
+              f"({busy:.2f}s of work, {busy / elapsed:.1f}x parallel)")
+        if failed:
+            print(f"❌ {failed} failed")
 
 
 def cmd_stats(args):
     """Show queue statistics."""
-    manager = TaskManager(mode=args.mode)
-    stats = manager.get_statistics()
-    
-    print(f"\n📊 Task Queue Statistics - Mode: {stats['mode'].upper()}")
-    print("=" * 60)
-    print(f"  Total tasks: {stats['total_count']}")
-    print(f"  Pending: {stats['pending_count']}")
-    print(f"  Completed: {stats['completed_count']}")
-    
-    if "task_types" in stats:
-        print(f"\n  Task Types:")
-        for task_type, count in stats["task_types"].items():
-            print(f"    {task_type}: {count}")
-    
-    if "avg_priority" in stats:
-        print(f"\n  Priority Stats:")
-        print(f"    Average: {stats['avg_priority']:.2f}")
-        print(f"    Range: {stats['min_priority']}-{stats['max_priority']}")
-    
-    if "avg_execution_time" in stats:
-        print(f"\n  Avg Execution Time: {stats['avg_execution_time']:.2f}s")
-    
-    print()
+    with open_manager(args) as manager:
+        stats = manager.get_statistics()
+        
+        print(f"\n📊 Task Queue Statistics - Mode: {stats['mode'].upper()}")
+        print("=" * 60)
+        print(f"  Total tasks: {stats['total_count']}")
+        print(f"  Pending: {stats['pending_count']}")
+        print(f"  Completed: {stats['completed_count']}")
+        
+        if "task_types" in stats:
+            print(f"\n  Task Types:")
+            for task_type, count in stats["task_types"].items():
+                print(f"    {task_type}: {count}")
+        
+        if "avg_priority" in stats:
+            print(f"\n  Priority Stats:")
+            print(f"    Average: {stats['avg_priority']:.2f}")
+            print(f"    Range: {stats['min_priority']}-{stats['max_priority']}")
+        
+        if "avg_execution_time" in stats:
+            print(f"\n  Avg Execution Time: {stats['avg_execution_time']:.2f}s")
+        
+        if "wait_by_type" in stats:
+            print(f"\n  Wait Before Start (completed tasks):")
+            for task_type, wait in stats["wait_by_type"].items():
+                print(f"    {task_type}: avg {wait['avg_wait']:.2f}s, max {wait['max_wait']:.2f}s "
+                      f"({wait['count']} tasks)")
+        
+        if "queue_wait_by_type" in stats:
+            print(f"\n  Wait in Queue by Level (fair mode):")
+            for task_type, wait in stats["queue_wait_by_type"].items():
+                print(f"    {task_type}: avg {wait['avg_wait']:.2f}s, p95 {wait['p95_wait']:.2f}s, "
+                      f"max {wait['max_wait']:.2f}s ({wait['dequeued']} dequeued)")
+        
+        print()
+
+
+def cmd_cancel(args):
+    """Remove a pending task by id."""
+    with open_manager(args) as manager:
+        task = manager.cancel_task(args.id)
+        if task:
+            print(f"🚫 Task cancelled: {task}")
+        else:
+            print(f"❓ No pending task with id {args.id}")
+
+
+def cmd_reprioritize(args):
+    """Change a pending task's priority."""
+    with open_manager(args) as manager:
+        task = manager.reprioritize_task(args.id, args.priority)
+        if task:
+            print(f"🔀 Priority changed: {task}")
+        else:
+            print(f"❓ No pending task with id {args.id}")
+
+
+def cmd_compact(args):
+    """Fold the write-ahead log into a fresh snapshot."""
+    with open_manager(args) as manager:
+        records = manager._wal_records
+        manager.save()
+        print(f"🗜️  Compacted {records} log records into {manager.filepath}")
 
 
 def cmd_clear(args):
     """Clear all pending tasks."""
-    manager = TaskManager(mode=args.mode)
-    count = manager.clear_all()
-    print(f"🗑️  Cleared {count} pending tasks!")
+    with open_manager(args) as manager:
+        count = manager.clear_all()
+        print(f"🗑️  Cleared {count} pending tasks!")
 
 
 def main():
@@ -485,6 +1308,20 @@ Examples:
   # Clear all tasks
   python task_queue.py clear
 
+  # Run every pending task in parallel (CPU → processes, IO → threads, NETWORK → asyncio)
+  python task_queue.py run --duration 1 --cpu-workers 4
+
+  # Cancel task 3, or make task 4 urgent
+  python task_queue.py cancel 3
+  python task_queue.py reprioritize 4 --priority 1
+
+  # Fold the change log into tasks.json now (normally every 1000 changes)
+  python task_queue.py compact
+
+  # Low priorities gain a level per minute of waiting; fair share across types
+  python task_queue.py --aging 0.0167 next
+  python task_queue.py --mode fair --weights CPU=3,IO=1,NETWORK=1 run
+
   # Use FIFO mode instead of priority
   python task_queue.py add "Task" --type CPU --priority 3 --mode fifo
         """
@@ -493,9 +1330,35 @@ Examples:
     # Global options
     parser.add_argument(
         '--mode',
-        choices=['fifo', 'priority'],
+        choices=['fifo', 'priority', 'fair'],
         default='priority',
-        help='Queue mode: fifo (First In First Out) or priority (Priority-based)'
+        help='Queue mode: fifo (First In First Out), priority (Priority-based) or '
+             'fair (one priority queue per task type, shared by --weights)'
+    )
+    
+    parser.add_argument(
+        '--aging',
+        type=float,
+        default=0.0,
+        metavar='RATE',
+        help='Priority levels a waiting task gains per second, so low priorities '
+             'still get their turn (default: 0 = off)'
+    )
+    
+    parser.add_argument(
+        '--weights',
+        type=parse_weights,
+        metavar='TYPE=W,...',
+        help='fair mode: share of dequeues per task type, e.g. CPU=3,IO=2,NETWORK=1 '
+             '(default: equal)'
+    )
+    
+    parser.add_argument(
+        '--fsync',
+        choices=FSYNC_POLICIES,
+        default='interval',
+        help='When the change log is synced to disk: after every change, '
+             'at most once a second (default), or when the OS decides'
     )
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
@@ -525,15 +1388,46 @@ Examples:
     parser_complete = subparsers.add_parser('complete', help='Mark task as complete')
     parser_complete.set_defaults(func=cmd_complete)
     
+    # Run command
+    parser_run = subparsers.add_parser('run', help='Run all pending tasks in parallel')
+    parser_run.add_argument('--duration', type=float, default=0.5,
+                            help='Seconds of simulated work per task (default: 0.5)')
+    parser_run.add_argument('--cpu-workers', type=int, default=0,
+                            help='Processes for CPU tasks, 0 = one per core (default: 0)')
+    parser_run.add_argument('--io-workers', type=int, default=DEFAULT_LIMITS[TaskType.IO],
+                            help=f'Threads for IO tasks (default: {DEFAULT_LIMITS[TaskType.IO]})')
+    parser_run.add_argument('--network-limit', type=int, default=DEFAULT_LIMITS[TaskType.NETWORK],
+                            help='NETWORK tasks running at once '
+                                 f'(default: {DEFAULT_LIMITS[TaskType.NETWORK]})')
+    parser_run.set_defaults(func=cmd_run)
+    
     # Stats command
     parser_stats = subparsers.add_parser('stats', help='Show statistics')
     parser_stats.set_defaults(func=cmd_stats)
     
+    # Cancel command
+    parser_cancel = subparsers.add_parser('cancel', help='Remove a pending task by id')
+    parser_cancel.add_argument('id', help='Task id (shown in [brackets] by list)')
+    parser_cancel.set_defaults(func=cmd_cancel)
+    
+    # Reprioritize command
+    parser_reprioritize = subparsers.add_parser('reprioritize', help='Change a pending task\'s priority')
+    parser_reprioritize.add_argument('id', help='Task id (shown in [brackets] by list)')
+    parser_reprioritize.add_argument('--priority', type=int, required=True, choices=range(1, 6),
+                                     help='New priority 1-5 (1=highest)')
+    parser_reprioritize.set_defaults(func=cmd_reprioritize)
+    
+    # Compact command
+    parser_compact = subparsers.add_parser('compact', help='Fold the change log into a new snapshot')
+    parser_compact.set_defaults(func=cmd_compact)
+    
     # Clear command
     parser_clear = subparsers.add_parser('clear', help='Clear all pending tasks')
     parser_clear.set_defaults(func=cmd_clear)
     
     args = parser.parse_args()
+    if args.aging < 0:
+        parser.error("--aging can't be negative")
     
     if not args.command:
         parser.print_help()
@@ -3,8 +3,14 @@ Tests for Task Queue Simulator
 Run with: python test_task_queue.py
 """
 
-from task_queue import Task, TaskType, TaskQueue, PriorityTaskQueue
-from datetime import datetime
+from task_queue import (Task, TaskType, TaskQueue, PriorityTaskQueue, MultiLevelTaskQueue,
+                        TaskExecutor, TaskManager, burn_cpu)
+from datetime import datetime, timedelta
+import asyncio
+import os
+import shutil
+import tempfile
+import time
 
 
 def test_task_creation():
@@ -120,6 +126,300 @@ def test_fifo_tie_breaking():
     print("✅ FIFO tie-breaking tests passed!\n")
 
 
+def test_indexed_priority_queue():
+    """Test cancel / update_priority / contains / get by task id."""
+    print("="*60)
+    print("Testing indexed PriorityTaskQueue (lookup by id)...")
+    
+    pq = PriorityTaskQueue()
+    tasks = [Task(str(i), f"Task {i}", TaskType.CPU, priority=3) for i in range(6)]
+    for task in tasks:
+        pq.enqueue(task)
+    
+    print(f"contains('4'): {pq.contains('4')}, get('4'): {pq.get('4').name}")
+    assert "4" in pq and pq.get("4") is tasks[4] and pq.get("99") is None
+    
+    # Cancel from the middle of the heap
+    print(f"Cancel '2': {pq.cancel('2').name}, size now {pq.size()}")
+    assert not pq.contains("2") and pq.size() == 5 and pq.cancel("2") is None
+    
+    # Reprioritize: 5 becomes urgent, 0 drops to low
+    pq.update_priority("5", 1)
+    pq.update_priority("0", 5)
+    order = [pq.dequeue().name for _ in range(pq.size())]
+    print(f"Dequeue order: {order}")
+    assert order == ["Task 5", "Task 1", "Task 3", "Task 4", "Task 0"]
+    
+    # Entries stay (priority, counter, task) for code that reads _heap
+    pq.enqueue(tasks[0])
+    priority, counter, task = pq._heap[0]
+    assert task is tasks[0] and priority == 5
+    
+    try:
+        pq.enqueue(tasks[0])
+        print("❌ Should have rejected a duplicate id")
+    except ValueError:
+        print("Duplicate id rejected")
+    print("✅ Indexed PriorityTaskQueue tests passed!\n")
+
+
+def test_priority_aging():
+    """Test aging: a long-waiting low-priority task beats fresh urgent ones."""
+    print("="*60)
+    print("Testing priority aging...")
+    
+    now = datetime.now()
+    old_batch = Task("80", "Nightly batch", TaskType.CPU, priority=5,
+                     created_at=now - timedelta(seconds=10))
+    urgent = [Task(f"8{i}", f"Urgent {i}", TaskType.CPU, priority=1, created_at=now)
+              for i in range(1, 4)]
+    
+    strict = PriorityTaskQueue()
+    aging = PriorityTaskQueue(aging_rate=1.0)   # one level per second of waiting
+    for pq in (strict, aging):
+        pq.enqueue(old_batch)
+        for task in urgent:
+            pq.enqueue(task)
+    
+    print(f"No aging:   first = {strict.peek().name} (batch waits behind every urgent task)")
+    print(f"Aging 1/s:  first = {aging.peek().name} (10s wait: 5 - 10 = effective -5)")
+    assert strict.peek() is urgent[0] and aging.peek() is old_batch
+    
+    # update_priority keeps the aging credit
+    aging.update_priority("80", 15)             # 15 - 10 = 5: now behind the urgent ones
+    assert [aging.dequeue().name for _ in range(4)][-1] == "Nightly batch"
+    print("✅ Priority aging tests passed!\n")
+
+
+def test_multilevel_fair_queue():
+    """Test weighted fair sharing across task types."""
+    print("="*60)
+    print("Testing MultiLevelTaskQueue (weighted fair across task types)...")
+    
+    mlq = MultiLevelTaskQueue(weights={TaskType.CPU: 3, TaskType.IO: 1})
+    for i in range(8):
+        mlq.enqueue(Task(f"c{i}", f"CPU {i}", TaskType.CPU, priority=1))
+        mlq.enqueue(Task(f"i{i}", f"IO {i}", TaskType.IO, priority=5))
+    print(mlq)
+    
+    first_eight = [mlq.dequeue().task_type.value for _ in range(8)]
+    print(f"First 8 dequeues: {first_eight}")
+    assert first_eight.count("CPU") == 6 and first_eight.count("IO") == 2
+    
+    # A level that was idle gets no banked credit when it wakes up
+    while not mlq.levels[TaskType.CPU].is_empty():
+        mlq.dequeue()
+    for i in range(4):
+        mlq.enqueue(Task(f"n{i}", f"NET {i}", TaskType.NETWORK, priority=1))
+    next_four = [mlq.dequeue().task_type.value for _ in range(4)]
+    print(f"NETWORK joins later, weights IO=1 NETWORK=1: {next_four}")
+    assert next_four.count("NETWORK") == 2
+    
+    stats = mlq.wait_stats()
+    for task_type, level in stats.items():
+        print(f"  {task_type.value}: {level['dequeued']} dequeued, "
+              f"avg wait {level['avg_wait'] * 1000:.2f}ms")
+    assert stats[TaskType.CPU]["dequeued"] == 8
+    
+    # Wait metrics stay the same size however many tasks go through
+    busy = MultiLevelTaskQueue()
+    for i in range(busy.WAIT_SAMPLE_SIZE + 500):
+        busy.enqueue(Task(f"b{i}", f"Busy {i}", TaskType.IO, priority=3))
+        busy.dequeue()
+    assert len(busy._waits[TaskType.IO]["recent"]) == busy.WAIT_SAMPLE_SIZE
+    assert busy.wait_stats()[TaskType.IO]["dequeued"] == busy.WAIT_SAMPLE_SIZE + 500
+    
+    # The shares hold across TaskManager reloads (one `next` per CLI run),
+    # both from the replayed log and from a compacted snapshot
+    folder = tempfile.mkdtemp()
+    try:
+        for snapshot_every in (1000, 2):
+            path = os.path.join(folder, f"fair{snapshot_every}.json")
+            with TaskManager(path, mode="fair", snapshot_every=snapshot_every) as manager:
+                for i in range(4):
+                    manager.add_task(f"CPU {i}", "CPU", priority=3)
+                    manager.add_task(f"IO {i}", "IO", priority=3)
+            runs = []
+            for _ in range(4):
+                with TaskManager(path, mode="fair", snapshot_every=snapshot_every) as manager:
+                    runs.append(manager.get_next_task().task_type.value)
+            print(f"4 reloads with CPU=1 IO=1, snapshot_every={snapshot_every}: {runs}")
+            assert runs == ["CPU", "IO", "CPU", "IO"]
+            # ... and so do the wait metrics `stats` shows
+            with TaskManager(path, mode="fair", snapshot_every=snapshot_every) as manager:
+                waits = manager.get_statistics()["queue_wait_by_type"]
+            assert waits["CPU"]["dequeued"] == waits["IO"]["dequeued"] == 2
+    finally:
+        shutil.rmtree(folder)
+    print("✅ MultiLevelTaskQueue tests passed!\n")
+
+
+def test_task_executor():
+    """Test TaskExecutor runs each task type for real, in parallel."""
+    print("="*60)
+    print("Testing TaskExecutor (CPU → processes, IO → threads, NETWORK → asyncio)...")
+    
+    limits = {TaskType.CPU: 2, TaskType.IO: 4, TaskType.NETWORK: 4}
+    cpu = [Task(f"3{i}", f"Crunch {i}", TaskType.CPU, priority=3) for i in range(2)]
+    io = [Task(f"4{i}", f"Read {i}", TaskType.IO, priority=3) for i in range(4)]
+    net = [Task(f"5{i}", f"Fetch {i}", TaskType.NETWORK, priority=3) for i in range(4)]
+    
+    start = time.perf_counter()
+    with TaskExecutor(limits) as executor:
+        futures = [executor.submit(t, burn_cpu, 0.2) for t in cpu]
+        futures += [executor.submit(t, time.sleep, 0.2) for t in io]
+        futures += [executor.submit(t, asyncio.sleep, 0.2, t.name) for t in net]
+    elapsed = time.perf_counter() - start
+    
+    for task in cpu + io + net:
+        print(f"  {task}")
+        assert task.status == "COMPLETED"
+        assert task.started_at <= task.completed_at
+        assert task.execution_time >= 0.19
+    print(f"10 tasks x 0.2s finished in {elapsed:.2f}s (should be well under 2s)")
+    assert elapsed < 1.5
+    assert futures[-1].result() == "Fetch 3"  # NETWORK futures carry the coroutine's result
+    
+    # A failing task is marked FAILED and its Future raises
+    bad = Task("60", "Broken", TaskType.IO, priority=1)
+    with TaskExecutor() as executor:
+        future = executor.submit(bad, int, "not a number")
+    print(f"  {bad} - {bad.error}")
+    assert bad.status == "FAILED" and isinstance(future.exception(), ValueError)
+    
+    # Per-type limits: 4 IO tasks with 1 thread run one after another
+    serial = [Task(f"7{i}", f"Serial {i}", TaskType.IO, priority=3) for i in range(4)]
+    start = time.perf_counter()
+    with TaskExecutor({TaskType.IO: 1}) as executor:
+        for task in serial:
+            executor.submit(task, time.sleep, 0.05)
+    print(f"4 x 0.05s IO tasks with 1 thread took {time.perf_counter() - start:.2f}s (≥ 0.2s)")
+    assert time.perf_counter() - start >= 0.2
+    print("✅ TaskExecutor tests passed!\n")
+
+
+def test_write_ahead_log():
+    """Test TaskManager persistence: log replay, compaction and crash recovery."""
+    print("="*60)
+    print("Testing write-ahead log persistence...")
+    
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "tasks.json")
+    try:
+        manager = TaskManager(path, snapshot_every=1000)
+        for i in range(5):
+            manager.add_task(f"Task {i}", "CPU", priority=5 - i)
+        manager.complete_task(manager.get_next_task())
+        manager.start_task(manager.get_next_task())
+        manager.close()
+        print(f"Log only, no snapshot yet: {os.path.exists(path)=}, {manager._wal_records} records")
+        
+        # Replay: same pending order, completed and running tasks
+        reloaded = TaskManager(path)
+        pending = [t.name for t in reloaded._pending_in_order()]
+        print(f"Replayed pending: {pending}")
+        assert pending == ["Task 2", "Task 1", "Task 0"]
+        assert [t.name for t in reloaded.completed_tasks] == ["Task 4"]
+        assert list(reloaded.running_tasks) == ["4"]
+        
+        # Crash right after a snapshot, before the log was emptied: old
+        # records are already in the snapshot (by seq) and must not apply twice
+        shutil.copy(reloaded.wal_path, path + ".old")
+        reloaded.save()
+        reloaded.close()
+        os.replace(path + ".old", reloaded.wal_path)
+        again = TaskManager(path)
+        print(f"After snapshot + stale log: {again.queue.size()} pending, "
+              f"{len(again.completed_tasks)} completed")
+        assert again.queue.size() == 3 and len(again.completed_tasks) == 1
+        
+        # Crash in the middle of writing a record: it is dropped, the rest kept
+        again.add_task("Task 5", "IO", priority=1)
+        again.close()
+        with open(again.wal_path, "a") as f:
+            f.write('{"seq": 999, "op": "enq')
+        torn = TaskManager(path)
+        print(f"After a torn write: next = {torn.peek_next_task().name}")
+        assert torn.peek_next_task().name == "Task 5" and torn.queue.size() == 4
+        torn.add_task("Task 6", "IO", priority=1)  # appends after the dropped bytes
+        torn.reprioritize_task("2", 2)   # Task 1
+        torn.cancel_task("6")            # Task 5
+        torn.close()
+        replayed = TaskManager(path)
+        assert replayed.queue.size() == 4 and replayed.peek_next_task().name == "Task 6"
+        assert replayed.queue.get("2").priority == 2 and not replayed.queue.contains("6")
+        
+        # Compaction every N records keeps the log short
+        small = TaskManager(path, fsync="never", snapshot_every=3)
+        for i in range(7):
+            small.add_task(f"Extra {i}", "NETWORK", priority=3)
+        small.close()
+        print(f"snapshot_every=3 after 7 adds: {small._wal_records} records in the log")
+        assert small._wal_records < 3 and TaskManager(path).queue.size() == 11
+    finally:
+        shutil.rmtree(folder)
+    print("✅ Write-ahead log tests passed!\n")
+
+
+def test_run_pending_logs_as_it_goes():
+    """Test run_pending logs each start and finish as it happens, not at the end."""
+    print("="*60)
+    print("Testing run_pending crash safety...")
+    
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "tasks.json")
+    crash = os.path.join(folder, "crash")
+    os.mkdir(crash)
+    try:
+        manager = TaskManager(path)
+        manager.add_task("Quick", "IO", priority=1)
+        manager.add_task("Slow", "IO", priority=2)
+        
+        def copy_files(task):
+            # What a crash right now would leave on disk
+            if task.name == "Quick":
+                shutil.copy(manager.wal_path, os.path.join(crash, "tasks.json.wal"))
+        
+        work = lambda task: (time.sleep, (0.5 if task.name == "Slow" else 0.0,))
+        tasks = manager.run_pending(work, on_done=copy_files)
+        manager.close()
+        assert [t.status for t in tasks] == ["COMPLETED", "COMPLETED"]
+        assert not manager.running_tasks and len(manager.completed_tasks) == 2
+        
+        crashed = TaskManager(os.path.join(crash, "tasks.json"))
+        print(f"Mid-run: completed {[t.name for t in crashed.completed_tasks]}, "
+              f"running {[t.name for t in crashed.running_tasks.values()]}")
+        assert [t.name for t in crashed.completed_tasks] == ["Quick"]
+        assert [t.name for t in crashed.running_tasks.values()] == ["Slow"]
+        assert crashed.queue.is_empty()
+        crashed.close()
+        
+        finished = TaskManager(path)
+        assert not finished.running_tasks and len(finished.completed_tasks) == 2
+        finished.close()
+        
+        # A task that can't even be submitted (NETWORK needs an async
+        # function) is logged as failed, after the running ones are logged
+        broken = TaskManager(os.path.join(folder, "broken.json"))
+        broken.add_task("Sleeper", "IO", priority=1)
+        broken.add_task("Not async", "NETWORK", priority=2)
+        try:
+            broken.run_pending(lambda task: (time.sleep, (0.2,)))
+            assert False, "expected TypeError"
+        except TypeError as e:
+            print(f"Submit failed: {e!r}")
+        broken.close()
+        statuses = {t.name: t.status for t in broken.completed_tasks}
+        assert statuses == {"Sleeper": "COMPLETED", "Not async": "FAILED"}, statuses
+        reloaded = TaskManager(os.path.join(folder, "broken.json"))
+        assert not reloaded.running_tasks
+        assert {t.name: t.status for t in reloaded.completed_tasks} == statuses
+        reloaded.close()
+    finally:
+        shutil.rmtree(folder)
+    print("✅ run_pending crash safety tests passed!\n")
+
+
 if __name__ == "__main__":
     print("\n🧪 Running Task Queue Tests...\n")
     
@@ -127,6 +427,12 @@ if __name__ == "__main__":
     test_task_queue()
     test_priority_task_queue()
     test_fifo_tie_breaking()
+    test_indexed_priority_queue()
+    test_priority_aging()
+    test_multilevel_fair_queue()
+    test_task_executor()
+    test_write_ahead_log()
+    test_run_pending_logs_as_it_goes()
     
     print("="*60)
     print("🎉 All tests passed successfully!")
@@ -19,17 +19,249 @@ You'll implement:
 Ready? Let's code! 🚀
 """
 
+import mmap
+import os
+import pickle
+import random
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Set
+from itertools import islice
+
+_MASK64 = (1 << 64) - 1
+
+
+# ========================================
+# HASH FUNCTIONS
+# ========================================
+# Every hash function takes (key, seed) and returns a 64-bit int.
+# A random seed per table means an attacker can't precompute keys that
+# all land in the same bucket.
+
+def _key_bytes(key):
+    """Turn a key into bytes for the byte-oriented hash functions."""
+    if isinstance(key, bytes):
+        return key
+    if isinstance(key, str):
+        return key.encode("utf-8", "surrogatepass")
+    # Numbers etc: hash() keeps 1 == 1.0 == True consistent
+    return hash(key).to_bytes(8, "little", signed=True)
+
+
+def ascii_hash(key, seed=0):
+    """The original Day 5 hash: sum of ASCII values (collides on anagrams!)."""
+    return sum(ord(char) for char in str(key))
+
+
+def builtin_hash(key, seed=0):
+    """Python's hash() run through a 64-bit multiplicative mixer."""
+    h = ((hash(key) ^ seed) * 0x9E3779B97F4A7C15) & _MASK64
+    return h ^ (h >> 32)
+
+
+def fnv1a_hash(key, seed=0):
+    """64-bit FNV-1a: xor each byte in, then multiply by the FNV prime."""
+    h = 0xCBF29CE484222325 ^ (seed & _MASK64)
+    for byte in _key_bytes(key):
+        h = ((h ^ byte) * 0x100000001B3) & _MASK64
+    return h
+
+
+def _rotl(x, bits):
+    return ((x << bits) | (x >> (64 - bits))) & _MASK64
+
+
+def siphash(key, seed=0):
+    """
+    SipHash-2-4, the keyed hash CPython itself uses for str.
+
+    The 128-bit SipHash key is derived from the table seed.
+    """
+    data = _key_bytes(key)
+    k0 = seed & _MASK64
+    k1 = (seed >> 64) & _MASK64 or (k0 * 0x9E3779B97F4A7C15) & _MASK64
+    v0 = k0 ^ 0x736F6D6570736575
+    v1 = k1 ^ 0x646F72616E646F6D
+    v2 = k0 ^ 0x6C7967656E657261
+    v3 = k1 ^ 0x7465646279746573
+
+    def sip_round(v0, v1, v2, v3):
+        v0 = (v0 + v1) & _MASK64; v1 = _rotl(v1, 13) ^ v0; v0 = _rotl(v0, 32)
+        v2 = (v2 + v3) & _MASK64; v3 = _rotl(v3, 16) ^ v2
+        v0 = (v0 + v3) & _MASK64; v3 = _rotl(v3, 21) ^ v0
+        v2 = (v2 + v1) & _MASK64; v1 = _rotl(v1, 17) ^ v2; v2 = _rotl(v2, 32)
+        return v0, v1, v2, v3
+
+    length = len(data)
+    tail_start = length - length % 8
+    for i in range(0, tail_start, 8):
+        m = int.from_bytes(data[i:i + 8], "little")
+        v3 ^= m
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+        v0 ^= m
+
+    # Last block: remaining bytes plus the length in the top byte
+    m = int.from_bytes(data[tail_start:], "little") | ((length & 0xFF) << 56)
+    v3 ^= m
+    v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    v0 ^= m
+
+    v2 ^= 0xFF
+    for _ in range(4):
+        v0, v1, v2, v3 = sip_round(v0, v1, v2, v3)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+_XXH_PRIME1 = 0x9E3779B185EBCA87
+_XXH_PRIME2 = 0xC2B2AE3D27D4EB4F
+_XXH_PRIME3 = 0x165667B19E3779F9
+_XXH_PRIME4 = 0x85EBCA77C2B2AE63
+_XXH_PRIME5 = 0x27D4EB2F165667C5
+
+
+def _xxh_round(acc, lane):
+    acc = (acc + lane * _XXH_PRIME2) & _MASK64
+    return (_rotl(acc, 31) * _XXH_PRIME1) & _MASK64
+
+
+def xxhash64(key, seed=0):
+    """XXH64: reads 8-byte lanes at a time, fast on long bytes keys."""
+    data = _key_bytes(key)
+    seed &= _MASK64
+    length = len(data)
+    i = 0
+
+    if length >= 32:
+        v1 = (seed + _XXH_PRIME1 + _XXH_PRIME2) & _MASK64
+        v2 = (seed + _XXH_PRIME2) & _MASK64
+        v3 = seed
+        v4 = (seed - _XXH_PRIME1) & _MASK64
+        while i + 32 <= length:
+            v1 = _xxh_round(v1, int.from_bytes(data[i:i + 8], "little"))
+            v2 = _xxh_round(v2, int.from_bytes(data[i + 8:i + 16], "little"))
+            v3 = _xxh_round(v3, int.from_bytes(data[i + 16:i + 24], "little"))
+            v4 = _xxh_round(v4, int.from_bytes(data[i + 24:i + 32], "little"))
+            i += 32
+        h = (_rotl(v1, 1) + _rotl(v2, 7) + _rotl(v3, 12) + _rotl(v4, 18)) & _MASK64
+        for v in (v1, v2, v3, v4):
+            h ^= _xxh_round(0, v)
+            h = (h * _XXH_PRIME1 + _XXH_PRIME4) & _MASK64
+    else:
+        h = (seed + _XXH_PRIME5) & _MASK64
+
+    h = (h + length) & _MASK64
+    while i + 8 <= length:
+        h ^= _xxh_round(0, int.from_bytes(data[i:i + 8], "little"))
+        h = (_rotl(h, 27) * _XXH_PRIME1 + _XXH_PRIME4) & _MASK64
+        i += 8
+    if i + 4 <= length:
+        h ^= (int.from_bytes(data[i:i + 4], "little") * _XXH_PRIME1) & _MASK64
+        h = (_rotl(h, 23) * _XXH_PRIME2 + _XXH_PRIME3) & _MASK64
+        i += 4
+    while i < length:
+        h ^= (data[i] * _XXH_PRIME5) & _MASK64
+        h = (_rotl(h, 11) * _XXH_PRIME1) & _MASK64
+        i += 1
+
+    # Avalanche
+    h ^= h >> 33
+    h = (h * _XXH_PRIME2) & _MASK64
+    h ^= h >> 29
+    h = (h * _XXH_PRIME3) & _MASK64
+    h ^= h >> 32
+    return h
+
+
+HASH_FUNCTIONS = {
+    "builtin": builtin_hash,
+    "fnv1a": fnv1a_hash,
+    "siphash": siphash,
+    "xxhash": xxhash64,
+    "ascii": ascii_hash,
+}
+
+
+def _format_bytes(n):
+    """Human-readable byte count: 1536 -> '1.5 KB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+# Sentinels for open addressing slots
+_EMPTY = object()      # Slot was never used - stops every probe
+_DELETED = object()    # Tombstone - slot is free but probes must continue
+
+
 class HashTable:
     """
     Custom hash table implementation using chaining for collision resolution.
+
+    Pass strategy='linear' or strategy='robinhood' to get an
+    OpenAddressingHashTable instead - same API, different storage.
+
+    hash_func picks the hash function: a name from HASH_FUNCTIONS
+    ('builtin', 'fnv1a', 'siphash', 'xxhash', 'ascii') or any callable
+    taking (key, seed). Each table gets a random seed unless one is given.
+    Hash values are stored next to the entries, so resizing never rehashes.
+
+    With incremental=True a resize doesn't move everything at once: old and
+    new bucket arrays stay live and every operation migrates rehash_step
+    old buckets (like Redis), so no single insert pays for the whole table.
+    verbose=False silences the resize messages.
+
+    When deletes drop the load factor below min_load_factor the table
+    halves itself (never below min(initial_size, 8)); min_load_factor=0
+    turns shrinking off. compact() rebuilds at the best size on demand.
     """
-    
-    def __init__(self, initial_size=8):
+
+    STRATEGIES = ("chaining", "linear", "robinhood")
+
+    def __new__(cls, initial_size=8, strategy="chaining", *args, **kwargs):
+        """Pick the storage engine: HashTable(strategy='robinhood') works."""
+        if cls is HashTable and strategy in ("linear", "robinhood"):
+            cls = OpenAddressingHashTable
+        return super().__new__(cls)
+
+    def __init__(self, initial_size=8, strategy="chaining", hash_func="builtin", seed=None,
+                 incremental=False, rehash_step=4, verbose=True, min_load_factor=0.1):
         """Initialize the hash table."""
+        if strategy != "chaining":
+            raise ValueError(f"Unknown strategy '{strategy}', choose from {self.STRATEGIES}")
+        self.strategy = strategy
         self.size = initial_size
-        self.buckets = [[] for _ in range(self.size)]
+        self.min_size = min(initial_size, 8)
+        self.min_load_factor = min_load_factor
+        self.buckets = [[] for _ in range(self.size)]  # each entry: (key, value, hash)
         self.count = 0
         self.collisions = 0
+        self.verbose = verbose
+        self._version = 0  # bumped on every structural change (see views)
+        self._init_hashing(hash_func, seed)
+
+        # Incremental rehash state: old buckets below _rehash_index are migrated
+        self.incremental = incremental
+        self.rehash_step = rehash_step
+        self._old_buckets = None
+        self._rehash_index = 0
+
+    def _init_hashing(self, hash_func, seed):
+        """Resolve the hash function and pick this table's seed."""
+        if callable(hash_func):
+            self.hash_name = getattr(hash_func, "__name__", "custom")
+            self._hasher = hash_func
+        elif hash_func in HASH_FUNCTIONS:
+            self.hash_name = hash_func
+            self._hasher = HASH_FUNCTIONS[hash_func]
+        else:
+            raise ValueError(f"Unknown hash function '{hash_func}', "
+                             f"choose from {tuple(HASH_FUNCTIONS)} or pass a callable")
+        self.seed = random.getrandbits(64) if seed is None else seed
     
     def _hash(self, key):
         """
@@ -37,10 +269,13 @@ class HashTable:
         
         Convert a key to an array index.
         
-        Algorithm:
+        Algorithm (hash_func='ascii', the original exercise):
         1. Convert key to string: key_str = str(key)
         2. Sum ASCII values: hash_value = sum(ord(char) for char in key_str)
         3. Return: hash_value % self.size
+
+        The default hash_func='builtin' swaps step 1-2 for a seeded
+        mix of hash(key) - anagrams like "cat"/"act" no longer collide.
         
         Example:
             key = "cat"
@@ -54,15 +289,17 @@ class HashTable:
         Returns:
             int: Index in range [0, size-1]
         """
-        key_str = str(key)
-        hash_value = (sum(ord(char) for char in key_str))
-        return hash_value % self.size
+        return self._full_hash(key) % self.size
+
+    def _full_hash(self, key):
+        """Hash value before it is reduced to an index."""
+        return self._hasher(key, self.seed)
     
     def _load_factor(self):
         """Calculate current load factor."""
         return self.count / self.size
     
-    def _resize(self):
+    def _resize(self, new_size=None, incremental=None):
         """
         TODO #2: Implement table resizing
         
@@ -74,31 +311,188 @@ class HashTable:
         3. Double the size: self.size *= 2
         4. Create new empty buckets: self.buckets = [[] for _ in range(self.size)]
         5. Reset counters: self.count = 0, self.collisions = 0
-        6. Rehash all items:
+        6. Move all items:
            - for bucket in old_buckets:
-               - for key, value in bucket:
-                   - self.insert(key, value)
+               - for key, value, hash_value in bucket:
+                   - append to self.buckets[hash_value % self.size]
+           (The hash is stored with the entry, so nothing is rehashed and
+            insert() isn't re-entered - no load factor re-checks.)
         
         Args:
-            None
+            new_size: Target bucket count (default: double the table)
+            incremental: Override self.incremental for this resize
             
         Returns:
             None
         """
-        print(f"📈 Resizing table from {self.size} to {self.size * 2} buckets...")
+        if self._old_buckets is not None:
+            self._finish_rehash()  # never run two migrations at once
+
+        new_size = new_size or self.size * 2
+        if incremental is None:
+            incremental = self.incremental
+        self._version += 1
+        if self.verbose:
+            arrow = "📈" if new_size > self.size else "📉"
+            print(f"{arrow} Resizing table from {self.size} to {new_size} buckets...")
         
         old_buckets = self.buckets
-        self.size *= 2
-        self.buckets = [[] for _ in range(self.size)]
-        self.count = 0
+        self.size = new_size
         self.collisions = 0
 
-        #rehash all items
+        if incremental:
+            # Keep both arrays live; _rehash_step() moves buckets over time.
+            # New buckets start as None so even allocating them is cheap.
+            self.buckets = [None] * self.size
+            self._old_buckets = old_buckets
+            self._rehash_index = 0
+            return
+
+        self.buckets = [[] for _ in range(self.size)]
+
+        # Move all items using their cached hash (count doesn't change)
+        buckets, size = self.buckets, self.size
         for bucket in old_buckets:
-            for key,value in bucket:
-                self.insert(key,value)
-            
+            for entry in bucket or ():
+                new_bucket = buckets[entry[2] % size]
+                if new_bucket:
+                    self.collisions += 1
+                new_bucket.append(entry)
+
+    def _rehash_step(self, n_buckets=None):
+        """Migrate up to n_buckets old buckets into the new array."""
+        old_buckets = self._old_buckets
+        if old_buckets is None:
+            return
+        buckets, size = self.buckets, self.size
+        self._version += 1
+        start = self._rehash_index
+        stop = min(start + (n_buckets or self.rehash_step), len(old_buckets))
+
+        for i in range(start, stop):
+            for entry in old_buckets[i] or ():
+                index = entry[2] % size
+                new_bucket = buckets[index]
+                if new_bucket is None:
+                    new_bucket = buckets[index] = []
+                elif new_bucket:
+                    self.collisions += 1
+                new_bucket.append(entry)
+            old_buckets[i] = None  # free it as we go
+
+        self._rehash_index = stop
+        if stop == len(old_buckets):
+            self._old_buckets = None
+            self._rehash_index = 0
+
+    def _finish_rehash(self):
+        """Complete an in-progress incremental resize."""
+        if self._old_buckets is not None:
+            self._rehash_step(len(self._old_buckets))
+
+    def _reserve(self, extra):
+        """Grow once so that extra more keys fit under the 0.7 load factor."""
+        needed = self.count + extra
+        if needed / self.size <= 0.7:
+            return
+        new_size = self.size
+        while needed / new_size > 0.7:
+            new_size *= 2
+        self._resize(new_size, incremental=False)
+
+    def _shrink_if_sparse(self):
+        """Halve the table while the load factor is under min_load_factor."""
+        if not self.min_load_factor:
+            return
+        new_size = self.size
+        while new_size // 2 >= self.min_size and self.count / new_size < self.min_load_factor:
+            new_size //= 2
+        if new_size != self.size:
+            self._resize(new_size)
+
+    def _optimal_size(self):
+        """Smallest size (doubling from min_size) that keeps the load <= 0.5."""
+        size = self.min_size
+        while self.count / size > 0.5:
+            size *= 2
+        return size
+
+    def compact(self):
+        """
+        Rebuild the table at its optimal size, right now.
+
+        Frees empty buckets (and tombstones for open addressing) left
+        behind by deletes. Returns the new size.
+        """
+        self._finish_rehash()
+        self._resize(self._optimal_size(), incremental=False)
+        return self.size
+
+    def probe_lengths(self):
+        """
+        {entries compared to find a key: number of keys}.
 
+        The first key in a bucket takes 1 comparison, the second 2, ...
+        so the largest key is the longest chain.
+        """
+        histogram = {}
+        for bucket in self._all_buckets():
+            for position in range(1, len(bucket) + 1):
+                histogram[position] = histogram.get(position, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def sizeof(self, deep=False):
+        """
+        Bytes used by the table structure: bucket array, bucket lists
+        and entry tuples. deep=True also counts the keys and values.
+        """
+        arrays = [self.buckets]
+        if self._old_buckets is not None:
+            arrays.append(self._old_buckets)
+        total = 0
+        for array in arrays:
+            total += sys.getsizeof(array)
+            # Empty bucket lists still take memory (a sparse table is mostly them);
+            # lazily allocated buckets are None and only cost their array slot
+            buckets = [bucket for bucket in array if bucket is not None]
+            total += sum(map(sys.getsizeof, buckets))
+            for bucket in buckets:
+                for entry in bucket:
+                    total += sys.getsizeof(entry)
+                    if deep:
+                        total += sys.getsizeof(entry[0]) + sys.getsizeof(entry[1])
+        return total
+
+    def _bucket_for(self, hash_value, create=False):
+        """
+        Bucket that holds (or would hold) a key with this hash.
+
+        During an incremental resize, keys whose old bucket hasn't been
+        migrated yet still live in the old array. Buckets allocated lazily
+        (incremental mode) are None until create=True makes a list.
+        """
+        old_buckets = self._old_buckets
+        if old_buckets is not None:
+            index = hash_value % len(old_buckets)
+            if index >= self._rehash_index and old_buckets[index] is not None:
+                return old_buckets[index]
+        index = hash_value % self.size
+        bucket = self.buckets[index]
+        if bucket is None:
+            if not create:
+                return ()
+            bucket = self.buckets[index] = []
+        return bucket
+
+    def _all_buckets(self):
+        """Yield every non-empty bucket (unmigrated old ones first)."""
+        if self._old_buckets is not None:
+            for i in range(self._rehash_index, len(self._old_buckets)):
+                if self._old_buckets[i]:
+                    yield self._old_buckets[i]
+        for bucket in self.buckets:
+            if bucket:
+                yield bucket
     
     def insert(self, key, value):
         """
@@ -127,23 +521,34 @@ class HashTable:
         Returns:
             bool: True if inserted, False if updated
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._rehash_step()
+        inserted = self._insert_hashed(key, value, self._full_hash(key))
+        if inserted:
+            self._grow_if_needed()
+        return inserted
 
-        # Check if key already exists
-        for i, (k,v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key,value) #update
+    def _grow_if_needed(self):
+        """Resize if the load factor went over 0.7."""
+        if self._load_factor() > 0.7:
+            self._resize()
+
+    def _insert_hashed(self, key, value, hash_value):
+        """Insert with a precomputed hash. No load factor check."""
+        bucket = self._bucket_for(hash_value, create=True)
+
+        # Check if key already exists (cheap hash compare first)
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
+                bucket[i] = (key, value, hash_value) #update
                 return False
         
         # Key not found, insert new
-        bucket.append((key,value))
+        bucket.append((key, value, hash_value))
         self.count += 1
+        self._version += 1
         if len(bucket) > 1:
             self.collisions += 1
-        if self._load_factor() > 0.7:
-            self._resize()
-
         return True
 
     def search(self, key):
@@ -167,14 +572,19 @@ class HashTable:
         Returns:
             The value if found, None otherwise
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._rehash_step()
+        return self._search_hashed(key, self._full_hash(key))
+
+    def _search_hashed(self, key, hash_value, default=None):
+        """Search with a precomputed hash."""
+        bucket = self._bucket_for(hash_value)
 
         # Search for the key in the bucket
-        for k, v in bucket:
-            if k == key:
+        for k, v, h in bucket:
+            if h == hash_value and k == key:
                 return v
-        return None  # Not found
+        return default  # Not found
     
     def delete(self, key):
         """
@@ -199,15 +609,106 @@ class HashTable:
         Returns:
             bool: True if deleted, False if not found
         """
-        index = self._hash(key)
-        bucket = self.buckets[index]
+        if self._old_buckets is not None:
+            self._rehash_step()
+        deleted = self._delete_hashed(key, self._full_hash(key))
+        if deleted:
+            self._shrink_if_sparse()
+        return deleted
 
-        for i, (k   , v) in enumerate(bucket):
-            if k == key:
+    def _delete_hashed(self, key, hash_value):
+        """Delete with a precomputed hash."""
+        bucket = self._bucket_for(hash_value)
+
+        for i, (k, v, h) in enumerate(bucket):
+            if h == hash_value and k == key:
                 del bucket[i]
                 self.count -= 1
+                self._version += 1
                 return True
         return False  # Not found
+
+    # ========================================
+    # BULK OPERATIONS
+    # ========================================
+
+    BATCH_SIZE = 65536
+
+    @classmethod
+    def from_items(cls, items, expected_size=None, **kwargs):
+        """
+        Build a table from (key, value) pairs or a dict in one go.
+
+        The table is sized up front for expected_size keys (default:
+        len(items) when it has one), so loading never resizes repeatedly.
+        Extra kwargs go to the constructor, e.g. strategy='robinhood'.
+        """
+        if expected_size is None and hasattr(items, "__len__"):
+            expected_size = len(items)
+        initial_size = kwargs.pop("initial_size", 8)
+        if expected_size:
+            while expected_size / initial_size > 0.7:
+                initial_size *= 2
+        table = cls(initial_size=initial_size, **kwargs)
+        table.update(items)
+        return table
+
+    def update(self, items):
+        """
+        Insert many (key, value) pairs (or a dict's items).
+
+        Works in batches of BATCH_SIZE: the table grows once per batch,
+        then every pair is hashed and placed without per-insert checks.
+
+        Returns:
+            int: Number of new keys (updates of existing keys don't count)
+        """
+        if hasattr(items, "items"):
+            items = items.items()
+        self._finish_rehash()
+
+        hasher, seed, insert_hashed = self._hasher, self.seed, self._insert_hashed
+        iterator = iter(items)
+        inserted = 0
+        while True:
+            batch = list(islice(iterator, self.BATCH_SIZE))
+            if not batch:
+                break
+            self._reserve(len(batch))
+            for key, value in batch:
+                inserted += insert_hashed(key, value, hasher(key, seed))
+        return inserted
+
+    def get_many(self, keys, default=None):
+        """Look up many keys at once. Returns a list of values (default if missing)."""
+        hasher, seed, search_hashed = self._hasher, self.seed, self._search_hashed
+        return [search_hashed(key, hasher(key, seed), default) for key in keys]
+
+    def delete_many(self, keys):
+        """Delete many keys at once. Returns how many were actually deleted."""
+        hasher, seed, delete_hashed = self._hasher, self.seed, self._delete_hashed
+        deleted = sum(delete_hashed(key, hasher(key, seed)) for key in keys)
+        self._shrink_if_sparse()  # once, at the end of the batch
+        return deleted
+
+    # ========================================
+    # SNAPSHOTS
+    # ========================================
+
+    def save(self, path):
+        """
+        Write the table to a binary snapshot file (see MappedHashTable).
+
+        Keys must be str, bytes or int. Returns the number of entries written.
+        """
+        return write_snapshot(path, self.items(), self.count)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Read a snapshot back into a regular (writable) table."""
+        with MappedHashTable(path) as snapshot:
+            return cls.from_items(snapshot.items(), expected_size=len(snapshot), **kwargs)
+
     # ========================================
     # HELPER METHODS (Already implemented!)
     # ========================================
@@ -227,29 +728,44 @@ class HashTable:
             raise KeyError(f"Key '{key}' not found")
         return value
     
-    def keys(self):
-        """Get all keys."""
-        all_keys = []
+    def __len__(self):
+        """Enable: len(hash_table)"""
+        return self.count
+
+    def __iter__(self):
+        """Enable: for key in hash_table"""
+        return iter(self.keys())
+
+    def _iter_entries(self):
+        """
+        Yield (key, value) pairs straight from the buckets - no list is built.
+
+        Raises RuntimeError if the table is changed (insert of a new key,
+        delete, resize) while iterating, like dict does.
+        """
+        self._finish_rehash()  # so lookups during iteration don't move entries
+        version = self._version
         for bucket in self.buckets:
-            for key, value in bucket:
-                all_keys.append(key)
-        return all_keys
+            if not bucket:
+                continue
+            for key, value, _ in bucket:
+                if self._version != version:
+                    raise RuntimeError("HashTable changed size during iteration")
+                yield key, value
+        if self._version != version:
+            raise RuntimeError("HashTable changed size during iteration")
+
+    def keys(self):
+        """Get a live view of all keys."""
+        return KeysView(self)
     
     def values(self):
-        """Get all values."""
-        all_values = []
-        for bucket in self.buckets:
-            for key, value in bucket:
-                all_values.append(value)
-        return all_values
+        """Get a live view of all values."""
+        return ValuesView(self)
     
     def items(self):
-        """Get all (key, value) pairs."""
-        all_items = []
-        for bucket in self.buckets:
-            for item in bucket:
-                all_items.append(item)
-        return all_items
+        """Get a live view of all (key, value) pairs."""
+        return ItemsView(self)
     
     def stats(self):
         """Print hash table statistics."""
@@ -259,16 +775,21 @@ class HashTable:
         print(f"Items: {self.count}")
         print(f"Buckets: {self.size}")
         print(f"Load Factor: {self._load_factor():.2f}")
+        print(f"Hash Function: {self.hash_name}")
         print(f"Collisions: {self.collisions}")
+        if self._old_buckets is not None:
+            print(f"Rehashing: {self._rehash_index}/{len(self._old_buckets)} old buckets migrated")
         print(f"\nBucket Distribution:")
         
         for i, bucket in enumerate(self.buckets):
             if bucket:
-                keys = [k for k, v in bucket]
+                keys = [k for k, v, h in bucket]
                 print(f"  Bucket {i:2d}: {len(bucket)} items - {keys}")
         
         non_empty = sum(1 for b in self.buckets if b)
         print(f"\nNon-empty buckets: {non_empty}/{self.size} ({non_empty/self.size*100:.1f}%)")
+        print(f"Memory: {_format_bytes(self.sizeof())} "
+              f"({self.sizeof() / max(self.count, 1):.0f} bytes/entry, keys & values excluded)")
         print("="*60 + "\n")
     
     def __str__(self):
@@ -284,6 +805,759 @@ class HashTable:
         return f"HashTable(size={self.size}, count={self.count}, load={self._load_factor():.2f})"
 
 
+# ========================================
+# VIEWS (like dict.keys() / .values() / .items())
+# ========================================
+# Views don't copy anything: they walk the table every time you iterate,
+# always see the current contents, and len() is O(1).
+
+class _HashTableView:
+    """Shared plumbing for the key, value and item views."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return self._table.count
+
+    def __repr__(self):
+        return f"{type(self).__name__}({list(self)})"
+
+
+class KeysView(_HashTableView, Set):
+    """Live, set-like view of a table's keys: supports &, |, -, ^."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        for key, _ in self._table._iter_entries():
+            yield key
+
+    def __contains__(self, key):
+        return key in self._table
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Set operations return a plain set, like dict_keys does
+        return set(iterable)
+
+
+class ValuesView(_HashTableView):
+    """Live view of a table's values."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        for _, value in self._table._iter_entries():
+            yield value
+
+    def __contains__(self, value):
+        return any(v == value for v in self)
+
+
+class ItemsView(_HashTableView, Set):
+    """Live, set-like view of a table's (key, value) pairs."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return self._table._iter_entries()
+
+    def __contains__(self, item):
+        key, value = item
+        return key in self._table and self._table.search(key) == value
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+
+
+class OpenAddressingHashTable(HashTable):
+    """
+    Hash table using open addressing over flat parallel arrays.
+
+    Instead of one list of (key, value) tuples per bucket, every entry lives
+    in three parallel lists: _keys, _values and _hashes. No per-entry tuple
+    or per-bucket list is allocated, and a probe walks neighbouring slots.
+
+    Strategies:
+    - 'linear':    on collision try the next slot. Deleted slots become
+                   tombstones (_DELETED) so probe chains stay unbroken.
+    - 'robinhood': linear probing, but an insert takes the slot of any entry
+                   that is closer to its home slot ("steal from the rich").
+                   Probe lengths stay short and misses can stop early.
+                   Deletes shift the following entries back (no tombstones).
+    """
+
+    def __init__(self, initial_size=8, strategy="linear", hash_func="builtin", seed=None,
+                 incremental=False, rehash_step=4, verbose=True, min_load_factor=0.1):
+        """
+        Initialize the slot arrays.
+
+        Same signature as HashTable so HashTable(...) works for every strategy;
+        rehash_step is accepted and ignored (resizes here are always all at once).
+        """
+        if strategy not in ("linear", "robinhood"):
+            raise ValueError(f"Unknown open addressing strategy '{strategy}', "
+                             f"choose 'linear' or 'robinhood'")
+        if incremental:
+            raise ValueError("Incremental resizing is only supported with strategy='chaining'")
+        self.verbose = verbose
+        self.strategy = strategy
+        self.size = initial_size
+        self.min_size = min(initial_size, 8)
+        self.min_load_factor = min_load_factor
+        self.count = 0
+        self.collisions = 0
+        self.tombstones = 0
+        self._version = 0
+        self._keys = [_EMPTY] * self.size
+        self._values = [None] * self.size
+        self._hashes = [0] * self.size
+        self._init_hashing(hash_func, seed)
+
+    def _probe_distance(self, hash_value, index):
+        """How far the entry at index sits from its home slot."""
+        return (index - hash_value % self.size) % self.size
+
+    def _find_slot(self, key, hash_value):
+        """Return the slot holding key, or -1 if it isn't in the table."""
+        keys, hashes, size = self._keys, self._hashes, self.size
+        index = hash_value % size
+        distance = 0
+
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                return -1
+            if k is not _DELETED and hashes[index] == hash_value and k == key:
+                return index
+            # Robin Hood: anything we'd own would have been placed before
+            # an entry that is closer to home than we are
+            if self.strategy == "robinhood" and self._probe_distance(hashes[index], index) < distance:
+                return -1
+            index = (index + 1) % size
+            distance += 1
+
+    def _place(self, key, value, hash_value):
+        """Put a key that is known to be absent into the arrays."""
+        keys, values, hashes, size = self._keys, self._values, self._hashes, self.size
+        index = hash_value % size
+        distance = 0
+
+        if keys[index] is not _EMPTY:
+            self.collisions += 1
+
+        while True:
+            k = keys[index]
+            if k is _EMPTY:
+                keys[index], values[index], hashes[index] = key, value, hash_value
+                return
+            if k is _DELETED:
+                # Only linear probing leaves tombstones - reuse the slot
+                keys[index], values[index], hashes[index] = key, value, hash_value
+                self.tombstones -= 1
+                return
+            if self.strategy == "robinhood":
+                existing = self._probe_distance(hashes[index], index)
+                if existing < distance:
+                    # Swap with the "richer" entry and keep placing it instead
+                    keys[index], key = key, k
+                    values[index], value = value, values[index]
+                    hashes[index], hash_value = hash_value, hashes[index]
+                    distance = existing
+            index = (index + 1) % size
+            distance += 1
+
+    def _resize(self, new_size=None, incremental=None):
+        """Double the arrays and re-place live entries (tombstones are dropped)."""
+        old_entries = list(zip(self._keys, self._values, self._hashes))
+        if new_size is None:
+            # Mostly tombstones - rebuilding at the same size is enough
+            new_size = self.size * 2 if self.count / self.size > 0.35 else self.size
+        if self.verbose:
+            if new_size == self.size:
+                print(f"🧹 Clearing {self.tombstones} tombstones...")
+            else:
+                arrow = "📈" if new_size > self.size else "📉"
+                print(f"{arrow} Resizing table from {self.size} to {new_size} slots...")
+        self.size = new_size
+        self._keys = [_EMPTY] * self.size
+        self._values = [None] * self.size
+        self._hashes = [0] * self.size
+        self.collisions = 0
+        self.tombstones = 0
+        self._version += 1
+
+        # Stored hashes mean nothing is rehashed, only re-placed
+        for key, value, hash_value in old_entries:
+            if key is not _EMPTY and key is not _DELETED:
+                self._place(key, value, hash_value)
+
+    def _reserve(self, extra):
+        """Grow (or sweep tombstones) once so extra more keys fit under 0.7."""
+        if (self.count + self.tombstones + extra) / self.size <= 0.7:
+            return
+        new_size = self.size
+        while (self.count + extra) / new_size > 0.7:
+            new_size *= 2
+        self._resize(new_size)
+
+    def _finish_rehash(self):
+        """Open addressing always resizes in one go - nothing to finish."""
+
+    def insert(self, key, value):
+        """Insert or update a key-value pair. Returns True if inserted."""
+        inserted = self._insert_hashed(key, value, self._full_hash(key))
+        if inserted:
+            self._grow_if_needed()
+        return inserted
+
+    def _grow_if_needed(self):
+        """Resize if live entries plus tombstones went over 0.7."""
+        # Tombstones lengthen probes just like live entries do
+        if (self.count + self.tombstones) / self.size > 0.7:
+            self._resize()
+
+    def _insert_hashed(self, key, value, hash_value):
+        """Insert with a precomputed hash. No load factor check."""
+        index = self._find_slot(key, hash_value)
+        if index >= 0:
+            self._values[index] = value  # update
+            return False
+
+        # Linear probing reuses the first tombstone on the probe path
+        self._place(key, value, hash_value)
+        self.count += 1
+        self._version += 1
+        return True
+
+    def search(self, key):
+        """Find a value by key. Returns None if not found."""
+        return self._search_hashed(key, self._full_hash(key))
+
+    def _search_hashed(self, key, hash_value, default=None):
+        """Search with a precomputed hash."""
+        index = self._find_slot(key, hash_value)
+        if index < 0:
+            return default
+        return self._values[index]
+
+    def delete(self, key):
+        """Remove a key. Returns True if deleted, False if not found."""
+        deleted = self._delete_hashed(key, self._full_hash(key))
+        if deleted:
+            self._shrink_if_sparse()
+        return deleted
+
+    def _delete_hashed(self, key, hash_value):
+        """Delete with a precomputed hash."""
+        index = self._find_slot(key, hash_value)
+        if index < 0:
+            return False
+
+        keys, values, hashes, size = self._keys, self._values, self._hashes, self.size
+        if self.strategy == "linear":
+            keys[index] = _DELETED
+            values[index] = None
+            self.tombstones += 1
+        else:
+            # Backward-shift: pull following entries one slot closer to home
+            next_index = (index + 1) % size
+            while keys[next_index] is not _EMPTY and self._probe_distance(hashes[next_index], next_index) > 0:
+                keys[index] = keys[next_index]
+                values[index] = values[next_index]
+                hashes[index] = hashes[next_index]
+                index = next_index
+                next_index = (index + 1) % size
+            keys[index] = _EMPTY
+            values[index] = None
+            hashes[index] = 0
+
+        self.count -= 1
+        self._version += 1
+        return True
+
+    def probe_lengths(self):
+        """{slots examined to find a key: number of keys}, e.g. {1: 80, 2: 17, 3: 3}."""
+        histogram = {}
+        for i in self._live_slots():
+            probes = self._probe_distance(self._hashes[i], i) + 1
+            histogram[probes] = histogram.get(probes, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def sizeof(self, deep=False):
+        """Bytes used by the three slot arrays (deep=True adds keys and values)."""
+        total = (sys.getsizeof(self._keys) + sys.getsizeof(self._values)
+                 + sys.getsizeof(self._hashes))
+        if deep:
+            for i in self._live_slots():
+                total += sys.getsizeof(self._keys[i]) + sys.getsizeof(self._values[i])
+        return total
+
+    def _live_slots(self):
+        """Yield the index of every slot holding a live entry."""
+        keys = self._keys
+        for index in range(self.size):
+            k = keys[index]
+            if k is not _EMPTY and k is not _DELETED:
+                yield index
+
+    def _iter_entries(self):
+        """Yield (key, value) pairs slot by slot, failing if the table changes."""
+        version = self._version
+        keys, values = self._keys, self._values
+        for i in self._live_slots():
+            if self._version != version:
+                raise RuntimeError("HashTable changed size during iteration")
+            yield keys[i], values[i]
+        if self._version != version:
+            raise RuntimeError("HashTable changed size during iteration")
+
+    def stats(self):
+        """Print hash table statistics."""
+        print("\n" + "="*60)
+        print(f"📊 HASH TABLE STATISTICS ({self.strategy} probing)")
+        print("="*60)
+        print(f"Items: {self.count}")
+        print(f"Slots: {self.size}")
+        print(f"Load Factor: {self._load_factor():.2f}")
+        print(f"Tombstones: {self.tombstones}")
+        print(f"Hash Function: {self.hash_name}")
+        print(f"Collisions: {self.collisions}")
+
+        print(f"\nProbe Length Distribution:")
+        for probes, n in self.probe_lengths().items():
+            print(f"  {probes - 1:2d} steps: {n} items")
+        print(f"\nMemory: {_format_bytes(self.sizeof())} "
+              f"({self.sizeof() / max(self.count, 1):.0f} bytes/entry, keys & values excluded)")
+        print("="*60 + "\n")
+
+    def __repr__(self):
+        """Developer representation."""
+        return (f"OpenAddressingHashTable(strategy={self.strategy}, size={self.size}, "
+                f"count={self.count}, load={self._load_factor():.2f})")
+
+
+# ========================================
+# CONCURRENT HASH TABLE
+# ========================================
+
+class _Segment:
+    """One independently locked slice of a ConcurrentHashTable."""
+
+    __slots__ = ("table", "lock", "version")
+
+    def __init__(self, table):
+        self.table = table
+        self.lock = threading.Lock()
+        self.version = 0  # odd while a writer is inside (a "seqlock")
+
+
+class ConcurrentHashTable:
+    """
+    Thread-safe hash table using lock striping.
+
+    Keys are spread over `segments` independent HashTables, each with its
+    own lock, so threads writing to different segments never wait on each
+    other. A resize only locks the one segment that is growing.
+
+    Reads don't take a lock at all: each segment has a version number that
+    writers bump before and after changing it. A reader notes the version,
+    searches, and checks the version again - if a writer got in the way
+    the read is simply retried under the lock.
+
+    Extra kwargs (strategy, hash_func, ...) are passed to every segment.
+    """
+
+    def __init__(self, segments=16, initial_size=8, hash_func="builtin", seed=None, **table_kwargs):
+        """Create the segments, all sharing one hash function and seed."""
+        if table_kwargs.get("incremental"):
+            raise ValueError("ConcurrentHashTable segments resize in one go; incremental=True "
+                             "would make lock-free reads move entries")
+        table_kwargs.setdefault("verbose", False)
+        seed = random.getrandbits(64) if seed is None else seed
+        self._segments = [
+            _Segment(HashTable(initial_size, hash_func=hash_func, seed=seed, **table_kwargs))
+            for _ in range(segments)
+        ]
+        first = self._segments[0].table
+        self._hasher, self.seed = first._hasher, first.seed
+
+    def _segment_for(self, hash_value):
+        """
+        Pick a segment from the hash's high bits.
+
+        Tables index buckets with the low bits (hash % size), so using
+        them here too would leave most buckets in each segment empty.
+        """
+        mixed = (hash_value * 0x9E3779B97F4A7C15) & _MASK64
+        return self._segments[(mixed * len(self._segments)) >> 64]
+
+    def _write(self, segment, operation):
+        """Run operation(table) holding the segment lock, flagging readers."""
+        with segment.lock:
+            segment.version += 1
+            try:
+                return operation(segment.table)
+            finally:
+                segment.version += 1
+
+    def insert(self, key, value):
+        """Insert or update a key-value pair. Returns True if inserted."""
+        hash_value = self._hasher(key, self.seed)
+
+        def operation(table):
+            inserted = table._insert_hashed(key, value, hash_value)
+            if inserted:
+                table._grow_if_needed()
+            return inserted
+
+        return self._write(self._segment_for(hash_value), operation)
+
+    def search(self, key, default=None):
+        """Find a value by key without locking (unless a writer interferes)."""
+        hash_value = self._hasher(key, self.seed)
+        segment = self._segment_for(hash_value)
+
+        version = segment.version
+        if not version & 1:
+            try:
+                value = segment.table._search_hashed(key, hash_value, default)
+                if segment.version == version:
+                    return value
+            except (IndexError, TypeError, ValueError):
+                pass  # saw a half-finished resize - retry under the lock
+
+        with segment.lock:
+            return segment.table._search_hashed(key, hash_value, default)
+
+    def delete(self, key):
+        """Remove a key. Returns True if deleted, False if not found."""
+        hash_value = self._hasher(key, self.seed)
+
+        def operation(table):
+            deleted = table._delete_hashed(key, hash_value)
+            if deleted:
+                table._shrink_if_sparse()
+            return deleted
+
+        return self._write(self._segment_for(hash_value), operation)
+
+    def setdefault(self, key, default=None):
+        """Atomically return the value for key, inserting default if missing."""
+        hash_value = self._hasher(key, self.seed)
+        missing = object()
+
+        def operation(table):
+            value = table._search_hashed(key, hash_value, missing)
+            if value is not missing:
+                return value
+            table._insert_hashed(key, default, hash_value)
+            table._grow_if_needed()
+            return default
+
+        return self._write(self._segment_for(hash_value), operation)
+
+    def items(self):
+        """
+        Yield (key, value) pairs one segment at a time.
+
+        Each segment is copied under its lock, so iteration never fails,
+        but changes in other segments may or may not be seen.
+        """
+        for segment in self._segments:
+            with segment.lock:
+                snapshot = list(segment.table.items())
+            yield from snapshot
+
+    def keys(self):
+        """Yield keys (weakly consistent, see items())."""
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        """Yield values (weakly consistent, see items())."""
+        for _, value in self.items():
+            yield value
+
+    @property
+    def count(self):
+        """Total number of items across segments."""
+        return sum(segment.table.count for segment in self._segments)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key):
+        return self.search(key) is not None
+
+    def __setitem__(self, key, value):
+        self.insert(key, value)
+
+    def __getitem__(self, key):
+        value = self.search(key)
+        if value is None:
+            raise KeyError(f"Key '{key}' not found")
+        return value
+
+    def stats(self):
+        """Print per-segment statistics."""
+        print("\n" + "="*60)
+        print("📊 CONCURRENT HASH TABLE STATISTICS")
+        print("="*60)
+        print(f"Items: {self.count}")
+        print(f"Segments: {len(self._segments)}")
+        for i, segment in enumerate(self._segments):
+            table = segment.table
+            print(f"  Segment {i:2d}: {table.count:6d} items, {table.size:6d} slots, "
+                  f"load {table._load_factor():.2f}")
+        print("="*60 + "\n")
+
+    def save(self, path):
+        """Write a snapshot (segments are copied one at a time)."""
+        items = list(self.items())
+        return write_snapshot(path, items, len(items))
+
+    def __repr__(self):
+        return f"ConcurrentHashTable(segments={len(self._segments)}, count={self.count})"
+
+
+# ========================================
+# SNAPSHOT FILES
+# ========================================
+# Layout (all integers little-endian):
+#
+#   header  magic "HTSNAP01", version, flags, count, slots, seed, heap offset
+#   index   `slots` x (hash: u64, record offset: u64) - open addressing,
+#           linear probing, offset 0 = empty slot
+#   heap    records: key length u32, value length u32, key bytes, value bytes
+#
+# Keys and values are stored with a one-byte type tag. Lookups hash the
+# encoded key with FNV-1a (stable across processes, unlike hash()), probe
+# the index and compare bytes straight out of the mmap - nothing else in
+# the file is decoded.
+
+_SNAPSHOT_MAGIC = b"HTSNAP01"
+_SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQ")
+_SLOT = struct.Struct("<QQ")
+_RECORD = struct.Struct("<II")
+
+
+def _encode_key(key):
+    """Tagged bytes for a snapshot key. Only types with a stable encoding are allowed."""
+    if isinstance(key, str):
+        return b"s" + key.encode("utf-8", "surrogatepass")
+    if isinstance(key, bytes):
+        return b"b" + key
+    if isinstance(key, int):
+        return b"i" + str(int(key)).encode()  # True -> 1, like dict treats it
+    raise TypeError(f"Snapshot keys must be str, bytes or int, not {type(key).__name__}")
+
+
+def _decode_key(data):
+    tag, payload = bytes(data[:1]), data[1:]
+    if tag == b"s":
+        return str(payload, "utf-8", "surrogatepass")
+    if tag == b"b":
+        return bytes(payload)
+    return int(bytes(payload))
+
+
+def _encode_value(value):
+    """Tagged bytes for a value: str/bytes/int natively, anything else pickled."""
+    if type(value) is str:
+        return b"s" + value.encode("utf-8", "surrogatepass")
+    if type(value) is bytes:
+        return b"b" + value
+    if type(value) is int:
+        return b"i" + str(value).encode()
+    return b"p" + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_value(data):
+    tag, payload = bytes(data[:1]), data[1:]
+    if tag == b"s":
+        return str(payload, "utf-8", "surrogatepass")
+    if tag == b"b":
+        return bytes(payload)
+    if tag == b"i":
+        return int(bytes(payload))
+    return pickle.loads(payload)
+
+
+def write_snapshot(path, items, count, seed=None):
+    """
+    Write (key, value) pairs to a snapshot file.
+
+    The file is written next to `path` and renamed into place, so readers
+    never see a half-written snapshot.
+    """
+    seed = random.getrandbits(64) if seed is None else seed
+    slots = 8
+    while count / slots > 0.5:
+        slots *= 2
+    mask = slots - 1
+    heap_offset = _HEADER.size + slots * _SLOT.size
+    index = array("Q", bytes(slots * _SLOT.size))
+
+    tmp_path = f"{path}.tmp"
+    written = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            f.seek(heap_offset)
+            offset = heap_offset
+            for key, value in items:
+                if written == count:
+                    raise ValueError("More items than the count given to write_snapshot()")
+                key_bytes, value_bytes = _encode_key(key), _encode_value(value)
+                hash_value = fnv1a_hash(key_bytes, seed)
+
+                i = hash_value & mask
+                while index[2 * i + 1]:
+                    i = (i + 1) & mask
+                index[2 * i] = hash_value
+                index[2 * i + 1] = offset
+
+                f.write(_RECORD.pack(len(key_bytes), len(value_bytes)))
+                f.write(key_bytes)
+                f.write(value_bytes)
+                offset += _RECORD.size + len(key_bytes) + len(value_bytes)
+                written += 1
+
+            if sys.byteorder == "big":
+                index.byteswap()
+            f.seek(0)
+            f.write(_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, 0, written, slots, seed, heap_offset))
+            f.write(index.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        # Only still there if something failed before the rename
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+class MappedHashTable:
+    """
+    Read-only view of a snapshot file through mmap.
+
+    Opening is O(1): only the header is read. Each lookup touches one or
+    two index slots and one record, and the OS pages them in on demand, so
+    a huge snapshot is usable immediately and shared between processes.
+
+        with MappedHashTable("table.snap") as table:
+            table["apple"]
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{path}' is empty, not a snapshot")
+        self._view = memoryview(self._mm)
+
+        size = len(self._mm)
+        if size < _HEADER.size:
+            self.close()
+            raise ValueError(f"'{path}' is not an HTSNAP01 snapshot (only {size} bytes)")
+        magic, version, _, self.count, self.slots, self.seed, self._heap_offset = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(f"'{path}' is not a version {_SNAPSHOT_VERSION} HashTable snapshot")
+        if size < self._heap_offset:
+            self.close()
+            raise ValueError(f"'{path}' is not an HTSNAP01 snapshot (index is truncated)")
+        self._mask = self.slots - 1
+
+    def _find(self, key):
+        """Return (value_start, value_end) of key's record, or None."""
+        try:
+            key_bytes = _encode_key(key)
+        except TypeError:
+            return None
+        hash_value = fnv1a_hash(key_bytes, self.seed)
+        mm, view, mask = self._mm, self._view, self._mask
+
+        i = hash_value & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(mm, _HEADER.size + i * _SLOT.size)
+            if offset == 0:
+                return None
+            if slot_hash == hash_value:
+                key_len, value_len = _RECORD.unpack_from(mm, offset)
+                start = offset + _RECORD.size
+                if view[start:start + key_len] == key_bytes:
+                    return start + key_len, start + key_len + value_len
+            i = (i + 1) & mask
+
+    def search(self, key, default=None):
+        """Find a value by key. Only that one value is decoded."""
+        found = self._find(key)
+        if found is None:
+            return default
+        return _decode_value(self._view[found[0]:found[1]])
+
+    def items(self):
+        """Yield (key, value) pairs in file order."""
+        mm, view = self._mm, self._view
+        offset = self._heap_offset
+        for _ in range(self.count):
+            key_len, value_len = _RECORD.unpack_from(mm, offset)
+            start = offset + _RECORD.size
+            key = _decode_key(view[start:start + key_len])
+            value = _decode_value(view[start + key_len:start + key_len + value_len])
+            yield key, value
+            offset = start + key_len + value_len
+
+    def keys(self):
+        for key, _ in self.items():
+            yield key
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    def close(self):
+        """Unmap and close the file."""
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __getitem__(self, key):
+        found = self._find(key)
+        if found is None:
+            raise KeyError(f"Key '{key}' not found")
+        return _decode_value(self._view[found[0]:found[1]])
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return self.keys()
+
+    def __repr__(self):
+        return f"MappedHashTable(path={self.path!r}, count={self.count}, slots={self.slots})"
+
+
 # ========================================
 # TEST SUITE (Run this to check your work!)
 # ========================================
@@ -393,6 +1667,282 @@ def test_hash_table():
     except Exception as e:
         print(f"  ❌ Integration test failed: {e}")
     
+    print()
+
+    # Test 7: Open addressing backends
+    print("TEST 7: Open Addressing Backends (linear & robinhood)")
+    for strategy in ("linear", "robinhood"):
+        try:
+            ht = HashTable(initial_size=4, strategy=strategy)
+            assert isinstance(ht, OpenAddressingHashTable)
+            for i in range(50):
+                ht.insert(f"key{i}", i)
+            assert ht.count == 50
+            assert all(ht.search(f"key{i}") == i for i in range(50))
+
+            # Delete half, then make sure the rest is still reachable
+            for i in range(0, 50, 2):
+                assert ht.delete(f"key{i}")
+            assert not ht.delete("key0")
+            assert ht.search("key0") is None
+            assert all(ht[f"key{i}"] == i for i in range(1, 50, 2))
+
+            ht.insert("key1", 100)
+            assert ht["key1"] == 100 and ht.count == 25
+            print(f"  ✅ {strategy}: {repr(ht)}")
+        except Exception as e:
+            print(f"  ❌ {strategy} backend failed: {e!r}")
+
+    print()
+
+    # Test 8: Hash functions
+    print("TEST 8: Pluggable Hash Functions")
+    for name in HASH_FUNCTIONS:
+        try:
+            ht = HashTable(initial_size=4, hash_func=name, seed=42)
+            for word in ("cat", "act", "tac", 1, 1.5, b"bytes"):
+                ht[word] = word
+            assert all(ht[word] == word for word in ("cat", "act", "tac", 1, 1.5, b"bytes"))
+            if name != "ascii":  # str(1.0) != str(1) - one more reason to retire it
+                assert ht[1.0] == 1  # equal keys must hash equally
+            print(f"  ✅ {name}: hash('cat') = {ht._full_hash('cat'):#x}")
+        except Exception as e:
+            print(f"  ❌ {name} failed: {e!r}")
+    try:
+        assert fnv1a_hash(b"a") == 0xAF63DC4C8601EC8C
+        assert xxhash64(b"abc") == 0x44BC2CF5AD770999
+        assert ascii_hash("cat") == ascii_hash("act")
+        assert builtin_hash("cat", 1) != builtin_hash("cat", 2)
+        print("  ✅ Known test vectors match")
+    except AssertionError:
+        print("  ❌ Hash function test vectors don't match")
+
+    print()
+
+    # Test 9: Incremental resize
+    print("TEST 9: Incremental Resize")
+    try:
+        ht = HashTable(initial_size=4, incremental=True, rehash_step=1, verbose=False)
+        for i in range(200):
+            ht.insert(i, i * 2)
+            assert ht.search(i // 2) == (i // 2) * 2  # readable mid-migration
+        assert ht.count == 200 and sorted(ht.keys()) == list(range(200))
+        for i in range(0, 200, 3):
+            assert ht.delete(i)
+        ht._finish_rehash()
+        assert ht._old_buckets is None
+        assert all(ht.search(i) == (None if i % 3 == 0 else i * 2) for i in range(200))
+        print(f"  ✅ Incremental resize works! {repr(ht)}")
+    except Exception as e:
+        print(f"  ❌ Incremental resize failed: {e!r}")
+
+    print()
+
+    # Test 10: Bulk operations
+    print("TEST 10: Bulk Operations (from_items, update, get_many, delete_many)")
+    for strategy in HashTable.STRATEGIES:
+        try:
+            pairs = [(f"key{i}", i) for i in range(1000)]
+            ht = HashTable.from_items(pairs, strategy=strategy, verbose=False)
+            size_after_load = ht.size
+            assert ht.count == 1000 and ht._load_factor() <= 0.7
+            assert ht.update({"key0": -1, "new": 5}) == 1
+            assert ht.get_many(["key0", "key999", "new", "missing"]) == [-1, 999, 5, None]
+            assert ht.delete_many(["key0", "key1", "missing"]) == 2
+            assert ht.count == 999 and ht.size == size_after_load
+            print(f"  ✅ {strategy}: {repr(ht)}")
+        except Exception as e:
+            print(f"  ❌ {strategy} bulk operations failed: {e!r}")
+
+    print()
+
+    # Test 11: Shrinking and compaction
+    print("TEST 11: Shrink-on-Delete & compact()")
+    for strategy in HashTable.STRATEGIES:
+        try:
+            ht = HashTable.from_items(((i, i) for i in range(1000)), expected_size=1000,
+                                      strategy=strategy, verbose=False)
+            peak_size, peak_bytes = ht.size, ht.sizeof()
+            for i in range(950):
+                ht.delete(i)
+            assert ht.size < peak_size and ht.sizeof() < peak_bytes
+            assert sorted(ht.keys()) == list(range(950, 1000))
+
+            # No automatic shrinking: compact() does it on demand
+            ht = HashTable.from_items([(i, i) for i in range(1000)], strategy=strategy,
+                                      verbose=False, min_load_factor=0)
+            ht.delete_many(range(990))
+            assert ht.size == peak_size
+            assert ht.compact() == 32 and ht.count == 10 and ht.search(995) == 995
+            print(f"  ✅ {strategy}: {peak_size} -> {ht.size} slots, {ht.sizeof()} bytes")
+        except Exception as e:
+            print(f"  ❌ {strategy} shrinking failed: {e!r}")
+
+    print()
+
+    # Test 12: Lazy views
+    print("TEST 12: Lazy keys()/values()/items() Views")
+    for strategy in HashTable.STRATEGIES:
+        try:
+            ht = HashTable.from_items({"a": 1, "b": 2, "c": 3}, strategy=strategy)
+            keys = ht.keys()
+            assert len(keys) == 3 and "a" in keys and "z" not in keys
+            assert keys & {"a", "z"} == {"a"} and keys | {"z"} == {"a", "b", "c", "z"}
+            assert sorted(ht.values()) == [1, 2, 3] and 2 in ht.values()
+            assert ("b", 2) in ht.items() and ("b", 3) not in ht.items()
+
+            ht["d"] = 4  # views are live
+            assert len(keys) == 4 and sorted(keys) == ["a", "b", "c", "d"]
+
+            try:
+                for key in ht.keys():
+                    ht.insert(key + "!", 0)
+                print(f"  ❌ {strategy}: mutation during iteration not detected")
+                continue
+            except RuntimeError:
+                pass
+            for key, value in ht.items():
+                ht[key] = value * 10  # updating values is fine
+            print(f"  ✅ {strategy}: {ht}")
+        except Exception as e:
+            print(f"  ❌ {strategy} views failed: {e!r}")
+
+    print()
+
+    # Test 13: Concurrent hash table
+    print("TEST 13: ConcurrentHashTable (8 threads)")
+    for strategy in HashTable.STRATEGIES:
+        try:
+            cht = ConcurrentHashTable(segments=4, strategy=strategy)
+            errors = []
+
+            def worker(thread_id):
+                try:
+                    for i in range(2000):
+                        cht.insert((thread_id, i), i)
+                        assert cht.search((thread_id, i // 2)) == i // 2
+                    for i in range(0, 2000, 2):
+                        assert cht.delete((thread_id, i))
+                    cht.setdefault("shared", thread_id)
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+            assert not errors, errors[0]
+            assert cht.count == 8 * 1000 + 1 and len(list(cht.items())) == cht.count
+            assert cht[(3, 1999)] == 1999 and (3, 2) not in cht
+            print(f"  ✅ {strategy}: {repr(cht)}")
+        except Exception as e:
+            print(f"  ❌ {strategy} concurrent table failed: {e!r}")
+
+    print()
+
+    # Test 14: Snapshots
+    print("TEST 14: save() / MappedHashTable Snapshots")
+    import tempfile
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.snap")
+            ht = HashTable.from_items([(f"key{i}", i) for i in range(500)], verbose=False)
+            ht.update({b"raw": b"\x00\xff", 42: {"nested": [1, 2]}, "pi": 3.14, "none": None})
+            assert ht.save(path) == 504
+
+            with MappedHashTable(path) as snap:
+                assert len(snap) == 504 and snap["key123"] == 123
+                assert snap[b"raw"] == b"\x00\xff" and snap[42] == {"nested": [1, 2]}
+                assert snap["pi"] == 3.14 and "none" in snap and snap.search("none") is None
+                assert "missing" not in snap and snap.search(1.5, "default") == "default"
+                assert dict(snap.items()) == dict(ht.items())
+
+            loaded = HashTable.load(path, strategy="robinhood")
+            assert loaded["key499"] == 499 and loaded.count == 504
+            print(f"  ✅ Snapshot round trip works! {os.path.getsize(path)} bytes on disk")
+    except Exception as e:
+        print(f"  ❌ Snapshot test failed: {e!r}")
+
+    print()
+
+    # Test 15: sizeof() counts empty buckets too
+    print("TEST 15: sizeof() on a Sparse Table")
+
+    def slot_bytes(table):
+        """sys.getsizeof over every bucket array, bucket list and entry."""
+        arrays = [table.buckets]
+        if table._old_buckets is not None:
+            arrays.append(table._old_buckets)
+        total = 0
+        for array in arrays:
+            total += sys.getsizeof(array)
+            for bucket in array:
+                if bucket is not None:
+                    total += sys.getsizeof(bucket) + sum(map(sys.getsizeof, bucket))
+        return total
+
+    try:
+        sparse = HashTable(initial_size=4096, verbose=False, min_load_factor=0)
+        for i in range(10):
+            sparse.insert(i, i)
+        assert sparse.sizeof() == slot_bytes(sparse), (sparse.sizeof(), slot_bytes(sparse))
+        print(f"  ✅ 10 keys in 4096 buckets: {sparse.sizeof():,} bytes")
+
+        # Mid-resize: both the old and the new array are live
+        growing = HashTable(initial_size=64, verbose=False, incremental=True, rehash_step=1)
+        i = 0
+        while growing._old_buckets is None:
+            growing.insert(i, i)
+            i += 1
+        assert growing.sizeof() == slot_bytes(growing)
+        print(f"  ✅ During an incremental resize: {growing.sizeof():,} bytes")
+    except Exception as e:
+        print(f"  ❌ sizeof test failed: {e!r}")
+
+    print()
+
+    # Test 16: one constructor signature for every strategy
+    print("TEST 16: Same HashTable(...) Arguments for Every Strategy")
+    try:
+        for strategy in HashTable.STRATEGIES:
+            ht = HashTable(8, strategy, "builtin", None, False, 2, False)
+            ht.insert("a", 1)
+            assert ht["a"] == 1 and not ht.verbose
+        print(f"  ✅ Positional and rehash_step arguments accepted by {HashTable.STRATEGIES}")
+    except Exception as e:
+        print(f"  ❌ Constructor test failed: {e!r}")
+
+    print()
+
+    # Test 17: damaged snapshots fail cleanly
+    print("TEST 17: Truncated Snapshots and Failed Writes")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "table.snap")
+            HashTable.from_items([(f"key{i}", i) for i in range(50)], verbose=False).save(path)
+            with open(path, "rb") as f:
+                data = f.read()
+            for size in (10, _HEADER.size + 5):
+                with open(path, "wb") as f:
+                    f.write(data[:size])
+                try:
+                    MappedHashTable(path)
+                    print(f"  ❌ {size}-byte snapshot opened without an error")
+                except ValueError as e:
+                    assert "not an HTSNAP01 snapshot" in str(e), e
+            print("  ✅ Truncated files raise ValueError, not struct.error")
+
+            try:
+                write_snapshot(path, [("a", 1), ("b", 2)], count=1)
+                print("  ❌ Too many items should raise ValueError")
+            except ValueError:
+                assert os.listdir(tmp) == ["table.snap"], os.listdir(tmp)
+                print("  ✅ A failed write leaves no .tmp file behind")
+    except Exception as e:
+        print(f"  ❌ Damaged snapshot test failed: {e!r}")
+
     print("\n" + "="*60)
 
 
@@ -0,0 +1,345 @@
+"""
+Hash Table Benchmarks - Day 5
+=============================
+
+Measures how our HashTable actually behaves instead of reciting Big-O.
+
+Resize latency benchmark (latency):
+  Inserts N keys one at a time and records how long EACH insert took.
+  A stop-the-world resize shows up as a few huge outliers (p99.9 / max);
+  an incremental resize spreads that work out and keeps the tail flat.
+
+Workload suite (suite):
+  Runs insert / search / delete / bulk-load workloads against every
+  HashTable backend and the built-in dict, with
+    - key types:  int, str
+    - workloads:  uniform  - every key looked up equally often
+                  zipf     - a few hot keys get most lookups (real traffic)
+                  adversarial - keys built to collide (anagrams, spaced ints)
+  and reports ops/sec, bytes/entry, max probe length and the probe length
+  distribution. --json writes everything out for regression tracking.
+
+Usage:
+  python hash_table_bench.py latency
+  python hash_table_bench.py latency --size 1000000 --step 8
+  python hash_table_bench.py suite --size 100000
+  python hash_table_bench.py suite --backends chaining dict --workloads zipf --json bench.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+
+from hash_table import HASH_FUNCTIONS, HashTable
+
+
+def latency_histogram(latencies_ns):
+    """
+    Group latencies into power-of-two buckets.
+
+    Returns:
+        dict: {upper_bound_ns: count}, e.g. {1024: 5000, 2048: 120, ...}
+    """
+    histogram = {}
+    for ns in latencies_ns:
+        bound = 1 << max(ns, 1).bit_length()
+        histogram[bound] = histogram.get(bound, 0) + 1
+    return dict(sorted(histogram.items()))
+
+
+def percentile(sorted_values, pct):
+    """Value at the given percentile of an already sorted list."""
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+class _NoGC:
+    """Context manager that pauses the garbage collector (like timeit does)."""
+
+    def __enter__(self):
+        self.was_enabled = gc.isenabled()
+        gc.disable()
+
+    def __exit__(self, *exc_info):
+        if self.was_enabled:
+            gc.enable()
+
+
+def measure_insert_latency(table, n_keys):
+    """Insert n_keys int keys, timing each insert separately (in ns)."""
+    latencies = []
+    clock = time.perf_counter_ns
+    insert = table.insert
+
+    # Like timeit: keep GC pauses out of the numbers we're comparing
+    with _NoGC():
+        for i in range(n_keys):
+            start = clock()
+            insert(i, i)
+            latencies.append(clock() - start)
+    return latencies
+
+
+def summarize(latencies_ns):
+    """Percentile summary of a latency list."""
+    ordered = sorted(latencies_ns)
+    return {
+        "ops": len(ordered),
+        "p50_ns": percentile(ordered, 50),
+        "p99_ns": percentile(ordered, 99),
+        "p999_ns": percentile(ordered, 99.9),
+        "max_ns": ordered[-1] if ordered else 0,
+        "total_s": sum(ordered) / 1e9,
+        "histogram": latency_histogram(ordered),
+    }
+
+
+def print_summary(name, summary):
+    """Pretty-print one latency summary with a bar chart histogram."""
+    print(f"\n{name}")
+    print("-" * 60)
+    print(f"  ops: {summary['ops']:,}   total: {summary['total_s']:.3f}s")
+    print(f"  p50: {summary['p50_ns'] / 1000:8.1f} µs")
+    print(f"  p99: {summary['p99_ns'] / 1000:8.1f} µs")
+    print(f"  p99.9: {summary['p999_ns'] / 1000:6.1f} µs")
+    print(f"  max: {summary['max_ns'] / 1000:8.1f} µs")
+
+    peak = max(summary["histogram"].values())
+    for bound, count in summary["histogram"].items():
+        bar = "█" * max(1, int(count / peak * 30))
+        print(f"  ≤{bound / 1000:10.1f} µs {count:>9,} {bar}")
+
+
+def benchmark_resize(n_keys, rehash_step):
+    """Compare stop-the-world and incremental resizing on the same workload."""
+    results = {}
+    configs = [
+        ("stop-the-world", dict(incremental=False)),
+        (f"incremental (step={rehash_step})", dict(incremental=True, rehash_step=rehash_step)),
+    ]
+    for name, options in configs:
+        table = HashTable(initial_size=8, verbose=False, **options)
+        results[name] = summarize(measure_insert_latency(table, n_keys))
+    return results
+
+
+# ========================================
+# WORKLOAD SUITE
+# ========================================
+
+BACKENDS = ("chaining", "linear", "robinhood", "dict")
+WORKLOADS = ("uniform", "zipf", "adversarial")
+KEY_TYPES = ("int", "str")
+
+
+def make_keys(n, key_type, workload, rng):
+    """
+    n distinct keys.
+
+    'adversarial' str keys are all anagrams of each other (every one has
+    the same ASCII sum), int keys are multiples of 2**32 (identical low bits).
+    """
+    if workload == "adversarial":
+        if key_type == "str":
+            letters = "abcdefghijkl"
+            return ["".join(p) for p in itertools.islice(itertools.permutations(letters), n)]
+        return [i << 32 for i in range(n)]
+    numbers = rng.sample(range(n * 10), n)
+    if key_type == "str":
+        return [f"user:{x:08d}" for x in numbers]
+    return numbers
+
+
+def make_lookups(keys, workload, n_ops, rng, zipf_s=1.1):
+    """Keys to search for: uniform, or Zipf-distributed (rank r has weight 1/r^s)."""
+    if workload != "zipf":
+        return rng.choices(keys, k=n_ops)
+    cumulative = list(itertools.accumulate(1 / rank ** zipf_s for rank in range(1, len(keys) + 1)))
+    return rng.choices(keys, cum_weights=cumulative, k=n_ops)
+
+
+def _rate(n_ops, seconds):
+    return n_ops / seconds if seconds > 0 else float("inf")
+
+
+def run_case(backend, keys, lookups, hash_func="builtin"):
+    """Time one backend on one key set. Returns a result dict."""
+    clock = time.perf_counter
+    pairs = [(k, i) for i, k in enumerate(keys)]
+    to_delete = keys[::2]
+    result = {"backend": backend, "keys": len(keys), "lookups": len(lookups)}
+
+    with _NoGC():
+        if backend == "dict":
+            start = clock()
+            table = {}
+            for k, v in pairs:
+                table[k] = v
+            insert_s = clock() - start
+
+            start = clock()
+            bulk = dict(pairs)
+            bulk_s = clock() - start
+
+            get = table.get
+            start = clock()
+            for k in lookups:
+                get(k)
+            search_s = clock() - start
+
+            result["bytes_per_entry"] = sys.getsizeof(table) / len(table)
+
+            start = clock()
+            for k in to_delete:
+                del table[k]
+            delete_s = clock() - start
+        else:
+            options = dict(strategy=backend, hash_func=hash_func, verbose=False, min_load_factor=0)
+
+            start = clock()
+            table = HashTable(initial_size=8, **options)
+            insert = table.insert
+            for k, v in pairs:
+                insert(k, v)
+            insert_s = clock() - start
+
+            start = clock()
+            bulk = HashTable.from_items(pairs, **options)
+            bulk_s = clock() - start
+
+            search = table.search
+            start = clock()
+            for k in lookups:
+                search(k)
+            search_s = clock() - start
+
+            probes = table.probe_lengths()
+            result["bytes_per_entry"] = table.sizeof() / table.count
+            result["max_probe"] = max(probes)
+            result["mean_probe"] = sum(p * n for p, n in probes.items()) / table.count
+            result["probe_histogram"] = {str(p): n for p, n in probes.items()}
+            result["final_size"] = table.size
+
+            delete = table.delete
+            start = clock()
+            for k in to_delete:
+                delete(k)
+            delete_s = clock() - start
+        del bulk
+
+    result["insert_ops_s"] = _rate(len(pairs), insert_s)
+    result["bulk_load_ops_s"] = _rate(len(pairs), bulk_s)
+    result["search_ops_s"] = _rate(len(lookups), search_s)
+    result["delete_ops_s"] = _rate(len(to_delete), delete_s)
+    return result
+
+
+def run_suite(size, lookups, backends=BACKENDS, workloads=WORKLOADS, key_types=KEY_TYPES,
+              hash_func="builtin", seed=0):
+    """Run every backend x workload x key type combination."""
+    rng = random.Random(seed)
+    for key_type in key_types:
+        for workload in workloads:
+            keys = make_keys(size, key_type, workload, rng)
+            queries = make_lookups(keys, workload, lookups, rng)
+            for backend in backends:
+                result = run_case(backend, keys, queries, hash_func)
+                result.update(workload=workload, key_type=key_type)
+                yield result
+
+
+def print_suite_row(r):
+    """One line of the results table."""
+    probe = f"{r['max_probe']:>5} {r['mean_probe']:>6.2f}" if "max_probe" in r else f"{'-':>5} {'-':>6}"
+    print(f"{r['key_type']:<4} {r['workload']:<12} {r['backend']:<10} "
+          f"{r['insert_ops_s'] / 1e3:>8.0f} {r['bulk_load_ops_s'] / 1e3:>8.0f} "
+          f"{r['search_ops_s'] / 1e3:>8.0f} {r['delete_ops_s'] / 1e3:>8.0f} "
+          f"{r['bytes_per_entry']:>7.1f} {probe}")
+
+
+def run_suite_cli(args):
+    """Print the suite as a table (and optionally dump JSON)."""
+    lookups = args.lookups or args.size * 2
+    print("=" * 96)
+    print(f"🏁 HASH TABLE WORKLOAD SUITE ({args.size:,} keys, {lookups:,} lookups, hash={args.hash})")
+    print("=" * 96)
+    print(f"{'key':<4} {'workload':<12} {'backend':<10} {'insert':>8} {'bulk':>8} "
+          f"{'search':>8} {'delete':>8} {'B/entry':>7} {'maxpr':>5} {'meanpr':>6}")
+    print(f"{'':<28} {'(thousand ops/sec)':^35}")
+    print("-" * 96)
+
+    results = []
+    for result in run_suite(args.size, lookups, args.backends, args.workloads,
+                            args.key_types, args.hash, args.seed):
+        print_suite_row(result)
+        results.append(result)
+    print()
+
+    if args.json:
+        report = {
+            "config": {"size": args.size, "lookups": lookups, "hash_func": args.hash,
+                       "seed": args.seed, "python": platform.python_version(),
+                       "platform": platform.platform()},
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"✅ Results written to {args.json}")
+
+
+def run_latency_cli(size, step):
+    """Print the resize latency comparison."""
+    print("=" * 60)
+    print(f"⏱️  INSERT LATENCY ACROSS GROWTH ({size:,} keys)")
+    print("=" * 60)
+
+    for name, summary in benchmark_resize(size, step).items():
+        print_summary(name, summary)
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark HashTable backends",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:")[1],
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    latency = subparsers.add_parser("latency", help="Per-insert latency across growth")
+    latency.add_argument("--size", "-n", type=int, default=200_000,
+                         help="Number of keys to insert (default: 200000)")
+    latency.add_argument("--step", type=int, default=4,
+                         help="Buckets migrated per operation in incremental mode (default: 4)")
+
+    suite = subparsers.add_parser("suite", help="Workload suite vs dict")
+    suite.add_argument("--size", "-n", type=int, default=50_000,
+                       help="Distinct keys per workload (default: 50000)")
+    suite.add_argument("--lookups", type=int, default=None,
+                       help="Searches per workload (default: 2 x size)")
+    suite.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    suite.add_argument("--workloads", nargs="+", choices=WORKLOADS, default=list(WORKLOADS))
+    suite.add_argument("--key-types", nargs="+", choices=KEY_TYPES, default=list(KEY_TYPES))
+    suite.add_argument("--hash", choices=list(HASH_FUNCTIONS), default="builtin",
+                       help="Hash function for HashTable backends (default: builtin)")
+    suite.add_argument("--seed", type=int, default=0, help="Random seed for key generation")
+    suite.add_argument("--json", metavar="FILE", help="Also write results as JSON")
+
+    parser.set_defaults(size=200_000, step=4)  # no subcommand = latency with defaults
+
+    args = parser.parse_args()
+    if args.command == "suite":
+        run_suite_cli(args)
+    else:
+        run_latency_cli(args.size, args.step)
+
+
+if __name__ == "__main__":
+    main()
@@ -633,6 +633,9 @@ def lesson_5_patterns():
     
     print(f"Total expensive function calls: {call_count[0]}")
     print(f"Calls saved by caching: {6 - call_count[0]}")
+    print("\n⚠️  This cache never forgets - it grows with every new input!")
+    print("   lru_cache.py has a bounded version: BoundedCache (LRU/LFU/TTL)")
+    print("   and @memoize(max_size=...) to wrap a function the same way.")
     
     wait_for_enter()
     
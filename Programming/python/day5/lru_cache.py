@@ -0,0 +1,503 @@
+"""
+Bounded Cache (LRU / LFU / TTL) - Day 5 Project 3
+=================================================
+
+A cache with a size limit, built on our own HashTable.
+
+The HashTable maps key -> node, and every node is also threaded onto a
+doubly linked list ("intrusive" list - the links live in the node itself).
+That gives O(1) get, put and evict for every policy:
+
+- 'lru': one list in access order. Hits move to the front,
+         the back (least recently used) is evicted.
+- 'lfu': a list of frequency groups (1, 2, 5, ...), each holding its own
+         list of nodes. A hit moves the node to the next group, the back of
+         the lowest group is evicted (ties broken by recency).
+- 'ttl': one list in write order. Entries expire `ttl` seconds after they
+         were written, the oldest write is evicted first.
+
+Any policy can take a ttl; expired entries count as misses.
+Limit by number of entries (max_size), estimated bytes (max_bytes), or both.
+
+Usage:
+    cache = BoundedCache(max_size=1000, policy="lru")
+    cache.put("user:1", {"name": "Alice"})
+    cache.get("user:1")
+
+    @memoize(max_size=256, ttl=60)
+    def slow_lookup(user_id):
+        ...
+"""
+
+import sys
+import time
+from functools import wraps
+
+from hash_table import HashTable
+
+
+# ========================================
+# INTRUSIVE DOUBLY LINKED LIST
+# ========================================
+
+class _Node:
+    """A cached entry. prev/next link it into its policy list."""
+
+    __slots__ = ("key", "value", "size", "expires_at", "group", "prev", "next")
+
+    def __init__(self, key, value, size, expires_at):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.group = None   # LFU: the _FreqGroup this node sits in
+        self.prev = None
+        self.next = None
+
+
+class _LinkedList:
+    """Circular doubly linked list with a sentinel. Works on anything with prev/next."""
+
+    __slots__ = ("head", "length")
+
+    def __init__(self):
+        self.head = _Node(None, None, 0, None)  # sentinel: head.next is the front
+        self.head.prev = self.head.next = self.head
+        self.length = 0
+
+    def push_front(self, node):
+        node.prev = self.head
+        node.next = self.head.next
+        self.head.next.prev = node
+        self.head.next = node
+        self.length += 1
+
+    def insert_after(self, node, new_node):
+        new_node.prev = node
+        new_node.next = node.next
+        node.next.prev = new_node
+        node.next = new_node
+        self.length += 1
+
+    def remove(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = None
+        self.length -= 1
+
+    def front(self):
+        return None if self.length == 0 else self.head.next
+
+    def back(self):
+        return None if self.length == 0 else self.head.prev
+
+    def __len__(self):
+        return self.length
+
+
+class _FreqGroup:
+    """LFU: all nodes that were accessed `freq` times, most recent first."""
+
+    __slots__ = ("freq", "nodes", "prev", "next")
+
+    def __init__(self, freq):
+        self.freq = freq
+        self.nodes = _LinkedList()
+        self.prev = None
+        self.next = None
+
+
+# ========================================
+# BOUNDED CACHE
+# ========================================
+
+def estimate_size(key, value):
+    """Default byte estimate for an entry (shallow, like sys.getsizeof)."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class BoundedCache:
+    """
+    Size-limited cache with LRU, LFU or TTL eviction.
+
+    Args:
+        max_size: Maximum number of entries (None = unlimited)
+        max_bytes: Maximum estimated bytes (None = unlimited)
+        policy: 'lru', 'lfu' or 'ttl'
+        ttl: Seconds an entry stays valid (required for policy='ttl')
+        sizeof: Function (key, value) -> bytes, used with max_bytes
+        clock: Time source, defaults to time.monotonic
+    """
+
+    POLICIES = ("lru", "lfu", "ttl")
+
+    def __init__(self, max_size=128, max_bytes=None, policy="lru", ttl=None,
+                 sizeof=estimate_size, clock=time.monotonic):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', choose from {self.POLICIES}")
+        if policy == "ttl" and ttl is None:
+            raise ValueError("policy='ttl' needs a ttl (seconds)")
+        if max_size is None and max_bytes is None:
+            raise ValueError("Set max_size, max_bytes or both - otherwise the cache is unbounded")
+
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+
+        self._index = HashTable(verbose=False)   # key -> _Node
+        self._order = _LinkedList()              # lru / ttl order
+        self._groups = _LinkedList()             # lfu: frequency groups, lowest first
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ---------- policy bookkeeping ----------
+
+    def _link(self, node):
+        """Put a brand new node into the policy structure."""
+        if self.policy != "lfu":
+            self._order.push_front(node)
+            return
+        first = self._groups.front()
+        if first is None or first.freq != 1:
+            first = _FreqGroup(1)
+            self._groups.push_front(first)
+        node.group = first
+        first.nodes.push_front(node)
+
+    def _unlink(self, node):
+        """Take a node out of the policy structure."""
+        if self.policy != "lfu":
+            self._order.remove(node)
+            return
+        group = node.group
+        group.nodes.remove(node)
+        node.group = None
+        if not group.nodes:
+            self._groups.remove(group)
+
+    def _touch(self, node):
+        """Record a hit: LRU moves to front, LFU moves up a frequency group."""
+        if self.policy == "lru":
+            self._order.remove(node)
+            self._order.push_front(node)
+        elif self.policy == "lfu":
+            group = node.group
+            target = group.next
+            if target is self._groups.head or target.freq != group.freq + 1:
+                target = _FreqGroup(group.freq + 1)
+                self._groups.insert_after(group, target)
+            group.nodes.remove(node)
+            if not group.nodes:
+                self._groups.remove(group)
+            node.group = target
+            target.nodes.push_front(node)
+        # 'ttl': reads don't change the order
+
+    def _victim(self):
+        """The node that would be evicted next."""
+        if self.policy == "lfu":
+            group = self._groups.front()
+            return group.nodes.back() if group else None
+        return self._order.back()
+
+    # ---------- core operations ----------
+
+    def _remove(self, node):
+        self._unlink(node)
+        self._index.delete(node.key)
+        self.bytes -= node.size
+
+    def _is_expired(self, node, now=None):
+        return node.expires_at is not None and (now if now is not None else self._clock()) >= node.expires_at
+
+    def _lookup(self, key):
+        """Return the live node for key (dropping it if expired), or None."""
+        node = self._index.search(key)
+        if node is not None and self._is_expired(node):
+            self._remove(node)
+            self.expirations += 1
+            return None
+        return node
+
+    def get(self, key, default=None):
+        """Return the cached value, or default on a miss."""
+        node = self._lookup(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(node)
+        return node.value
+
+    def put(self, key, value, ttl=None):
+        """Add or replace an entry, evicting others if the cache is full."""
+        ttl = self.ttl if ttl is None else ttl
+        now = self._clock()
+        expires_at = now + ttl if ttl is not None else None
+        size = self._sizeof(key, value) if self.max_bytes is not None else 0
+
+        node = self._index.search(key)
+        if node is not None:
+            # Replace in place; a rewrite restarts the TTL clock
+            self.bytes += size - node.size
+            node.value, node.size, node.expires_at = value, size, expires_at
+            if self.policy == "ttl":
+                self._order.remove(node)
+                self._order.push_front(node)
+            else:
+                self._touch(node)
+        else:
+            node = _Node(key, value, size, expires_at)
+            self._index.insert(key, node)
+            self._link(node)
+            self.bytes += size
+
+        self._purge_expired(now)
+        self._evict(keep=node)
+
+    def _purge_expired(self, now):
+        """Drop expired entries sitting at the eviction end of the list (O(1) amortized)."""
+        if self.policy != "ttl":
+            return
+        node = self._order.back()
+        while node is not None and self._is_expired(node, now):
+            self._remove(node)
+            self.expirations += 1
+            node = self._order.back()
+
+    def _evict(self, keep=None):
+        """Evict until both limits hold. `keep` (the entry just written) goes last."""
+        while self._over_limit():
+            victim = self._victim()
+            if victim is keep and self.policy == "lfu" and len(self._index) > 1:
+                # The new entry sits alone in the freq-1 group - take the next one
+                victim = self._next_lfu_victim(keep)
+            self._remove(victim)
+            self.evictions += 1
+
+    def _next_lfu_victim(self, keep):
+        """LFU victim other than `keep` (the oldest node in the lowest group)."""
+        group = self._groups.front()
+        node = group.nodes.back()
+        if node is not keep:
+            return node
+        if len(group.nodes) > 1:
+            return node.prev
+        return group.next.nodes.back()
+
+    def _over_limit(self):
+        count = len(self._index)
+        if self.max_size is not None and count > self.max_size:
+            return True
+        return self.max_bytes is not None and self.bytes > self.max_bytes and count > 0
+
+    def delete(self, key):
+        """Remove an entry. Returns True if it was there."""
+        node = self._index.search(key)
+        if node is None:
+            return False
+        self._remove(node)
+        return True
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        self._index = HashTable(verbose=False)
+        self._order = _LinkedList()
+        self._groups = _LinkedList()
+        self.bytes = 0
+
+    # ---------- helpers ----------
+
+    def __contains__(self, key):
+        """'key in cache' - doesn't count as a hit or miss."""
+        return self._lookup(key) is not None
+
+    def __getitem__(self, key):
+        node = self._lookup(key)
+        if node is None:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        self._touch(node)
+        return node.value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get_statistics(self):
+        """Counters as a dict (handy for logging)."""
+        lookups = self.hits + self.misses
+        return {
+            "policy": self.policy,
+            "size": len(self),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def stats(self):
+        """Print cache statistics."""
+        s = self.get_statistics()
+        print("\n" + "="*60)
+        print(f"📊 CACHE STATISTICS ({s['policy'].upper()})")
+        print("="*60)
+        limit = f"/{self.max_size}" if self.max_size is not None else ""
+        print(f"Entries: {s['size']}{limit}")
+        if self.max_bytes is not None:
+            print(f"Bytes: {s['bytes']}/{self.max_bytes}")
+        print(f"Hits: {s['hits']}  Misses: {s['misses']}  Hit rate: {s['hit_rate']:.1%}")
+        print(f"Evictions: {s['evictions']}  Expirations: {s['expirations']}")
+        print("="*60 + "\n")
+
+    def __repr__(self):
+        return f"BoundedCache(policy={self.policy}, size={len(self)}, max_size={self.max_size})"
+
+
+# ========================================
+# DECORATOR
+# ========================================
+
+_MISSING = object()
+_KWARGS_MARK = object()  # separates args from kwargs in memoize keys
+
+
+def memoize(max_size=128, max_bytes=None, policy="lru", ttl=None):
+    """
+    Cache a function's results in a BoundedCache.
+
+    Arguments must be hashable. The cache is available as func.cache.
+
+        @memoize(max_size=1000, policy="lfu")
+        def fib(n): ...
+    """
+    def decorator(func):
+        cache = BoundedCache(max_size=max_size, max_bytes=max_bytes, policy=policy, ttl=ttl)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                # The marker can't appear in a positional call, so f(x, a=1)
+                # and f(<something that looks like kwargs>) never share a key
+                key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# ========================================
+# TEST SUITE (Run this to check your work!)
+# ========================================
+
+def test_bounded_cache():
+    """Test the cache policies."""
+    print("\n" + "="*60)
+    print("🧪 TESTING BOUNDED CACHE")
+    print("="*60 + "\n")
+
+    print("TEST 1: LRU Eviction")
+    try:
+        cache = BoundedCache(max_size=2, policy="lru")
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")          # 'b' is now least recently used
+        cache.put("c", 3)
+        assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.evictions == 1
+        print(f"  ✅ LRU works! {cache.get_statistics()}")
+    except Exception as e:
+        print(f"  ❌ LRU failed: {e!r}")
+    print()
+
+    print("TEST 2: LFU Eviction")
+    try:
+        cache = BoundedCache(max_size=2, policy="lfu")
+        cache.put("a", 1)
+        cache.put("b", 2)
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.put("c", 3)       # 'b' (2 uses) goes, 'a' (4 uses) stays
+        assert "b" not in cache and "a" in cache and "c" in cache
+        cache.put("d", 4)       # 'c' has fewest uses
+        assert "c" not in cache and "d" in cache and len(cache) == 2
+        print(f"  ✅ LFU works! {cache.get_statistics()}")
+    except Exception as e:
+        print(f"  ❌ LFU failed: {e!r}")
+    print()
+
+    print("TEST 3: TTL Expiry")
+    try:
+        now = [0.0]
+        cache = BoundedCache(max_size=10, policy="ttl", ttl=5, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 3
+        cache.put("b", 2)
+        now[0] = 6              # 'a' expired, 'b' still fresh
+        assert cache.get("a") is None and cache.get("b") == 2
+        now[0] = 9
+        cache.put("c", 3)       # purges 'b' from the tail
+        assert len(cache) == 1 and cache.expirations == 2
+        print(f"  ✅ TTL works! {cache.get_statistics()}")
+    except Exception as e:
+        print(f"  ❌ TTL failed: {e!r}")
+    print()
+
+    print("TEST 4: Byte Limit")
+    try:
+        cache = BoundedCache(max_size=None, max_bytes=100, sizeof=lambda k, v: len(v))
+        for i in range(10):
+            cache.put(i, "x" * 30)
+        assert cache.bytes <= 100 and len(cache) == 3
+        assert cache.get(9) is not None and cache.get(0) is None
+        print(f"  ✅ Byte limit works! {cache.bytes} bytes in {len(cache)} entries")
+    except Exception as e:
+        print(f"  ❌ Byte limit failed: {e!r}")
+    print()
+
+    print("TEST 5: @memoize")
+    try:
+        calls = []
+
+        @memoize(max_size=100)
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        assert [square(i) for i in (5, 3, 5, 7, 3, 5)] == [25, 9, 25, 49, 9, 25]
+        assert calls == [5, 3, 7] and square.cache.hits == 3
+
+        @memoize(max_size=100)
+        def echo(*args, **kwargs):
+            return args, kwargs
+
+        assert echo(1, a=2) == ((1,), {"a": 2})
+        assert echo((1,), (("a", 2),)) == (((1,), (("a", 2),)), {})  # old key of echo(1, a=2)
+        print(f"  ✅ memoize works! {square.cache.get_statistics()}")
+    except Exception as e:
+        print(f"  ❌ memoize failed: {e!r}")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    test_bounded_cache()
@@ -0,0 +1,346 @@
+"""
+Streaming Sketches - Day 5
+==========================
+
+Counting the most common items without keeping a count for every item.
+
+A Counter needs one entry per distinct item, so its memory grows with the
+vocabulary. These sketches use a fixed amount of memory that you pick up
+front, and in exchange give answers with known error bounds:
+
+- CountMinSketch: a depth x width grid of counters. Each item adds to one
+  counter per row, its estimate is the smallest of those counters.
+  Never under-counts; over-counts by at most epsilon * N with
+  probability 1 - delta (N = total of all counts).
+- SpaceSaving: keeps only `capacity` items. A new item replaces the one
+  with the smallest count and inherits that count as its possible error.
+  Every item seen more than N / capacity times is guaranteed to be kept.
+- TopKSketch: both together - SpaceSaving finds the heavy hitters, the
+  Count-Min Sketch tightens their counts.
+
+All of them are mergeable: sketches built on separate shards with the
+same settings can be merged into one that describes all the shards.
+
+Usage:
+    sketch = TopKSketch(capacity=1000, epsilon=1e-4, delta=1e-3)
+    sketch.update({"the": 3, "cat": 1})
+    sketch.merge(other_sketch)
+    for word, estimate, low, high in sketch.top(10):
+        ...
+"""
+
+import heapq
+import math
+from array import array
+from hashlib import blake2b
+
+
+# ========================================
+# COUNT-MIN SKETCH
+# ========================================
+
+class CountMinSketch:
+    """
+    Frequency estimates for any item in width x depth counters.
+
+    width = ceil(e / epsilon), depth = ceil(ln(1 / delta)).
+    """
+
+    def __init__(self, epsilon=1e-4, delta=1e-3, seed=0):
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be between 0 and 1")
+        self.epsilon = epsilon
+        self.delta = delta
+        self.seed = seed
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.total = 0
+        self._table = array("Q", [0]) * (self.width * self.depth)
+        # Same seed in every process = same columns = mergeable sketches
+        # (the built-in hash() is randomized per process, so it can't be used)
+        self._hash_key = seed.to_bytes(16, "little")
+
+    def _indexes(self, item):
+        """One table index per row (double hashing: h1 + row * h2)."""
+        data = item.encode() if isinstance(item, str) else item
+        digest = blake2b(data, digest_size=16, key=self._hash_key).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        """Count item `count` more times."""
+        table = self._table
+        for index in self._indexes(item):
+            table[index] += count
+        self.total += count
+
+    def update(self, counts):
+        """Add a {item: count} mapping (e.g. a Counter)."""
+        for item, count in counts.items():
+            self.add(item, count)
+
+    def estimate(self, item):
+        """Upper bound on item's count (exact + at most error_bound())."""
+        table = self._table
+        return min(table[index] for index in self._indexes(item))
+
+    def error_bound(self):
+        """Over-count limit that holds with probability 1 - delta."""
+        return self.epsilon * self.total
+
+    def merge(self, other):
+        """Add another sketch's counts into this one (same settings required)."""
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("can only merge Count-Min Sketches with the same width, depth and seed")
+        self._table = array("Q", map(int.__add__, self._table, other._table))
+        self.total += other.total
+        return self
+
+    def sizeof(self):
+        """Bytes used by the counter table."""
+        return self._table.itemsize * len(self._table)
+
+    def __repr__(self):
+        return (f"CountMinSketch(width={self.width}, depth={self.depth}, "
+                f"total={self.total})")
+
+
+# ========================================
+# SPACE-SAVING (HEAVY HITTERS)
+# ========================================
+
+class SpaceSaving:
+    """
+    The `capacity` most frequent items, each with a count and an error.
+
+    For a kept item: count - error <= true count <= count.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        # One (count, item) entry per kept item. Counts only grow, so an
+        # entry may be stale (too low) - _fix_min() refreshes it lazily.
+        self._heap = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, item):
+        return item in self._counts
+
+    def _fix_min(self):
+        """Make the top of the heap the true minimum, return its count."""
+        heap, counts = self._heap, self._counts
+        while True:
+            count, item = heap[0]
+            actual = counts[item]
+            if count == actual:
+                return count
+            heapq.heapreplace(heap, (actual, item))
+
+    def min_count(self):
+        """Smallest kept count (0 until the summary is full)."""
+        if len(self._counts) < self.capacity:
+            return 0
+        return self._fix_min()
+
+    def add(self, item, count=1):
+        """Count item `count` more times."""
+        self.total += count
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+        else:
+            # Replace the smallest item; the newcomer may have been it all along
+            floor = self._fix_min()
+            _, victim = heapq.heapreplace(self._heap, (floor + count, item))
+            del counts[victim], self._errors[victim]
+            counts[item] = floor + count
+            self._errors[item] = floor
+
+    def update(self, counts):
+        """Add a {item: count} mapping (e.g. a Counter)."""
+        for item, count in counts.items():
+            self.add(item, count)
+
+    def get(self, item):
+        """(count, error) for a kept item, None otherwise."""
+        if item not in self._counts:
+            return None
+        return self._counts[item], self._errors[item]
+
+    def items(self):
+        """[(item, count, error), ...] with the highest count first."""
+        ranked = sorted(self._counts.items(), key=lambda pair: pair[1], reverse=True)
+        return [(item, count, self._errors[item]) for item, count in ranked]
+
+    def merge(self, other):
+        """
+        Merge another summary into this one.
+
+        An item missing from one side may still have been seen there up to
+        that side's min_count() times, so that is added to both its count
+        and its error. Then the `capacity` largest counts are kept.
+        """
+        floor_self, floor_other = self.min_count(), other.min_count()
+        merged = []
+        for item in self._counts.keys() | other._counts.keys():
+            count = self._counts.get(item, floor_self) + other._counts.get(item, floor_other)
+            error = self._errors.get(item, floor_self) + other._errors.get(item, floor_other)
+            merged.append((count, error, item))
+        kept = heapq.nlargest(self.capacity, merged, key=lambda entry: entry[0])
+
+        self._counts = {item: count for count, _, item in kept}
+        self._errors = {item: error for _, error, item in kept}
+        self._heap = [(count, item) for count, _, item in kept]
+        heapq.heapify(self._heap)
+        self.total += other.total
+        return self
+
+    def __repr__(self):
+        return f"SpaceSaving(capacity={self.capacity}, kept={len(self)}, total={self.total})"
+
+
+# ========================================
+# TOP-K = SPACE-SAVING + COUNT-MIN
+# ========================================
+
+class TopKSketch:
+    """Approximate top-K with error bars, in bounded memory."""
+
+    def __init__(self, capacity=1000, epsilon=1e-4, delta=1e-3, seed=0):
+        self.heavy_hitters = SpaceSaving(capacity)
+        self.frequencies = CountMinSketch(epsilon, delta, seed)
+
+    @property
+    def total(self):
+        """Sum of all counts added (exact)."""
+        return self.heavy_hitters.total
+
+    def add(self, item, count=1):
+        self.heavy_hitters.add(item, count)
+        self.frequencies.add(item, count)
+
+    def update(self, counts):
+        """Add a {item: count} mapping (e.g. a Counter)."""
+        self.heavy_hitters.update(counts)
+        self.frequencies.update(counts)
+
+    def merge(self, other):
+        self.heavy_hitters.merge(other.heavy_hitters)
+        self.frequencies.merge(other.frequencies)
+        return self
+
+    def top(self, n):
+        """
+        The n items with the highest estimated counts.
+
+        Returns:
+            list: [(item, estimate, low, high), ...] where
+                  high = estimate is a guaranteed upper bound, and the true
+                  count is >= low (guaranteed from Space-Saving, tightened by
+                  the Count-Min bound with probability 1 - delta)
+        """
+        error_bound = self.frequencies.error_bound()
+        ranked = []
+        for item, count, error in self.heavy_hitters.items():
+            cms_estimate = self.frequencies.estimate(item)
+            high = min(count, cms_estimate)
+            low = max(count - error, math.ceil(cms_estimate - error_bound), 0)
+            ranked.append((item, high, min(low, high), high))
+        ranked.sort(key=lambda entry: entry[1], reverse=True)
+        return ranked[:n]
+
+    def most_common(self, n):
+        """[(item, estimate), ...] - same shape as Counter.most_common()."""
+        return [(item, estimate) for item, estimate, _, _ in self.top(n)]
+
+    def __repr__(self):
+        return f"TopKSketch({self.heavy_hitters!r}, {self.frequencies!r})"
+
+
+# ========================================
+# TEST SUITE (Run this to check your work!)
+# ========================================
+
+def test_sketches():
+    """Test the sketches against exact counts."""
+    import random
+    from collections import Counter
+
+    print("\n" + "="*60)
+    print("🧪 TESTING STREAMING SKETCHES")
+    print("="*60 + "\n")
+
+    rng = random.Random(42)
+    words = [f"w{i}" for i in range(5000)]
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    stream = rng.choices(words, weights=weights, k=100_000)
+    exact = Counter(stream)
+
+    print("TEST 1: Count-Min Sketch")
+    try:
+        cms = CountMinSketch(epsilon=1e-3, delta=1e-3)
+        cms.update(exact)
+        bound = cms.error_bound()
+        overs = [cms.estimate(w) - exact[w] for w in words]
+        assert min(overs) >= 0, "Count-Min must never under-count"
+        assert sum(o > bound for o in overs) <= len(words) * cms.delta * 10
+        print(f"  ✅ Count-Min works! max over-count {max(overs)} (bound {bound:.0f}), {cms}")
+    except Exception as e:
+        print(f"  ❌ Count-Min failed: {e!r}")
+    print()
+
+    print("TEST 2: Space-Saving")
+    try:
+        ss = SpaceSaving(capacity=200)
+        for word in stream:
+            ss.add(word)
+        for word, count, error in ss.items():
+            assert count - error <= exact[word] <= count
+        threshold = len(stream) / ss.capacity
+        assert all(w in ss for w, c in exact.items() if c > threshold), "lost a heavy hitter"
+        print(f"  ✅ Space-Saving works! top 3: {ss.items()[:3]}")
+    except Exception as e:
+        print(f"  ❌ Space-Saving failed: {e!r}")
+    print()
+
+    print("TEST 3: Merging Shards")
+    try:
+        halves = [TopKSketch(capacity=200, epsilon=1e-3), TopKSketch(capacity=200, epsilon=1e-3)]
+        halves[0].update(Counter(stream[:50_000]))
+        halves[1].update(Counter(stream[50_000:]))
+        merged = halves[0].merge(halves[1])
+        assert merged.total == len(stream)
+        for word, estimate, low, high in merged.top(20):
+            assert low <= exact[word] <= high, (word, low, exact[word], high)
+        top_exact = [w for w, _ in exact.most_common(10)]
+        assert [w for w, _ in merged.most_common(10)][:5] == top_exact[:5]
+        print(f"  ✅ Merge works! top 3: {merged.top(3)}")
+    except Exception as e:
+        print(f"  ❌ Merge failed: {e!r}")
+    print()
+
+    print("TEST 4: Mismatched Settings")
+    try:
+        CountMinSketch(epsilon=1e-2).merge(CountMinSketch(epsilon=1e-3))
+        print("  ❌ Should have raised ValueError")
+    except ValueError:
+        print("  ✅ Mismatched sketches rejected!")
+
+    print("\n" + "="*60)
+
+
+if __name__ == "__main__":
+    test_sketches()
@@ -0,0 +1,431 @@
+"""
+Tests for the Word Frequency Analyzer
+Run with: python test_word_frequency.py
+"""
+
+import bz2
+import gzip
+import lzma
+import io
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import tempfile
+from collections import Counter
+from contextlib import redirect_stdout
+
+from word_frequency import (
+    ID_BITS, MIN_SHARD_SIZE, PLAIN_TOKENIZER, FrequencyIndex, NGramCounter, SlidingWindowCounter, Tokenizer, analyze_files, count_files, count_frequencies,
+    count_range, count_range_mmap, display_results, expand_paths, follow_chunks, get_top_words,
+    iter_words,
+    merge_ngrams, merge_sketches, read_chunks, shard_ranges, update_index,
+)
+
+UNICODE_TOKENIZER = Tokenizer('unicode', stop_words=())
+
+
+def test_regex_tokenizer_with_groups():
+    """A --token-pattern with capture groups still yields whole-match words."""
+    print("="*60)
+    print("Testing regex tokenizer with capture groups...")
+    
+    tokenizer = Tokenizer('regex', r'([a-z]+)(x)', stop_words=())
+    words = tokenizer.findall("Box fox ax, lynx and fox")
+    print(f"Tokens: {words}")
+    assert words == ["box", "fox", "ax", "lynx", "fox"]
+    
+    # Through the whole pipeline, including several worker processes
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "foxes.txt")
+    with open(path, "w") as f:
+        f.write("Box fox ax, lynx and fox\n" * 50)
+    try:
+        counter = count_range(path, 0, None, tokenizer, chunk_size=16)
+        assert counter == Counter({"fox": 100, "box": 50, "ax": 50, "lynx": 50})
+        assert count_files([path], 2, tokenizer)[path] == counter
+        display_results(get_top_words(counter, 3), sum(counter.values()), len(counter))
+    finally:
+        os.remove(path)
+        os.rmdir(folder)
+    print("✅ Capture-group pattern tests passed!\n")
+
+
+def test_word_split_across_chunks():
+    """A word cut in half by a chunk boundary is still counted once, whole."""
+    print("="*60)
+    print("Testing words split across chunk boundaries...")
+    
+    assert list(iter_words(["Hello, Wor", "ld!"])) == ["hello", "world"]
+    assert list(iter_words(["hel", "lo", " wor", "ld"])) == ["hello", "world"]
+    assert list(iter_words(["don'", "t stop"], UNICODE_TOKENIZER)) == ["don't", "stop"]
+    
+    text = "The quick brown fox jumps over the lazy dog. " * 20
+    expected = Counter(text.lower().replace(".", "").split())
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "fox.txt")
+        with open(path, "w") as f:
+            f.write(text)
+        for chunk_size in (1, 3, 7, 64, 1 << 20):
+            words = iter_words(read_chunks(path, chunk_size), PLAIN_TOKENIZER)
+            assert count_frequencies(words) == expected, chunk_size
+    print("Same counts with chunk sizes 1, 3, 7, 64 and 1 MB")
+    print("✅ Chunk boundary tests passed!\n")
+
+
+def test_utf8_split_across_chunks():
+    """A multi-byte UTF-8 character cut between two reads decodes correctly."""
+    print("="*60)
+    print("Testing UTF-8 characters split across chunks...")
+    
+    text = "Le café naïve 東京 straße – €5 😀 end\n" * 10
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "utf8.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        expected = Counter(UNICODE_TOKENIZER.findall(text))
+        for chunk_size in range(1, 6):  # every way to cut a 2-, 3- or 4-byte character
+            chunks = list(read_chunks(path, chunk_size))
+            assert "".join(chunks) == text and "\ufffd" not in "".join(chunks)
+            words = iter_words(iter(chunks), UNICODE_TOKENIZER)
+            assert count_frequencies(words) == expected, chunk_size
+    print(f"Tokens: {sorted(expected)}")
+    print("✅ UTF-8 chunk tests passed!\n")
+
+
+def test_shards_match_single_process():
+    """shard_ranges covers the file exactly; workers=1 and N count the same."""
+    print("="*60)
+    print("Testing shard_ranges and count_files with several workers...")
+    
+    line = "Alpha beta gamma, déjà vu! Über 東京 alpha BETA don't stop.\n"
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "big.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            while f.tell() < 5 * MIN_SHARD_SIZE:
+                f.write(line)
+        size = os.path.getsize(path)
+        
+        ranges = shard_ranges(path, 4)
+        print(f"{size:,} bytes → {ranges}")
+        assert len(ranges) == 4 and ranges[0][0] == 0 and ranges[-1][1] == size
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        with open(path, "rb") as f:
+            data = f.read()
+        for start, _ in ranges[1:]:
+            assert data[start - 1:start].isspace()  # cut after whitespace, never mid-word
+        
+        for tokenizer in (PLAIN_TOKENIZER, UNICODE_TOKENIZER):
+            single = count_files([path], 1, tokenizer)[path]
+            assert count_files([path], 4, tokenizer, chunk_size=4096)[path] == single
+            by_shard = Counter()
+            for start, end in ranges:
+                by_shard.update(count_range(path, start, end, tokenizer))
+            assert by_shard == single
+            print(f"  {tokenizer.kind}: {sum(single.values()):,} words, same with 1 or 4 workers")
+    print("✅ Sharding tests passed!\n")
+
+
+def test_mmap_matches_streaming():
+    """The mmap fast path gives the same Counter as the streaming pipeline."""
+    print("="*60)
+    print("Testing mmap fast path against the streaming pipeline...")
+    
+    text = ("The CAT's toy; the cat-flap (mp3s, 42 of them) DON'T panic!\n"
+            "Plain ASCII lines, then one with café and Straße in it.\n" * 3 +
+            "x" * 300 + " trailing_word under_score 7up\n") * 40
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "mixed.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        for tokenizer in (PLAIN_TOKENIZER, Tokenizer('ascii'), UNICODE_TOKENIZER,
+                          Tokenizer('unicode', stop_words={'the', 'of'})):
+            streamed = count_frequencies(iter_words(read_chunks(path, 64), tokenizer))
+            for chunk_size in (16, 100, 1 << 20):  # small windows: many cuts, some mid-token
+                assert count_range_mmap(path, tokenizer=tokenizer, chunk_size=chunk_size) == streamed
+            print(f"  {tokenizer!r}: {len(streamed)} distinct words, identical")
+    print("✅ mmap tests passed!\n")
+
+
+def test_compressed_corpus():
+    """expand_paths + count_files read .gz, .bz2 and .xz like the plain file."""
+    print("="*60)
+    print("Testing compressed files in corpus mode...")
+    
+    text = "Compressed words count the same, même compressés. Words words!\n" * 500
+    data = text.encode("utf-8")
+    with tempfile.TemporaryDirectory() as folder:
+        corpus = os.path.join(folder, "corpus")
+        os.makedirs(os.path.join(corpus, "nested"))
+        with open(os.path.join(corpus, "plain.txt"), "wb") as f:
+            f.write(data)
+        for name, opener in (("a.txt.gz", gzip.open), ("nested/b.txt.bz2", bz2.open),
+                             ("nested/c.txt.xz", lzma.open)):
+            with opener(os.path.join(corpus, name), "wb") as f:
+                f.write(data)
+        
+        paths = expand_paths([corpus])
+        print(f"Found: {[os.path.relpath(p, corpus) for p in paths]}")
+        assert len(paths) == 4
+        xz_only = expand_paths([os.path.join(corpus, "**", "*.xz")])
+        assert xz_only == [os.path.join(corpus, "nested", "c.txt.xz")]
+        
+        for tokenizer in (Tokenizer('ascii'), UNICODE_TOKENIZER):
+            for workers in (1, 3):
+                counts = count_files(paths, workers, tokenizer, chunk_size=1000)
+                plain = counts[os.path.join(corpus, "plain.txt")]
+                assert plain and all(counter == plain for counter in counts.values())
+        print("  Same counts for .txt, .gz, .bz2 and .xz with 1 and 3 workers")
+    print("✅ Compressed corpus tests passed!\n")
+
+
+def test_approx_bounds_hold():
+    """--approx: every reported word's true count is within [low, high]."""
+    print("="*60)
+    print("Testing --approx error bars against exact counts...")
+    
+    # 300 distinct words with Zipf-like counts, far more than the sketch keeps
+    rng = random.Random(7)
+    vocabulary = ["w" + chr(97 + i // 26) + chr(97 + i % 26) for i in range(300)]
+    words = [word for rank, word in enumerate(vocabulary, 1) for _ in range(600 // rank)]
+    rng.shuffle(words)
+    approx = {"capacity": 30, "epsilon": 0.01, "delta": 0.01}
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "zipf.txt")
+        with open(path, "w") as f:
+            for i in range(0, len(words), 12):
+                f.write(" ".join(words[i:i + 12]) + "\n")
+        exact = count_files([path])[path]
+        
+        # The sketches themselves, merged from one or several workers
+        for workers in (1, 3):
+            sketch = merge_sketches(count_files([path], workers, chunk_size=512,
+                                                approx=approx).values())
+            assert sketch.total == sum(exact.values())
+            for word, _, low, high in sketch.top(10):
+                assert low <= exact[word] <= high, (word, low, exact[word], high)
+        
+        # What the CLI prints and exports
+        output = os.path.join(folder, "top.json")
+        with redirect_stdout(io.StringIO()) as printed:
+            analyze_files([path], top_n=10, export_format="json", output_file=output,
+                          chunk_size=512, approx=approx)
+        rows = re.findall(r"^\s*\d+\. (\w+)\s+(\d+) \[(\d+) - (\d+)\]", printed.getvalue(), re.M)
+        assert len(rows) == 10
+        for word, estimate, low, high in rows:
+            assert int(low) <= exact[word] <= int(high) == int(estimate), (word, low, high)
+        with open(output) as f:
+            exported = json.load(f)
+        assert list(exported) == [word for word, *_ in rows]
+        print(f"Top 3 reported: {rows[:3]}, exact {[exact[w] for w, *_ in rows[:3]]}")
+    print("✅ Approximate mode tests passed!\n")
+
+
+def test_ngram_counter():
+    """N-gram merge, packed keys and PMI."""
+    print("="*60)
+    print("Testing NGramCounter...")
+    
+    # Merging shard counters (each with its own word IDs) = one counter over both
+    first = "machine learning is fun and machine learning is hard".split()
+    second = "deep learning is hard so machine learning wins".split()
+    single = NGramCounter(2)
+    single.update(first)
+    single.update(second)
+    shards = [NGramCounter(2), NGramCounter(2)]
+    shards[0].update(first)
+    shards[1].update(second)
+    assert shards[1].words[0] == "deep" and shards[0].words[0] == "machine"  # different IDs
+    merged = merge_ngrams(shards)
+    assert dict(merged.most_common(None)) == dict(single.most_common(None))
+    assert merged.total == single.total == len(first) + len(second)
+    assert (dict(zip(merged.words, merged.word_counts))
+            == dict(zip(single.words, single.word_counts)))
+    print(f"Merged: {merged.most_common(3)}")
+    
+    # Packed keys: n IDs of ID_BITS each in one int, and back
+    trigrams = NGramCounter(3)
+    trigrams.update("a rose is a rose is a rose".split())
+    assert trigrams.most_common(2) == [("a rose is", 2), ("rose is a", 2)]
+    for key in trigrams.counts:
+        ids = trigrams.unpack(key)
+        assert len(ids) == 3 and trigrams.phrase(key) == " ".join(trigrams.words[i] for i in ids)
+    big_ids = (2**ID_BITS - 1, 0, 12345)
+    key = (big_ids[0] << 2 * ID_BITS) | (big_ids[1] << ID_BITS) | big_ids[2]
+    assert trigrams.unpack(key) == big_ids
+    
+    # PMI by hand: N = 6 words, new=3, york=2, city=1
+    #   "new york"  2x: log2(2 * 6 / (3 * 2)) = 1
+    #   "york city" 1x: log2(1 * 6 / (2 * 1)) = log2(3)
+    #   "city new"  1x: log2(1 * 6 / (1 * 3)) = 1
+    #   "york new"  1x: log2(1 * 6 / (2 * 3)) = 0
+    pmi = NGramCounter(2)
+    pmi.update("new york new york city new".split())
+    scores = {phrase: (score, count) for phrase, score, count in pmi.collocations(10, min_count=1)}
+    expected = {"new york": (1.0, 2), "york city": (math.log2(3), 1),
+                "city new": (1.0, 1), "york new": (0.0, 1)}
+    assert scores.keys() == expected.keys()
+    for phrase, (score, count) in expected.items():
+        assert math.isclose(scores[phrase][0], score, abs_tol=1e-12) and scores[phrase][1] == count
+    assert [phrase for phrase, *_ in pmi.collocations(10, min_count=1)][0] == "york city"
+    assert [phrase for phrase, *_ in pmi.collocations(10, min_count=2)] == ["new york"]
+    print(f"PMI: {pmi.collocations(2, min_count=1)}")
+    print("✅ NGramCounter tests passed!\n")
+
+
+def test_frequency_index():
+    """FrequencyIndex: delta updates, pruning, tokenizer changes, big stop lists."""
+    print("="*60)
+    print("Testing the incremental FrequencyIndex...")
+    
+    def write(path, text):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    
+    with tempfile.TemporaryDirectory() as folder:
+        db = os.path.join(folder, "words.db")
+        a, b = os.path.join(folder, "a.txt"), os.path.join(folder, "b.txt")
+        write(a, "apple banana apple cherry")
+        write(b, "banana banana date")
+        
+        with redirect_stdout(io.StringIO()):
+            with FrequencyIndex(db) as index:
+                update_index(index, [a, b])
+                assert index.top_words([a, b], 2) == [("banana", 3), ("apple", 2)]
+                
+                # A changed file: only it is recounted, and the totals follow the delta
+                write(a, "apple cherry cherry elderberry fig")
+                os.utime(a, ns=(os.stat(a).st_atime_ns, os.stat(a).st_mtime_ns + 10**9))
+                assert index.stale_files([a, b]) == [a]
+                update_index(index, [a, b])
+                expected = count_files([a, b], 1, PLAIN_TOKENIZER)
+                combined = expected[a] + expected[b]
+                assert dict(index.iter_counts([a, b])) == combined
+                assert dict(index.iter_counts([a])) == expected[a]
+                assert index.totals([a, b]) == (sum(combined.values()), len(combined))
+                
+                # A deleted file drops out of the totals
+                os.remove(b)
+                assert index.prune() == 1
+                assert dict(index.iter_counts([a])) == expected[a]
+                assert "date" not in dict(index.conn.execute("SELECT word, count FROM totals"))
+                
+                # More stop words than SQLite allows bound parameters
+                limit = 250000  # SQLITE_MAX_VARIABLE_NUMBER's highest default
+                if hasattr(index.conn, "getlimit"):  # Python 3.11+
+                    limit = index.conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+                many = {f"stop{i}" for i in range(limit)} | {"cherry"}
+                assert index.totals([a], many) == (3, 3)
+            
+            # Other tokenizing rules: the old counts can't be reused
+            with FrequencyIndex(db, Tokenizer('unicode')) as index:
+                assert index.stale_files([a]) == [a]
+                assert not index.conn.execute("SELECT COUNT(*) FROM totals").fetchone()[0]
+                write(a, "Don't panic, don't")
+                update_index(index, [a])
+                assert index.top_words([a], 1, stop_words=()) == [("don't", 2)]
+    print("✅ FrequencyIndex tests passed!\n")
+
+
+def read_new_text(follower):
+    """Everything a follow_chunks() generator has to give until it's idle."""
+    text = ""
+    for chunk in follower:
+        if not chunk:
+            return text
+        text += chunk
+
+
+def test_follow_chunks():
+    """follow_chunks: a file that appears late, rotation and truncation."""
+    print("="*60)
+    print("Testing follow mode (tail -F)...")
+    
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "app.log")
+        
+        # Not there yet: when it shows up, nothing already in it is skipped
+        follower = follow_chunks(path, poll_interval=0)
+        assert read_new_text(follower) == ""
+        with open(path, "w") as f:
+            f.write("first lines\n")
+        assert read_new_text(follower) == "first lines\n"
+        follower.close()
+        
+        # Already there: start at the end, then read what is appended
+        follower = follow_chunks(path, poll_interval=0, chunk_size=4)
+        assert read_new_text(follower) == ""
+        with open(path, "a") as f:
+            f.write("appended\n")
+        assert read_new_text(follower) == "appended\n"
+        
+        # Rotation: finish the old file, then read the new one from its start
+        os.rename(path, path + ".1")
+        with open(path + ".1", "a") as f:
+            f.write("last old line\n")
+        with open(path, "w") as f:
+            f.write("new file\n")
+        assert read_new_text(follower) == "last old line\nnew file\n"
+        
+        # Truncated in place: start again from the beginning
+        with open(path, "w") as f:
+            f.write("short\n")
+        assert read_new_text(follower) == "short\n"
+        follower.close()
+    print("✅ Follow mode tests passed!\n")
+
+
+def test_sliding_window_counter():
+    """SlidingWindowCounter forgets words by count and by age."""
+    print("="*60)
+    print("Testing SlidingWindowCounter expiry...")
+    
+    window = SlidingWindowCounter(max_tokens=3)
+    window.add(["a", "b"])
+    window.add(["c", "a"])
+    assert window.counts == Counter({"b": 1, "c": 1, "a": 1}) and window.size == 3
+    window.add(["d", "e", "f", "g"])
+    assert window.counts == Counter({"e": 1, "f": 1, "g": 1}) and window.size == 3
+    assert "a" not in window.counts  # expired words are deleted, not left at 0
+    
+    now = [0.0]
+    window = SlidingWindowCounter(max_age=10, clock=lambda: now[0])
+    window.add(["old", "shared"])
+    now[0] = 5
+    window.add(["new", "shared"])
+    assert window.most_common(1) == [("shared", 2)]
+    now[0] = 12  # the first batch is 12s old, the second 7s
+    window.expire()
+    assert window.counts == Counter({"new": 1, "shared": 1}) and window.size == 2
+    now[0] = 100
+    window.add([])
+    assert not window.counts and window.size == 0
+    
+    # Both limits: whichever window is smaller wins
+    window = SlidingWindowCounter(max_tokens=2, max_age=10, clock=lambda: now[0])
+    window.add(["x", "y", "z"])
+    assert window.counts == Counter({"y": 1, "z": 1})
+    print("✅ SlidingWindowCounter tests passed!\n")
+
+
+if __name__ == "__main__":
+    print("\n🧪 Running Word Frequency Tests...\n")
+    
+    test_regex_tokenizer_with_groups()
+    test_word_split_across_chunks()
+    test_utf8_split_across_chunks()
+    test_shards_match_single_process()
+    test_mmap_matches_streaming()
+    test_compressed_corpus()
+    test_approx_bounds_hold()
+    test_ngram_counter()
+    test_frequency_index()
+    test_follow_chunks()
+    test_sliding_window_counter()
+    
+    print("="*60)
+    print("🎉 All tests passed successfully!")
+    print("="*60)
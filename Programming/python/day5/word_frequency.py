@@ -10,17 +10,56 @@ Features:
 - Display top N most common words
 - Export results to JSON or CSV
 - Beautiful CLI with argparse
+- Streams files in chunks, so memory stays flat no matter the file size
+- --workers N counts byte ranges of the file on N cores (map/reduce)
+- Many files, directories and globs at once, with per-file and total top-N
+- Reads .gz / .bz2 / .xz files directly (decompressed as a stream)
+- Plain files are scanned as raw bytes through mmap (fast path for ASCII)
+- --approx: top-N in fixed memory (Space-Saving + Count-Min Sketch)
+- --ngram N: phrase counts and PMI collocations ("new york", "machine learning")
+- --index DB: counts saved in SQLite, re-runs only read new or changed files
+- --follow: tail a growing log (survives rotation), top-N over a sliding window
+- --all: export the whole vocabulary (streamed JSON / JSON Lines / CSV rows,
+  or a compact binary .vocab file that loads back into a Counter)
+- --profile: time, CPU, peak memory and tokens/sec for every stage
+- --tokenizer ascii|unicode or --token-pattern REGEX, --stop-words en,de,...
 
 YOUR MISSION: Implement the core functions!
 """
 
 import argparse
+import bz2
+import codecs
+import cProfile
+import glob
+import gzip
+import heapq
 import json
 import csv
+import lzma
+import math
+import mmap
+import os
 import re
-from collections import Counter
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial, reduce
+from itertools import chain, filterfalse, islice
 from pathlib import Path
 
+from sketches import TopKSketch
+
+try:
+    import resource  # peak memory (RSS) - Unix only
+except ImportError:
+    resource = None
+
 
 # Stop words to filter out (common words with little meaning)
 STOP_WORDS = {
@@ -32,6 +71,51 @@ STOP_WORDS = {
     'my', 'your', 'his', 'her', 'its', 'our', 'their'
 }
 
+# Streaming pipeline settings
+DEFAULT_CHUNK_SIZE = 1 << 20  # bytes read per chunk (1 MB)
+WORD_PATTERN = re.compile(r'\b[a-z]+\b')
+_is_word_char = re.compile(r'\w').match
+
+# mmap fast path: ASCII text is tokenized as bytes, without decoding it.
+# A window of the file may only end right after an ASCII non-word byte
+# (space, punctuation...) - bytes >= 0x80 may belong to a Unicode letter.
+ASCII_WORD_PATTERN = re.compile(rb'\b[A-Za-z]+\b')
+_NON_ASCII_BYTE = re.compile(rb'[\x80-\xff]')
+_CUT_BYTE = re.compile(rb'[\x00-\x2f\x3a-\x40\x5b-\x5e\x60\x7b-\x7f]')
+_CUT_BYTES = frozenset(bytes(range(128))) - frozenset(
+    b'0123456789_ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz')
+
+# Tokenizers (see Tokenizer). 'unicode' keeps digits and contractions.
+UNICODE_WORD_PATTERN = r"\w+(?:['’]\w+)*"
+UNICODE_BYTES_PATTERN = re.compile(rb"\w+(?:'\w+)*")  # same matches on ASCII text
+_SPACE_BYTES = frozenset(b' \t\n\r\x0b\x0c')
+STOP_WORDS_DIR = Path(__file__).with_name('stopwords')
+
+# --approx settings: the sketch only ever sees one window's Counter at a time
+DEFAULT_EPSILON = 1e-4
+DEFAULT_DELTA = 1e-3
+WINDOW_WORDS = 1 << 16  # words per Counter when streaming compressed files
+
+# --ngram settings: an n-gram is packed into one int, ID_BITS per word
+ID_BITS = 32
+DEFAULT_MIN_COUNT = 5
+
+# Binary vocabulary format (see save_vocabulary)
+VOCAB_MAGIC = b"WFVOCAB1"
+VOCAB_HEADER = struct.Struct("<8sQQQB7x")  # magic, words, total, blob bytes, count width
+_COUNT_TYPECODES = {1: 'B', 2: 'H', 4: 'I', 8: 'Q'}
+
+# Parallel counting settings
+MIN_SHARD_SIZE = 1 << 16  # don't bother splitting below 64 KB per worker
+_WHITESPACE_BYTE = re.compile(rb'\s')  # bytes \s = ASCII whitespace only
+
+# Compressed files are decompressed on the fly, picked by extension
+OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
 
 def read_file(filepath):
     """
@@ -113,6 +197,233 @@ def remove_stop_words(words, use_stop_words=True):
     return filtered
 
 
+# ============================================================================
+# Streaming pipeline: read_chunks -> iter_words -> drop_stop_words -> Counter
+# ============================================================================
+# Each stage is a generator, so only one chunk of text is in memory at a
+# time - the Counter is the only thing that grows (with the vocabulary).
+
+def is_compressed(filepath):
+    """True if the file is read through a decompressor (see OPENERS)."""
+    return Path(filepath).suffix.lower() in OPENERS
+
+
+def open_binary(filepath):
+    """Open a file for reading bytes, decompressing .gz/.bz2/.xz transparently."""
+    opener = OPENERS.get(Path(filepath).suffix.lower(), open)
+    return opener(filepath, 'rb')
+
+
+def read_chunks(filepath, chunk_size=DEFAULT_CHUNK_SIZE, start=0, end=None):
+    """
+    Yield a file's text, decoded from chunk_size bytes at a time.
+
+    start/end pick a byte range (end=None = to the end of the file). They must
+    sit on character boundaries - shard_ranges() makes sure of that. For a
+    compressed file they are offsets into the decompressed stream.
+
+    Raises FileNotFoundError like open() does - callers decide how to report it.
+    """
+    # An incremental decoder copes with a UTF-8 character cut in half
+    # between two reads (it keeps the first bytes until the rest arrive)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    with open_binary(filepath) as f:
+        if start:
+            f.seek(start)
+        remaining = float('inf') if end is None else end - start
+        while remaining > 0:
+            data = f.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            text = decoder.decode(data)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def iter_words(chunks, tokenizer=None):
+    """
+    Tokenize a stream of text chunks, same rules as tokenize() by default.
+    With a Tokenizer, its rules are used and its stop words are dropped.
+
+    A chunk can end in the middle of a word ("hel" | "lo"), so the trailing
+    run of word characters is held back and glued onto the next chunk.
+    Cutting only at a non-word character also keeps \\b boundaries intact.
+
+    Example:
+        list(iter_words(["Hello, Wor", "ld!"])) → ["hello", "world"]
+    """
+    return chain.from_iterable(iter_word_batches(chunks, tokenizer))
+
+
+def iter_word_batches(chunks, tokenizer=None):
+    """Like iter_words, but yields the words of one chunk at a time."""
+    tokenizer = tokenizer or PLAIN_TOKENIZER
+    words, cut_at = tokenizer.words, tokenizer.cut
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk
+        cut = cut_at(text)
+        carry = text[cut:]
+        yield words(text[:cut])
+    if carry:
+        yield words(carry)
+
+
+def word_boundary_cut(text):
+    """Index where the trailing run of word characters (maybe half a word) starts."""
+    cut = len(text)
+    while cut > 0 and _is_word_char(text[cut - 1]):
+        cut -= 1
+    return cut
+
+
+def whitespace_cut(text):
+    """Index just after the last whitespace character (0 if there is none)."""
+    cut = len(text)
+    while cut > 0 and not text[cut - 1].isspace():
+        cut -= 1
+    return cut
+
+
+def drop_stop_words(words, stop_words=STOP_WORDS):
+    """Lazy version of remove_stop_words() for streams of words."""
+    return (word for word in words if word not in stop_words)
+
+
+# ============================================================================
+# Tokenizers: how text becomes words
+# ============================================================================
+
+class Tokenizer:
+    """
+    A word pattern, case folding and stop words, used by the whole pipeline.
+
+    kind:
+      'ascii'   - tokenize() rules: [a-z]+ after lower(). Non-ASCII letters
+                  and digits split words ("café" → nothing, "mp3" → nothing).
+      'unicode' - any letters or digits (\\w), contractions kept whole
+                  ("don't", "l'été"), casefold() so "Straße" == "strasse".
+      'regex'   - your own pattern. A token is the whole match, even if the
+                  pattern has (capture) groups. Don't let a token contain
+                  whitespace: chunks are cut at whitespace.
+
+    Stop words are dropped while tokenizing (words() never builds a list of
+    the dropped ones), or from a finished Counter with filter_counts().
+    'ascii' and 'unicode' also have a bytes regex for the mmap fast path.
+
+    Example:
+        Tokenizer('unicode', stop_words={'the'}).findall("The CAFÉ's menu")
+        → ["the", "café's", "menu"]
+    """
+
+    KINDS = ('ascii', 'unicode', 'regex')
+
+    def __init__(self, kind='ascii', pattern=None, stop_words=STOP_WORDS, casefold=True):
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown tokenizer {kind!r} (choose from {', '.join(self.KINDS)})")
+        if kind == 'ascii':
+            pattern, casefold = WORD_PATTERN.pattern, True
+        elif kind == 'unicode':
+            pattern = UNICODE_WORD_PATTERN
+        elif not pattern:
+            raise ValueError("the 'regex' tokenizer needs a pattern")
+        self.kind = kind
+        self.pattern = pattern
+        self.casefold = casefold
+        self.regex = re.compile(pattern)
+        self.stop_words = frozenset(self.fold(word) for word in stop_words)
+
+        # mmap fast path: a bytes regex that finds the same tokens in pure
+        # ASCII text, and the bytes a window may safely be cut after
+        if kind == 'ascii':
+            self.bytes_regex, self.cut_bytes, self.cut_byte_regex = (
+                ASCII_WORD_PATTERN, _CUT_BYTES, _CUT_BYTE)
+        elif kind == 'unicode':
+            self.bytes_regex, self.cut_bytes, self.cut_byte_regex = (
+                UNICODE_BYTES_PATTERN, _SPACE_BYTES, _WHITESPACE_BYTE)
+        else:
+            self.bytes_regex = self.cut_bytes = self.cut_byte_regex = None
+
+    @property
+    def signature(self):
+        """Identifies the tokenizing rules (stop words excluded)."""
+        return f"{self.kind}:{self.casefold}:{self.pattern}"
+
+    def fold(self, text):
+        """Apply the case rules."""
+        if self.kind == 'ascii':
+            return text.lower()
+        return text.casefold() if self.casefold else text
+
+    def findall(self, text):
+        """All tokens in text, stop words included."""
+        text = self.fold(text)
+        if self.regex.groups:
+            # With capture groups findall() returns the groups, not the words
+            return [match.group() for match in self.regex.finditer(text)]
+        return self.regex.findall(text)
+
+    def words(self, text):
+        """Tokens without stop words (an iterator when filtering)."""
+        tokens = self.findall(text)
+        if self.stop_words:
+            return filterfalse(self.stop_words.__contains__, tokens)
+        return tokens
+
+    def cut(self, text):
+        """Where a chunk can safely end (see word_boundary_cut)."""
+        return word_boundary_cut(text) if self.kind == 'ascii' else whitespace_cut(text)
+
+    def filter_counts(self, counter):
+        """Remove stop words from a Counter - once per word, not per occurrence."""
+        for word in self.stop_words & counter.keys():
+            del counter[word]
+        return counter
+
+    def without_stop_words(self):
+        """Same rules, nothing filtered (--no-filter)."""
+        return Tokenizer(self.kind, self.pattern, (), self.casefold)
+
+    def __repr__(self):
+        return (f"Tokenizer({self.kind!r}, pattern={self.pattern!r}, "
+                f"casefold={self.casefold}, {len(self.stop_words)} stop words)")
+
+
+DEFAULT_TOKENIZER = Tokenizer()                 # ascii + English stop words
+PLAIN_TOKENIZER = Tokenizer(stop_words=())      # exactly tokenize()
+
+
+def load_stop_words(sources):
+    """
+    Build a stop-word set from several lists.
+
+    Each source is 'en' (the built-in STOP_WORDS), a language code with a
+    file in stopwords/ ('de' → stopwords/de.txt), or a path to a file with
+    one word per line ('#' starts a comment).
+
+    Example:
+        load_stop_words(['en', 'de', 'my_words.txt'])
+    """
+    words = set()
+    for source in sources:
+        if source == 'en':
+            words |= STOP_WORDS
+            continue
+        path = STOP_WORDS_DIR / f"{source}.txt"
+        if not path.is_file():
+            path = Path(source)
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                word = line.split('#', 1)[0].strip()
+                if word:
+                    words.add(word)
+    return words
+
+
 def count_frequencies(words):
     """
     TODO #4: Count word frequencies
@@ -122,7 +433,8 @@ def count_frequencies(words):
     2. Return the Counter object
     
     Args:
-        words (list): List of words
+        words (iterable): List (or generator) of words - Counter consumes
+            a generator one word at a time, nothing is materialized
         
     Returns:
         Counter: Word frequency counter
@@ -157,18 +469,962 @@ def get_top_words(counter, n=10):
     return counter.most_common(n)
 
 
-def display_results(top_words, total_words, unique_words):
+# ============================================================================
+# mmap fast path: count raw bytes tokens, decode once per distinct word
+# ============================================================================
+# tokenize() lowercases a copy of the whole text and then creates one str
+# per word. For ASCII text the same words can be found directly in the
+# mapped file with a bytes regex: no decode, no lower() copy, and case is
+# folded once per distinct token instead of once per occurrence.
+
+def count_range_mmap(filepath, start=0, end=None, tokenizer=DEFAULT_TOKENIZER,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Count the words of a plain file's byte range by scanning it in place.
+
+    Gives exactly the same Counter as the streaming pipeline: a window that
+    contains any non-ASCII byte is decoded and goes through the tokenizer's
+    str regex. Needs a tokenizer with a bytes_regex ('ascii' or 'unicode').
+
+    Returns:
+        Counter: {word (str): count}
+    """
+    raw = Counter()        # bytes tokens as they appear ("The", "the", ...)
+    decoded = Counter()    # words from windows that needed decoding
+    for mm, pos, cut in _mmap_windows(filepath, start, end, chunk_size, tokenizer):
+        _scan_window(mm, pos, cut, raw, decoded, tokenizer)
+    return _fold_tokens(raw, decoded, tokenizer)
+
+
+def _mmap_windows(filepath, start, end, chunk_size, tokenizer=DEFAULT_TOKENIZER):
+    """Yield (mm, pos, cut) for windows of about chunk_size bytes."""
+    cut_bytes, cut_byte_regex = tokenizer.cut_bytes, tokenizer.cut_byte_regex
+    with open(filepath, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        end = size if end is None else min(end, size)
+        if start >= end:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                cut = min(pos + chunk_size, end)
+                if cut < end:
+                    # Back up to a safe cut, or run ahead if the window is one long token
+                    while cut > pos and mm[cut - 1] not in cut_bytes:
+                        cut -= 1
+                    if cut == pos:
+                        match = cut_byte_regex.search(mm, pos + chunk_size, end)
+                        cut = match.end() if match else end
+                yield mm, pos, cut
+                pos = cut
+
+
+def _scan_window(mm, pos, cut, raw, decoded, tokenizer=DEFAULT_TOKENIZER):
+    """Count one window: bytes tokens into raw, or decoded words if non-ASCII."""
+    tokens = _window_tokens(mm, pos, cut, tokenizer)
+    (decoded if tokens and isinstance(tokens[0], str) else raw).update(tokens)
+
+
+def _window_tokens(mm, pos, cut, tokenizer=DEFAULT_TOKENIZER):
+    """One window's tokens: bytes if it's pure ASCII, else decoded words."""
+    if _NON_ASCII_BYTE.search(mm, pos, cut):
+        return tokenizer.findall(mm[pos:cut].decode('utf-8'))
+    return tokenizer.bytes_regex.findall(mm, pos, cut)
+
+
+def _fold_tokens(raw, decoded, tokenizer=DEFAULT_TOKENIZER):
+    """Fold case and filter stop words once per distinct token."""
+    fold = tokenizer.fold
+    for token, count in raw.items():
+        decoded[fold(token.decode('ascii'))] += count
+    return tokenizer.filter_counts(decoded)
+
+
+def uses_mmap(filepath, tokenizer):
+    """True if the file can go through the mmap fast path."""
+    return tokenizer.bytes_regex is not None and not is_compressed(filepath)
+
+
+def iter_window_counts(filepath, start=0, end=None, tokenizer=DEFAULT_TOKENIZER,
+                       chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield one small Counter per window of the range instead of one big one.
+
+    For consumers that must not hold the whole vocabulary (--approx):
+    each Counter only has the words of about chunk_size bytes of text.
+    """
+    if uses_mmap(filepath, tokenizer):
+        for mm, pos, cut in _mmap_windows(filepath, start, end, chunk_size, tokenizer):
+            raw, decoded = Counter(), Counter()
+            _scan_window(mm, pos, cut, raw, decoded, tokenizer)
+            yield _fold_tokens(raw, decoded, tokenizer)
+        return
+
+    words = iter_words(read_chunks(filepath, chunk_size, start, end), tokenizer)
+    while True:
+        window = Counter(islice(words, WINDOW_WORDS))
+        if not window:
+            return
+        yield window
+
+
+# ============================================================================
+# Parallel counting: split -> count shards on N processes -> tree-merge
+# ============================================================================
+
+def shard_ranges(filepath, n_shards):
+    """
+    Split a file into up to n_shards byte ranges of about equal size.
+
+    Each cut is moved forward to just past a whitespace byte, so no word is
+    split between two shards. An ASCII whitespace byte can never be part of
+    a multi-byte UTF-8 character, so every shard also decodes on its own.
+
+    Returns:
+        list: [(start, end), ...] covering the whole file
+    """
+    size = os.path.getsize(filepath)
+    n_shards = max(1, min(n_shards, size // MIN_SHARD_SIZE))
+    bounds = [0]
+    with open(filepath, 'rb') as f:
+        for i in range(1, n_shards):
+            pos = max(size * i // n_shards, bounds[-1])
+            f.seek(pos)
+            while True:
+                block = f.read(4096)
+                if not block:
+                    pos = size
+                    break
+                match = _WHITESPACE_BYTE.search(block)
+                if match:
+                    pos += match.end()
+                    break
+                pos += len(block)
+            bounds.append(pos)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+
+def count_range(filepath, start, end, tokenizer=DEFAULT_TOKENIZER, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Map step: count one byte range (mmap fast path when possible)."""
+    if uses_mmap(filepath, tokenizer):
+        return count_range_mmap(filepath, start, end, tokenizer, chunk_size)
+    return count_frequencies(iter_words(read_chunks(filepath, chunk_size, start, end), tokenizer))
+
+
+def merge_counters(counters):
+    """
+    Reduce step: merge Counters pairwise, round by round (a tree).
+
+    In each pair the smaller Counter is added into the bigger one, so the
+    work is proportional to the smaller vocabulary.
+
+    Example:
+        merge_counters([Counter(a=1), Counter(a=2, b=1), Counter(b=5)])
+        → Counter({'b': 6, 'a': 3})
+    """
+    counters = list(counters)
+    if not counters:
+        return Counter()
+    while len(counters) > 1:
+        merged = []
+        for left, right in zip(counters[0::2], counters[1::2]):
+            if len(left) < len(right):
+                left, right = right, left
+            left.update(right)
+            merged.append(left)
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0]
+
+
+def sketch_range(filepath, start, end, tokenizer=DEFAULT_TOKENIZER, chunk_size=DEFAULT_CHUNK_SIZE,
+                 approx=None):
+    """Map step for --approx: feed one byte range into a TopKSketch(**approx)."""
+    sketch = TopKSketch(**(approx or {}))
+    for window in iter_window_counts(filepath, start, end, tokenizer, chunk_size):
+        sketch.update(window)
+    return sketch
+
+
+def merge_sketches(sketches):
+    """Reduce step for --approx: merge TopKSketches into the first one."""
+    return reduce(lambda merged, sketch: merged.merge(sketch), sketches)
+
+
+def count_files(paths, workers=1, tokenizer=DEFAULT_TOKENIZER, chunk_size=DEFAULT_CHUNK_SIZE,
+                approx=None, ngram=1):
+    """
+    Count the words of every file, on several processes if workers > 1.
+
+    Plain files are split into byte ranges (shard_ranges); compressed files
+    can't be entered in the middle, so each one is a single shard. All the
+    shards of all the files share one pool, so many small files keep every
+    worker busy just like one big file does.
+
+    With approx={'capacity': ..., 'epsilon': ..., 'delta': ...} every
+    shard builds a TopKSketch instead of a Counter (see sketches.py).
+    With ngram > 1 every file builds an NGramCounter; files are not split,
+    so no n-gram is lost at a shard boundary.
+
+    Returns:
+        dict: {path: Counter, TopKSketch or NGramCounter} in the order of paths
+    """
+    if ngram > 1:
+        map_range, merge = partial(count_ngrams_range, n=ngram), merge_ngrams
+    elif approx is None:
+        map_range, merge = count_range, merge_counters
+    else:
+        map_range, merge = partial(sketch_range, approx=approx), merge_sketches
+
+    if workers <= 1:
+        return {path: map_range(path, 0, None, tokenizer, chunk_size) for path in paths}
+
+    shards = []
+    for path in paths:
+        whole_file = ngram > 1 or is_compressed(path)
+        ranges = [(0, None)] if whole_file else shard_ranges(path, workers)
+        shards.extend((path, start, end) for start, end in ranges)
+
+    results = {path: [] for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (path, pool.submit(map_range, path, start, end, tokenizer, chunk_size))
+            for path, start, end in shards
+        ]
+        for path, future in futures:
+            results[path].append(future.result())
+    return {
+        path: merge(parts) if parts else map_range(path, 0, 0, tokenizer, chunk_size)
+        for path, parts in results.items()
+    }
+
+
+# ============================================================================
+# N-grams and collocations
+# ============================================================================
+# Counting tuples of strings costs a tuple (~56 bytes + pointers) per
+# distinct n-gram. Instead every word gets a small integer ID (interning),
+# and an n-gram is its n IDs packed into a single int. The packed int is
+# also the rolling window: shift in the next ID, mask off the oldest one.
+
+class NGramCounter:
+    """
+    Counts n-grams of consecutive words (after stop-word filtering, if on).
+
+    Example:
+        ngrams = NGramCounter(n=2)
+        ngrams.update(["new", "york", "new", "york"])
+        ngrams.most_common(1) → [("new york", 2)]
+    """
+
+    def __init__(self, n=2):
+        if n < 2:
+            raise ValueError("n-grams need n >= 2")
+        self.n = n
+        self.total = 0           # words seen
+        self.words = []          # ID -> word
+        self.word_counts = []    # ID -> how often the word was seen
+        self.counts = Counter()  # packed n-gram -> count
+        self._ids = {}           # word -> ID
+
+    def __len__(self):
+        return len(self.counts)
+
+    def intern(self, word):
+        """The word's ID, assigning the next free one to new words."""
+        token_id = self._ids.get(word)
+        if token_id is None:
+            token_id = self._ids[word] = len(self.words)
+            self.words.append(word)
+            self.word_counts.append(0)
+        return token_id
+
+    def update(self, words):
+        """Count the n-grams of one stream of words (one file or text)."""
+        ids, intern, word_counts, counts = self._ids, self.intern, self.word_counts, self.counts
+        mask = (1 << ID_BITS * self.n) - 1
+        n_minus_1 = self.n - 1
+        window = 0
+        seen = 0
+        for word in words:
+            token_id = ids.get(word)
+            if token_id is None:
+                token_id = intern(word)
+            word_counts[token_id] += 1
+            window = ((window << ID_BITS) | token_id) & mask
+            if seen >= n_minus_1:
+                counts[window] += 1
+            seen += 1
+        self.total += seen
+
+    def unpack(self, key):
+        """Packed n-gram -> tuple of word IDs."""
+        id_mask = (1 << ID_BITS) - 1
+        return tuple((key >> ID_BITS * shift) & id_mask for shift in range(self.n - 1, -1, -1))
+
+    def phrase(self, key):
+        """Packed n-gram -> "word word ..." string."""
+        return " ".join(self.words[token_id] for token_id in self.unpack(key))
+
+    def most_common(self, n=10):
+        """[(phrase, count), ...] - same shape as Counter.most_common()."""
+        return [(self.phrase(key), count) for key, count in self.counts.most_common(n)]
+
+    def merge(self, other):
+        """Add another counter's n-grams (its IDs are translated into ours)."""
+        if other.n != self.n:
+            raise ValueError("can only merge n-gram counters with the same n")
+        id_map = [self.intern(word) for word in other.words]
+        for other_id, count in enumerate(other.word_counts):
+            self.word_counts[id_map[other_id]] += count
+        counts = self.counts
+        for key, count in other.counts.items():
+            window = 0
+            for token_id in other.unpack(key):
+                window = (window << ID_BITS) | id_map[token_id]
+            counts[window] += count
+        self.total += other.total
+        return self
+
+    def collocations(self, k=10, min_count=DEFAULT_MIN_COUNT):
+        """
+        The k n-grams whose words appear together most "on purpose".
+
+        PMI (pointwise mutual information) compares how often the words
+        occur together with how often they would by pure chance:
+
+            PMI = log2( P(w1..wn) / (P(w1) * ... * P(wn)) )
+                = log2( count(w1..wn) * N^(n-1) / (count(w1) * ... * count(wn)) )
+
+        Rare n-grams get huge PMI from a single lucky occurrence, so only
+        n-grams seen at least min_count times are ranked.
+
+        Returns:
+            list: [(phrase, pmi, count), ...] highest PMI first
+        """
+        log2 = math.log2
+        word_logs = [log2(count) if count else 0.0 for count in self.word_counts]
+        base = (self.n - 1) * log2(self.total) if self.total else 0.0
+        scored = (
+            (log2(count) + base - sum(word_logs[token_id] for token_id in self.unpack(key)), count, key)
+            for key, count in self.counts.items()
+            if count >= min_count
+        )
+        return [(self.phrase(key), pmi, count) for pmi, count, key in heapq.nlargest(k, scored)]
+
+
+def count_ngrams_range(filepath, start, end, tokenizer=DEFAULT_TOKENIZER,
+                       chunk_size=DEFAULT_CHUNK_SIZE, n=2):
+    """Map step for --ngram: count one file's n-grams."""
+    words = iter_words(read_chunks(filepath, chunk_size, start, end), tokenizer)
+    ngrams = NGramCounter(n)
+    ngrams.update(words)
+    return ngrams
+
+
+def merge_ngrams(counters):
+    """Reduce step for --ngram: merge NGramCounters into the first one."""
+    return reduce(lambda merged, ngrams: merged.merge(ngrams), counters)
+
+
+# ============================================================================
+# Persistent index: skip files that haven't changed since the last run
+# ============================================================================
+
+class FrequencyIndex:
+    """
+    Word counts per file, kept in a SQLite database between runs.
+
+    A file is identified by its absolute path + modification time + size;
+    if all three still match, its stored counts are reused as they are.
+    A changed file's old counts are subtracted from the running totals and
+    its new ones added (a delta), so the totals never need a full rebuild.
+
+    Counts are stored WITHOUT stop-word filtering - filtering happens when
+    reading - so one index serves both the normal and --no-filter runs,
+    and any --stop-words list. The tokenizer rules are recorded in the
+    meta table; opening the index with different ones starts it over.
+
+    Usage:
+        with FrequencyIndex("words.db") as index:
+            for path in index.stale_files(paths):
+                index.store(path, count_range(path, 0, None, PLAIN_TOKENIZER), os.stat(path))
+            index.top_words(paths, n=10)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS file_words (
+            path TEXT NOT NULL,
+            word TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (path, word)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS totals (
+            word TEXT PRIMARY KEY,
+            count INTEGER NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS totals_by_count ON totals (count);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path, tokenizer=DEFAULT_TOKENIZER):
+        self.db_path = db_path
+        self.tokenizer = tokenizer
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(self.SCHEMA)
+        self._check_tokenizer()
+
+    def _check_tokenizer(self):
+        """Counts made with other tokenizing rules can't be reused: clear them."""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'tokenizer'").fetchone()
+        signature = self.tokenizer.signature
+        if row and row[0] == signature:
+            return
+        with self.conn:
+            if row:
+                print(f"⚠️  Index {self.db_path} was built with another tokenizer, recounting")
+                for table in ("files", "file_words", "totals"):
+                    self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('tokenizer', ?)",
+                              (signature,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def _key(path):
+        return os.path.abspath(path)
+
+    def _indexed_paths(self):
+        return {path for (path,) in self.conn.execute("SELECT path FROM files")}
+
+    def stale_files(self, paths):
+        """The paths that are new, or changed since they were stored."""
+        stale = []
+        for path in paths:
+            st = os.stat(path)
+            row = self.conn.execute(
+                "SELECT mtime_ns, size FROM files WHERE path = ?", (self._key(path),)
+            ).fetchone()
+            if row != (st.st_mtime_ns, st.st_size):
+                stale.append(path)
+        return stale
+
+    def store(self, path, counter, stat):
+        """
+        Replace a file's counts and apply the difference to the totals.
+
+        stat must be taken BEFORE counting: if the file changes while it is
+        being read, the next run sees a different mtime and counts it again.
+        """
+        key = self._key(path)
+        old = dict(self.conn.execute("SELECT word, count FROM file_words WHERE path = ?", (key,)))
+        delta = Counter(counter)
+        delta.subtract(old)
+        changes = [(word, change) for word, change in delta.items() if change]
+
+        with self.conn:  # one transaction: a crash never leaves half a file
+            self.conn.execute("DELETE FROM file_words WHERE path = ?", (key,))
+            self.conn.executemany(
+                "INSERT INTO file_words (path, word, count) VALUES (?, ?, ?)",
+                ((key, word, count) for word, count in counter.items()),
+            )
+            self.conn.executemany(
+                "INSERT INTO totals (word, count) VALUES (?, ?) "
+                "ON CONFLICT (word) DO UPDATE SET count = count + excluded.count",
+                changes,
+            )
+            self.conn.execute("DELETE FROM totals WHERE count = 0")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                (key, stat.st_mtime_ns, stat.st_size),
+            )
+
+    def remove(self, path):
+        """Forget a file and take its counts out of the totals."""
+        key = self._key(path)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE totals SET count = count - "
+                "(SELECT count FROM file_words WHERE path = ? AND word = totals.word) "
+                "WHERE word IN (SELECT word FROM file_words WHERE path = ?)",
+                (key, key),
+            )
+            self.conn.execute("DELETE FROM totals WHERE count = 0")
+            self.conn.execute("DELETE FROM file_words WHERE path = ?", (key,))
+            self.conn.execute("DELETE FROM files WHERE path = ?", (key,))
+
+    def prune(self):
+        """Remove files that no longer exist on disk. Returns how many."""
+        missing = [path for path in self._indexed_paths() if not os.path.exists(path)]
+        for path in missing:
+            self.remove(path)
+        return len(missing)
+
+    def _source(self, paths):
+        """SQL table expression with (word, count) summed over the given files."""
+        keys = {self._key(path) for path in paths}
+        if keys == self._indexed_paths():
+            return "totals"  # the whole index: use the running totals
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected (path TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.selected")
+        self.conn.executemany("INSERT INTO temp.selected VALUES (?)", ((key,) for key in keys))
+        return ("(SELECT word, SUM(count) AS count FROM file_words "
+                "JOIN temp.selected USING (path) GROUP BY word)")
+
+    def _excluded(self, stop_words):
+        return self.tokenizer.stop_words if stop_words is None else stop_words
+
+    def top_words(self, paths, n=10, stop_words=None):
+        """
+        [(word, count), ...] over the given files, like get_top_words().
+
+        stop_words defaults to the tokenizer's; pass () for no filtering.
+        """
+        excluded = self._excluded(stop_words)
+        rows = self.conn.execute(f"SELECT word, count FROM {self._source(paths)} ORDER BY count DESC")
+        top = []
+        for word, count in rows:
+            if len(top) == n:
+                break
+            if word not in excluded:
+                top.append((word, count))
+        return top
+
+    def iter_counts(self, paths, stop_words=None):
+        """Every (word, count) over the given files, highest first, streamed from SQLite."""
+        excluded = self._excluded(stop_words)
+        rows = self.conn.execute(f"SELECT word, count FROM {self._source(paths)} ORDER BY count DESC")
+        return ((word, count) for word, count in rows if word not in excluded)
+
+    def totals(self, paths, stop_words=None):
+        """(total words, unique words) over the given files."""
+        # The stop words go in a temp table like _source's paths: one bound
+        # parameter each could pass SQLite's limit on a big stop-word file
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS excluded (word TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM temp.excluded")
+        self.conn.executemany("INSERT OR IGNORE INTO temp.excluded VALUES (?)",
+                              ((word,) for word in self._excluded(stop_words)))
+        return self.conn.execute(
+            f"SELECT COALESCE(SUM(count), 0), COUNT(*) FROM {self._source(paths)} AS source "
+            "WHERE NOT EXISTS (SELECT 1 FROM temp.excluded WHERE excluded.word = source.word)"
+        ).fetchone()
+
+
+def update_index(index, paths, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Count only the new or changed files and store them in the index."""
+    stale = index.stale_files(paths)
+    pruned = index.prune()
+    print(f"🗂️  Index {index.db_path}: {len(paths) - len(stale)} unchanged, "
+          f"{len(stale)} new or changed" + (f", {pruned} deleted" if pruned else ""))
+    if not stale:
+        return
+    stats = {path: os.stat(path) for path in stale}
+    print("🔢 Counting word frequencies...")
+    for path, counter in count_files(stale, workers, index.tokenizer.without_stop_words(),
+                                     chunk_size).items():
+        index.store(path, counter, stats[path])
+
+
+# ============================================================================
+# Follow mode: tail a growing file, count over a sliding window
+# ============================================================================
+
+class SlidingWindowCounter:
+    """
+    Word counts over only the most recent words.
+
+    The window is the last max_tokens words, the words of the last max_age
+    seconds, or both (whichever is smaller). Words arrive in batches that
+    are queued oldest first; expiring pops from the front of the queue and
+    decrements their counts. Every word is added once and removed once, so
+    expiry costs O(1) per word (amortized).
+
+    Example:
+        window = SlidingWindowCounter(max_tokens=3)
+        window.add(["a", "b"]); window.add(["c", "a"])
+        window.counts → Counter({'c': 1, 'a': 1, 'b': 1})   # first "a" expired
+    """
+
+    def __init__(self, max_tokens=None, max_age=None, clock=time.monotonic):
+        self.max_tokens = max_tokens
+        self.max_age = max_age
+        self.clock = clock
+        self.counts = Counter()
+        self.size = 0                # words in the window
+        self._batches = deque()      # [arrival time, words, index of oldest kept word]
+
+    def add(self, words):
+        """Add one batch of words (all arriving now), then expire old ones."""
+        words = list(words)
+        if words:
+            self._batches.append([self.clock(), words, 0])
+            self.counts.update(words)
+            self.size += len(words)
+        self.expire()
+
+    def expire(self):
+        """Drop words that fell out of the window."""
+        batches = self._batches
+        if self.max_age is not None:
+            cutoff = self.clock() - self.max_age
+            while batches and batches[0][0] < cutoff:
+                _, words, start = batches.popleft()
+                self._forget(words, start, len(words))
+        if self.max_tokens is not None:
+            excess = self.size - self.max_tokens
+            while excess > 0:
+                batch = batches[0]
+                _, words, start = batch
+                stop = min(len(words), start + excess)
+                self._forget(words, start, stop)
+                excess -= stop - start
+                if stop == len(words):
+                    batches.popleft()
+                else:
+                    batch[2] = stop
+
+    def _forget(self, words, start, stop):
+        counts = self.counts
+        for i in range(start, stop):
+            word = words[i]
+            remaining = counts[word] - 1
+            if remaining:
+                counts[word] = remaining
+            else:
+                del counts[word]  # keep memory bounded by the window, not history
+        self.size -= stop - start
+
+    def most_common(self, n=10):
+        return self.counts.most_common(n)
+
+
+def follow_chunks(filepath, poll_interval=0.5, chunk_size=DEFAULT_CHUNK_SIZE, from_start=False):
+    """
+    Yield text appended to a file, forever (like `tail -F`).
+
+    Yields '' whenever there is nothing new, so the caller gets a chance to
+    refresh its display. Handles log rotation:
+      - the path now points to a different file (new inode): finish reading
+        the old file, then continue with the new one from its start
+      - the file got shorter (truncated in place): start again from 0
+      - the file is missing: wait for it to come back
+    """
+    f = None
+    decoder = None
+    seek_to_end = not from_start
+    try:
+        while True:
+            if f is None:
+                try:
+                    f = open(filepath, 'rb')
+                except FileNotFoundError:
+                    seek_to_end = False  # whatever is in it when it appears is new
+                    yield ''
+                    time.sleep(poll_interval)
+                    continue
+                if seek_to_end:
+                    f.seek(0, os.SEEK_END)
+                    seek_to_end = False  # files opened after a rotation are read whole
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+            data = f.read(chunk_size)
+            if data:
+                yield decoder.decode(data)
+                continue
+
+            # At the end of the file: was it rotated or truncated?
+            try:
+                on_disk = os.stat(filepath)
+            except FileNotFoundError:
+                on_disk = None
+            opened = os.fstat(f.fileno())
+            if on_disk is not None and (on_disk.st_ino, on_disk.st_dev) != (opened.st_ino, opened.st_dev):
+                f.close()
+                f = None
+                continue
+            if on_disk is not None and on_disk.st_size < f.tell():
+                f.seek(0)
+                decoder.reset()
+                continue
+            yield ''
+            time.sleep(poll_interval)
+    finally:
+        if f is not None:
+            f.close()
+
+
+def follow_file(filepath, top_n=10, tokenizer=DEFAULT_TOKENIZER, max_tokens=None, max_age=None,
+                refresh=2.0, from_start=False):
+    """
+    Count the words of a growing file live, redrawing the top N every `refresh` seconds.
+
+    Runs until Ctrl+C and returns the final top words.
+    """
+    window = SlidingWindowCounter(max_tokens, max_age)
+    cut_at, words_in = tokenizer.cut, tokenizer.words
+    carry = ""
+    next_refresh = time.monotonic() + refresh
+    clear = "\033[2J\033[H" if sys.stdout.isatty() else ""
+
+    print(f"\n👀 Following {filepath} (Ctrl+C to stop)...")
+    try:
+        for chunk in follow_chunks(filepath, from_start=from_start):
+            if chunk:
+                # Hold back a half-written word until the rest of it arrives
+                text = carry + chunk
+                cut = cut_at(text)
+                carry = text[cut:]
+                window.add(list(words_in(text[:cut])))
+
+            now = time.monotonic()
+            if now >= next_refresh:
+                window.expire()
+                print(clear, end="")
+                print(f"🕒 {time.strftime('%H:%M:%S')}  window: {window.size} words")
+                display_results(window.most_common(top_n), window.size, len(window.counts))
+                next_refresh = now + refresh
+    except KeyboardInterrupt:
+        print("\n👋 Stopped following")
+    return window.most_common(top_n)
+
+
+# ============================================================================
+# Profiling: where does the time go? (--profile)
+# ============================================================================
+# The pipeline stages are generators feeding each other, so they all run
+# "at the same time". StageProfiler keeps a stack of the stages that are
+# running: whenever one is entered or left, the time since the last switch
+# is charged to the stage on top of the stack. Every stage therefore gets
+# its own (exclusive) time, even when its generator is pulling from another.
+
+def peak_rss():
+    """Peak resident memory so far in bytes (this process or its workers), or None."""
+    if resource is None:
+        return None
+    scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is KB on Linux
+    return scale * max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                       resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def _cpu_times():
+    """(this process, finished worker processes) CPU seconds."""
+    times = os.times()
+    return time.process_time(), times.children_user + times.children_system
+
+
+class StageProfiler:
+    """Wall time, CPU time, item counts and peak RSS per pipeline stage."""
+
+    STAGES = ("read", "tokenize", "filter", "count", "top-N", "export")
+    UNITS = {"read": "bytes", "top-N": "words", "export": "rows"}
+
+    def __init__(self):
+        self.stages = {}
+        self.tokens = 0           # words counted, for the overall tokens/sec
+        self._stack = []
+        self._start = (time.perf_counter(), *_cpu_times())
+        self._mark = self._start
+
+    def _stats(self, name):
+        return self.stages.setdefault(name, {'wall_s': 0.0, 'cpu_s': 0.0, 'items': 0})
+
+    def _charge(self):
+        now = (time.perf_counter(), *_cpu_times())
+        if self._stack:
+            stats = self.stages[self._stack[-1]]
+            stats['wall_s'] += now[0] - self._mark[0]
+            stats['cpu_s'] += (now[1] - self._mark[1]) + (now[2] - self._mark[2])
+        self._mark = now
+
+    @contextmanager
+    def stage(self, name, items=0):
+        """Time a block of code as (part of) a stage."""
+        stats = self._stats(name)
+        self._charge()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+            stats['items'] += items
+            stats['peak_rss'] = peak_rss()
+
+    def count(self, name, items):
+        """Add to a stage's item count (bytes read, tokens produced...)."""
+        self._stats(name)['items'] += items
+
+    def counted(self, name, iterable):
+        """Re-yield an iterable, adding 1 to the stage's items per element."""
+        stats = self.stages[name]
+        for item in iterable:
+            stats['items'] += 1
+            yield item
+
+    def wrap(self, name, iterable, size=len):
+        """Re-yield an iterable, timing every next() as the given stage."""
+        iterator = iter(iterable)
+        done = object()
+        while True:
+            with self.stage(name):
+                item = next(iterator, done)
+            if item is done:
+                return
+            self.count(name, size(item))
+            yield item
+
+    def summary(self):
+        """Everything as a plain dict (for --profile-json and regression tracking)."""
+        wall = time.perf_counter() - self._start[0]
+        cpu_self, cpu_children = _cpu_times()
+        order = {name: i for i, name in enumerate(self.STAGES)}
+        stages = {}
+        for name in sorted(self.stages, key=lambda n: order.get(n, len(order))):
+            stats = dict(self.stages[name], unit=self.UNITS.get(name, "tokens"))
+            if name == "count" and not stats['items']:
+                stats['items'] = self.tokens  # counted in one piece (workers, index...)
+            stats['items_per_s'] = stats['items'] / stats['wall_s'] if stats['wall_s'] else 0.0
+            stages[name] = stats
+        return {
+            'stages': stages,
+            'total': {
+                'wall_s': wall,
+                'cpu_s': (cpu_self - self._start[1]) + (cpu_children - self._start[2]),
+                'peak_rss': peak_rss(),
+                'tokens': self.tokens,
+                'tokens_per_s': self.tokens / wall if wall else 0.0,
+            },
+        }
+
+    def report(self):
+        """Print the stage table."""
+        summary = self.summary()
+        mb = lambda n: f"{n / 2**20:8.1f}" if n is not None else f"{'n/a':>8}"
+        print("⏱️  PROFILE")
+        print("-"*78)
+        print(f"{'stage':<9} {'wall s':>8} {'cpu s':>8} {'peak MB':>8} {'items':>13} {'per second':>20}")
+        for name, stats in summary['stages'].items():
+            rate = f"{stats['items_per_s']:,.0f} {stats['unit']}" if stats['items'] else ""
+            print(f"{name:<9} {stats['wall_s']:8.3f} {stats['cpu_s']:8.3f} {mb(stats['peak_rss'])} "
+                  f"{stats['items']:>13,} {rate:>20}")
+        total = summary['total']
+        print("-"*78)
+        print(f"{'total':<9} {total['wall_s']:8.3f} {total['cpu_s']:8.3f} {mb(total['peak_rss'])} "
+              f"{total['tokens']:>13,} {total['tokens_per_s']:>13,.0f} tokens")
+        print("="*78 + "\n")
+
+
+def _no_stage(name, items=0):
+    return nullcontext()
+
+
+def count_files_profiled(paths, profiler, tokenizer=DEFAULT_TOKENIZER, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Single-process count_files() with read/tokenize/filter/count timed separately.
+
+    Same code paths and results as count_range(), but with the work handed
+    from stage to stage one chunk at a time.
+    """
+    counters = {}
+    stop_words = tokenizer.stop_words
+    for path in paths:
+        if not uses_mmap(path, tokenizer):
+            # Filtering is normally fused into tokenizing; split it out to time it
+            chunks = profiler.wrap("read", read_chunks(path, chunk_size))
+            batches = profiler.wrap("tokenize", iter_word_batches(chunks, tokenizer.without_stop_words()))
+            if stop_words:
+                batches = profiler.wrap("filter", ([w for w in batch if w not in stop_words]
+                                                   for batch in batches))
+            counter = Counter()
+            for batch in batches:
+                with profiler.stage("count", len(batch)):
+                    counter.update(batch)
+        else:
+            # The mapped pages are only read while the regex scans them, so
+            # for plain files the disk time shows up under "tokenize"
+            windows = profiler.wrap("read", _mmap_windows(path, 0, None, chunk_size, tokenizer),
+                                    size=lambda window: window[2] - window[1])
+            batches = profiler.wrap("tokenize", (_window_tokens(*window, tokenizer)
+                                                 for window in windows))
+            raw, counter = Counter(), Counter()
+            for tokens in batches:
+                with profiler.stage("count"):
+                    (counter if tokens and isinstance(tokens[0], str) else raw).update(tokens)
+            with profiler.stage("filter", len(raw) + len(counter)):
+                counter = _fold_tokens(raw, counter, tokenizer)
+            # Stop words go after counting here: report the words that were
+            # kept, the same figure the streaming path gives for "count"
+            profiler.count("count", sum(counter.values()))
+        counters[path] = counter
+    return counters
+
+
+# ============================================================================
+# Corpus mode: turn files, directories and globs into a list of files
+# ============================================================================
+
+def expand_paths(patterns):
+    """
+    Expand the command-line arguments into a list of files.
+
+    - a directory is searched recursively
+    - a pattern with *, ? or [ is a glob (** matches any depth)
+    - anything else is taken as a file name
+
+    Files are returned sorted within each argument and without duplicates.
+    Arguments that match nothing are reported and skipped.
+    """
+    files = {}
+    for pattern in patterns:
+        if any(char in pattern for char in '*?['):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+
+        found = []
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                found.extend(sorted(str(p) for p in path.rglob('*') if p.is_file()))
+            elif path.is_file():
+                found.append(match)
+
+        if not found:
+            print(f"❌ Error: File '{pattern}' not found")
+        files.update(dict.fromkeys(found))
+    return list(files)
+
+
+def display_results(top_words, total_words, unique_words, unit="words"):
     """
     Display results in a nice format.
     
     THIS ONE IS DONE FOR YOU! 🎉
+    unit names what was counted ("words", "2-grams", ...).
     """
     print("\n" + "="*60)
     print("📊 WORD FREQUENCY ANALYSIS RESULTS")
     print("="*60)
     print(f"Total words: {total_words}")
-    print(f"Unique words: {unique_words}")
-    print(f"\nTop {len(top_words)} most common words:")
+    print(f"Unique {unit}: {unique_words}")
+    print(f"\nTop {len(top_words)} most common {unit}:")
     print("-"*60)
     
     # Find longest word for formatting
@@ -184,25 +1440,72 @@ def display_results(top_words, total_words, unique_words):
     print("="*60 + "\n")
 
 
+def display_approx_results(top, total_words, sketch):
+    """Like display_results, for --approx: estimates with their error bars."""
+    cms = sketch.frequencies
+    print("\n" + "="*60)
+    print("📊 APPROXIMATE WORD FREQUENCY RESULTS")
+    print("="*60)
+    print(f"Total words: {total_words}")
+    print(f"Sketch: top {sketch.heavy_hitters.capacity} candidates, "
+          f"{cms.width}x{cms.depth} Count-Min ({cms.sizeof() / 1024:.0f} KB)")
+    print(f"Counts are upper bounds; lower bounds hold with probability {1 - cms.delta:.1%}")
+    print(f"\nTop {len(top)} most common words (estimate [low - high]):")
+    print("-"*60)
+    
+    max_word_len = max(len(word) for word, *_ in top) if top else 10
+    
+    for i, (word, estimate, low, high) in enumerate(top, 1):
+        bar = "█" * int(estimate / top[0][1] * 30)
+        print(f"{i:2d}. {word:<{max_word_len}} {estimate:>7} [{low} - {high}] {bar}")
+    
+    print("="*60 + "\n")
+
+
+def display_collocations(collocations, min_count):
+    """Show the PMI ranking from NGramCounter.collocations()."""
+    print(f"🔗 Top {len(collocations)} collocations by PMI (seen at least {min_count} times):")
+    print("-"*60)
+    if not collocations:
+        print("   (none - try a lower --min-count)")
+    max_len = max((len(phrase) for phrase, _, _ in collocations), default=10)
+    for i, (phrase, pmi, count) in enumerate(collocations, 1):
+        print(f"{i:2d}. {phrase:<{max_len}}  PMI {pmi:6.2f}  ({count}x)")
+    print("="*60 + "\n")
+
+
+def display_file_summary(filepath, top_words, total_words, unique_words=None):
+    """One compact block per file in corpus mode."""
+    top = ", ".join(f"{word} ({count})" for word, count in top_words)
+    unique = f", {unique_words} unique" if unique_words is not None else ""
+    print(f"📄 {filepath}: {total_words} words{unique}")
+    print(f"   {top or '(no words)'}")
+
+
 def export_to_json(top_words, output_file):
     """
     TODO #6: Export results to JSON file
     
     Algorithm:
-    1. Convert top_words to a dict: data = dict(top_words)
-    2. Open file in write mode: with open(output_file, 'w') as f:
-    3. Write JSON: json.dump(data, f, indent=2)
-    4. Print success message
-    5. Handle errors with try/except
+    1. Open file in write mode: with open(output_file, 'w') as f:
+    2. Write the object one "word": count pair at a time - the same text
+       json.dump(dict(top_words), f, indent=2) gives, without building the
+       whole dict (or the whole JSON string) in memory first
+    3. Print success message
+    4. Handle errors with try/except
     
     Args:
-        top_words (list): List of (word, count) tuples
+        top_words (iterable): (word, count) tuples - a list, or a generator
+            streaming the full vocabulary
         output_file (str): Output file path
     """
-    data = dict(top_words)
     try:
         with open(output_file, 'w') as f:
-            json.dump(data, f, indent=2)
+            separator = "{\n  "
+            for word, count in top_words:
+                f.write(f"{separator}{json.dumps(word)}: {count}")
+                separator = ",\n  "
+            f.write("{}" if separator == "{\n  " else "\n}")
         print(f"✅ Results exported to JSON file: {output_file}")
     except Exception as e:
         print(f"❌ Error exporting to JSON: {e}")
@@ -221,7 +1524,8 @@ def export_to_csv(top_words, output_file):
     6. Handle errors with try/except
     
     Args:
-        top_words (list): List of (word, count) tuples
+        top_words (iterable): (word, count) tuples - writerows() streams
+            a generator row by row
         output_file (str): Output file path
     """
     try:
@@ -234,47 +1538,238 @@ def export_to_csv(top_words, output_file):
         print(f"❌ Error exporting to CSV: {e}")
 
 
-def analyze_file(filepath, top_n=10, filter_stop_words=True, export_format=None, output_file=None):
+def export_to_jsonl(top_words, output_file):
+    """Export as JSON Lines: one {"word": ..., "count": ...} object per line, streamed."""
+    try:
+        with open(output_file, 'w') as f:
+            for word, count in top_words:
+                f.write(json.dumps({"word": word, "count": count}) + "\n")
+        print(f"✅ Results exported to JSON Lines file: {output_file}")
+    except Exception as e:
+        print(f"❌ Error exporting to JSON Lines: {e}")
+
+
+# ============================================================================
+# Binary vocabulary: columnar (all words, then all counts), sorted by word
+# ============================================================================
+# Layout:  header | words, UTF-8, joined by NUL bytes | counts array
+#
+# Loading is two C-speed bulk operations - one bytes.split() for the words
+# and one array.frombytes() for the counts - instead of parsing a row at a
+# time. Counts use the smallest integer width that fits the largest count.
+# Words are sorted, so two files can also be merge-joined without hashing.
+
+def save_vocabulary(word_counts, output_file):
+    """
+    Write a Counter (or any (word, count) pairs) as a binary .vocab file.
+
+    Returns:
+        int: number of words written
+    """
+    rows = sorted(word_counts.items() if hasattr(word_counts, 'items') else word_counts)
+    counts = array('Q', (count for _, count in rows))
+    largest = max(counts, default=0)
+    width = next(size for size in _COUNT_TYPECODES if largest < 1 << 8 * size)
+    counts = array(_COUNT_TYPECODES[width], counts)
+    total = sum(counts)  # before the byteswap below scrambles the values
+    if sys.byteorder == 'big':
+        counts.byteswap()
+
+    with open(output_file, 'wb') as f:
+        f.write(VOCAB_HEADER.pack(VOCAB_MAGIC, 0, 0, 0, 0))  # filled in at the end
+        blob_size = 0
+        for i, (word, _) in enumerate(rows):
+            data = word.encode('utf-8')
+            if b"\0" in data:
+                raise ValueError(f"word {word!r} contains a NUL character")
+            if i:
+                f.write(b"\0")
+                blob_size += 1
+            f.write(data)
+            blob_size += len(data)
+        counts.tofile(f)
+        f.seek(0)
+        f.write(VOCAB_HEADER.pack(VOCAB_MAGIC, len(rows), total, blob_size, width))
+    return len(rows)
+
+
+def load_vocabulary(input_file):
+    """Read a .vocab file back into a Counter."""
+    with open(input_file, 'rb') as f:
+        magic, n_words, _, blob_size, width = VOCAB_HEADER.unpack(f.read(VOCAB_HEADER.size))
+        if magic != VOCAB_MAGIC:
+            raise ValueError(f"{input_file} is not a vocabulary file")
+        blob = f.read(blob_size)
+        counts = array(_COUNT_TYPECODES[width])
+        counts.frombytes(f.read(n_words * width))
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    words = blob.decode('utf-8').split("\0") if n_words else []
+    counter = Counter()
+    dict.update(counter, zip(words, counts))  # plain dict update: no per-word counting
+    return counter
+
+
+def export_to_vocab(top_words, output_file):
+    """Export as a binary vocabulary file (see save_vocabulary)."""
+    try:
+        n_words = save_vocabulary(top_words, output_file)
+        print(f"✅ {n_words} words exported to vocabulary file: {output_file}")
+    except Exception as e:
+        print(f"❌ Error exporting vocabulary: {e}")
+
+
+def analyze_file(filepath, top_n=10, filter_stop_words=True, export_format=None, output_file=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, workers=1, approx=None, ngram=1,
+                 min_count=DEFAULT_MIN_COUNT, index_path=None, export_all=False, profiler=None,
+                 tokenizer=None):
+    """Analyze a single file (see analyze_files)."""
+    analyze_files([filepath], top_n, filter_stop_words, export_format, output_file,
+                  chunk_size, workers, approx, ngram, min_count, index_path, export_all,
+                  profiler, tokenizer)
+
+
+def analyze_files(patterns, top_n=10, filter_stop_words=True, export_format=None, output_file=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, workers=1, approx=None, ngram=1,
+                  min_count=DEFAULT_MIN_COUNT, index_path=None, export_all=False,
+                  profiler=None, tokenizer=None):
     """
     Main analysis function - orchestrates everything.
     
     THIS ONE IS DONE FOR YOU! 🎉
-    It calls all your functions in the right order.
+    It wires the streaming pipeline together in the right order.
+    The stages are generators, so they all run together while counting.
+    With several files, each gets a short summary before the combined results.
+    approx (a dict of TopKSketch settings) swaps the exact Counter for a sketch,
+    ngram > 1 counts phrases of ngram words and ranks collocations.
+    index_path keeps the counts in a FrequencyIndex, so unchanged files are skipped.
+    export_all exports every word instead of only the top N.
+    profiler (a StageProfiler) times each step; printing is not timed.
+    tokenizer (a Tokenizer) sets the word rules and stop words - by default
+    tokenize()'s rules and STOP_WORDS; filter_stop_words=False keeps the stop words.
     """
-    print(f"\n📖 Reading file: {filepath}")
+    stage = profiler.stage if profiler else _no_stage
+    tokenizer = tokenizer or DEFAULT_TOKENIZER
+    if not filter_stop_words:
+        tokenizer = tokenizer.without_stop_words()
     
-    # Step 1: Read file
-    text = read_file(filepath)
-    if not text:
+    def export(rows):
+        with stage("export"):
+            if profiler:
+                rows = profiler.counted("export", rows)
+            export_results(rows, export_format, output_file)
+    
+    # Step 1: Find the files (they are read lazily, chunk by chunk)
+    paths = expand_paths(patterns)
+    if not paths:
         return
+    if len(paths) == 1:
+        print(f"\n📖 Reading file: {paths[0]}")
+    else:
+        print(f"\n📖 Reading {len(paths)} files")
     
-    # Step 2: Tokenize
-    print("🔤 Tokenizing text...")
-    words = tokenize(text)
+    if index_path is not None:
+        # Steps 2-6 from the index: only new or changed files are counted
+        with FrequencyIndex(index_path, tokenizer) as index:
+            with stage("count"):
+                update_index(index, paths, workers, chunk_size)
+            if len(paths) > 1:
+                print()
+                for path in paths:
+                    display_file_summary(path, index.top_words([path], top_n),
+                                         *index.totals([path]))
+            with stage("top-N", top_n):
+                top_words = index.top_words(paths, top_n)
+                totals = index.totals(paths)
+            if profiler:
+                profiler.tokens = totals[0]
+            display_results(top_words, *totals)
+            export(index.iter_counts(paths) if export_all else top_words)
+        return
     
-    # Step 3: Remove stop words (optional)
-    if filter_stop_words:
-        print("🚫 Filtering stop words...")
-        words = remove_stop_words(words, use_stop_words=True)
+    if workers > 1:
+        # Steps 2-4 on every core: each worker runs the whole pipeline
+        # over its own slice of a file, then the Counters are merged
+        print(f"⚡ Counting word frequencies with {workers} worker processes...")
+    else:
+        # Steps 2-4 run together, one file after another
+        print("🔤 Tokenizing text...")
+        if tokenizer.stop_words:
+            print("🚫 Filtering stop words...")
+        print("🔢 Counting word frequencies...")
+    if profiler and workers <= 1 and approx is None and ngram == 1:
+        counters = count_files_profiled(paths, profiler, tokenizer, chunk_size)
+    else:
+        with stage("count"):
+            counters = count_files(paths, workers, tokenizer, chunk_size, approx, ngram)
     
-    # Step 4: Count frequencies
-    print("🔢 Counting word frequencies...")
-    counter = count_frequencies(words)
+    if len(counters) > 1:
+        print()
+        for path, result in counters.items():
+            if ngram > 1:
+                display_file_summary(path, result.most_common(top_n), result.total, len(result))
+            elif approx is None:
+                display_file_summary(path, get_top_words(result, n=top_n),
+                                     sum(result.values()), len(result))
+            else:
+                display_file_summary(path, result.most_common(top_n), result.total)
+    
+    if ngram > 1:
+        with stage("count"):
+            ngrams = merge_ngrams(counters.values())
+        with stage("top-N", top_n):
+            top_words = ngrams.most_common(top_n)
+            collocations = ngrams.collocations(top_n, min_count)
+        if profiler:
+            profiler.tokens = ngrams.total
+        display_results(top_words, ngrams.total, len(ngrams), unit=f"{ngram}-grams")
+        display_collocations(collocations, min_count)
+        export(ngrams.most_common(None) if export_all else top_words)
+        return
+    
+    if approx is not None:
+        with stage("count"):
+            sketch = merge_sketches(counters.values())
+        with stage("top-N", top_n):
+            top = sketch.top(top_n)
+        if profiler:
+            profiler.tokens = sketch.total
+        display_approx_results(top, sketch.total, sketch)
+        top_words = [(word, estimate) for word, estimate, _, _ in top]
+        export(top_words)
+        return
+    
+    # Per-file results are printed already, so merging may reuse their Counters
+    with stage("count"):
+        counter = merge_counters(counters.values())
     
     # Step 5: Get top N words
-    top_words = get_top_words(counter, n=top_n)
+    with stage("top-N", top_n):
+        top_words = get_top_words(counter, n=top_n)
     
     # Step 6: Display results
-    total_words = len(words)
+    total_words = sum(counter.values())
     unique_words = len(counter)
+    if profiler:
+        profiler.tokens = total_words
     display_results(top_words, total_words, unique_words)
     
     # Step 7: Export (optional)
+    export(counter.most_common() if export_all else top_words)
+
+
+EXPORTERS = {
+    'json': export_to_json,
+    'csv': export_to_csv,
+    'jsonl': export_to_jsonl,
+    'vocab': export_to_vocab,
+}
+
+
+def export_results(top_words, export_format, output_file):
+    """Export to the chosen format, if any."""
     if export_format and output_file:
-        if export_format == 'json':
-            export_to_json(top_words, output_file)
-        elif export_format == 'csv':
-            export_to_csv(top_words, output_file)
+        EXPORTERS[export_format](top_words, output_file)
 
 
 def main():
@@ -293,12 +1788,27 @@ Examples:
   %(prog)s sample.txt --no-filter
   %(prog)s sample.txt --export json --output results.json
   %(prog)s sample.txt --export csv --output results.csv
+  %(prog)s big.txt --workers 8
+  %(prog)s chapter*.txt notes/ --top 5
+  %(prog)s "logs/**/*.gz" --workers 0
+  %(prog)s huge.txt --approx --top 1000 --capacity 20000
+  %(prog)s sample.txt --ngram 2 --min-count 3
+  %(prog)s "logs/**/*.gz" --index words.db --export csv -o words.csv
+  %(prog)s /var/log/app.log --follow --window-seconds 300
+  %(prog)s corpus/ --all --export jsonl -o vocabulary.jsonl
+  %(prog)s corpus/ --export vocab -o corpus.vocab
+  %(prog)s big.txt --profile --profile-json profile.json --pstats big.pstats
+  %(prog)s roman.txt --tokenizer unicode --stop-words en,fr
+  %(prog)s app.log --token-pattern "[a-z]+(?:-[a-z]+)*" --stop-words my_words.txt
         """
     )
     
     parser.add_argument(
-        'file',
-        help='Text file to analyze'
+        'files',
+        nargs='+',
+        metavar='PATH',
+        help='Text files, directories (searched recursively) or glob patterns; '
+             '.gz/.bz2/.xz are decompressed on the fly'
     )
     
     parser.add_argument(
@@ -314,10 +1824,38 @@ Examples:
         help='Don\'t filter stop words'
     )
     
+    parser.add_argument(
+        '--tokenizer',
+        choices=['ascii', 'unicode'],
+        default='ascii',
+        help='ascii: [a-z]+ only (default); unicode: letters and digits in any '
+             'language, contractions kept, case-folded'
+    )
+    
+    parser.add_argument(
+        '--token-pattern',
+        metavar='REGEX',
+        help='Your own word regex instead of --tokenizer (no whitespace inside a word)'
+    )
+    
+    parser.add_argument(
+        '--case-sensitive',
+        action='store_true',
+        help='Keep upper/lower case apart (unicode and --token-pattern only)'
+    )
+    
+    parser.add_argument(
+        '--stop-words',
+        metavar='LISTS',
+        default='en',
+        help='Comma-separated stop-word lists: language codes (en, de, fr, es) '
+             'or files with one word per line (default: en)'
+    )
+    
     parser.add_argument(
         '--export',
-        choices=['json', 'csv'],
-        help='Export format (json or csv)'
+        choices=list(EXPORTERS),
+        help='Export format (json, csv, jsonl or vocab - binary, always all words)'
     )
     
     parser.add_argument(
@@ -325,20 +1863,207 @@ Examples:
         help='Output file path (required if --export is used)'
     )
     
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        dest='export_all',
+        help='Export the whole vocabulary, not just the top N (streamed row by row)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Bytes read per chunk (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Worker processes for counting, 0 = one per CPU core (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--approx',
+        action='store_true',
+        help='Approximate top-N in fixed memory (Space-Saving + Count-Min Sketch)'
+    )
+    
+    parser.add_argument(
+        '--capacity',
+        type=int,
+        help='--approx: candidate words kept (default: max(1000, 10 x --top))'
+    )
+    
+    parser.add_argument(
+        '--epsilon',
+        type=float,
+        default=DEFAULT_EPSILON,
+        help=f'--approx: max over-count as a fraction of all words (default: {DEFAULT_EPSILON})'
+    )
+    
+    parser.add_argument(
+        '--delta',
+        type=float,
+        default=DEFAULT_DELTA,
+        help=f'--approx: probability the epsilon bound is exceeded (default: {DEFAULT_DELTA})'
+    )
+    
+    parser.add_argument(
+        '--ngram', '-n',
+        type=int,
+        default=1,
+        help='Count phrases of N words and rank collocations (default: 1 = single words)'
+    )
+    
+    parser.add_argument(
+        '--min-count',
+        type=int,
+        default=DEFAULT_MIN_COUNT,
+        help=f'--ngram: minimum count for a collocation to be ranked (default: {DEFAULT_MIN_COUNT})'
+    )
+    
+    parser.add_argument(
+        '--index',
+        metavar='DB',
+        help='Keep counts in a SQLite index; later runs only read new or changed files'
+    )
+    
+    parser.add_argument(
+        '--follow', '-f',
+        action='store_true',
+        help='Keep reading a growing file (like tail -F) and refresh the top N'
+    )
+    
+    parser.add_argument(
+        '--window-tokens',
+        type=int,
+        help='--follow: only count the most recent N words'
+    )
+    
+    parser.add_argument(
+        '--window-seconds',
+        type=float,
+        help='--follow: only count words from the last N seconds'
+    )
+    
+    parser.add_argument(
+        '--refresh',
+        type=float,
+        default=2.0,
+        help='--follow: seconds between display refreshes (default: 2)'
+    )
+    
+    parser.add_argument(
+        '--from-start',
+        action='store_true',
+        help='--follow: count what is already in the file too (default: only new text)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Report wall time, CPU time, peak memory and tokens/sec per stage'
+    )
+    
+    parser.add_argument(
+        '--profile-json',
+        metavar='FILE',
+        help='Also write the profile as JSON (implies --profile)'
+    )
+    
+    parser.add_argument(
+        '--pstats',
+        metavar='FILE',
+        help='Also run under cProfile and save the stats for pstats/snakeviz (implies --profile)'
+    )
+    
     args = parser.parse_args()
     
     # Validate arguments
     if args.export and not args.output:
         parser.error("--output is required when --export is specified")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.ngram < 1:
+        parser.error("--ngram must be 1 or more")
+    if args.ngram > 1 and args.approx:
+        parser.error("--ngram and --approx can't be combined")
+    if args.index and (args.approx or args.ngram > 1):
+        parser.error("--index only stores exact word counts (no --approx or --ngram)")
+    if args.export == 'vocab':
+        args.export_all = True
+    if args.export_all and (args.approx or args.follow):
+        parser.error("--all/--export vocab need exact counts (no --approx or --follow)")
+    if args.case_sensitive and args.tokenizer == 'ascii' and not args.token_pattern:
+        parser.error("--case-sensitive needs --tokenizer unicode or --token-pattern")
+    try:
+        stop_words = load_stop_words(args.stop_words.split(',')) if not args.no_filter else ()
+        tokenizer = Tokenizer('regex' if args.token_pattern else args.tokenizer,
+                              args.token_pattern, stop_words, not args.case_sensitive)
+    except OSError as e:
+        parser.error(f"can't read stop words: {e}")
+    except (ValueError, re.error) as e:
+        parser.error(f"bad tokenizer: {e}")
+    if args.follow:
+        if len(args.files) != 1 or args.approx or args.ngram > 1 or args.index:
+            parser.error("--follow takes exactly one file and no --approx/--ngram/--index")
+        top_words = follow_file(args.files[0], args.top, tokenizer,
+                                args.window_tokens, args.window_seconds, args.refresh,
+                                args.from_start)
+        export_results(top_words, args.export, args.output)
+        return
+    workers = args.workers or os.cpu_count() or 1
+    approx = None
+    if args.approx:
+        if not (0 < args.epsilon < 1 and 0 < args.delta < 1):
+            parser.error("--epsilon and --delta must be between 0 and 1")
+        approx = {
+            'capacity': args.capacity or max(1000, 10 * args.top),
+            'epsilon': args.epsilon,
+            'delta': args.delta,
+        }
+    
+    profiler = StageProfiler() if args.profile or args.profile_json or args.pstats else None
+    function_profiler = cProfile.Profile() if args.pstats else None
+    if function_profiler:
+        function_profiler.enable()
     
     # Run analysis
-    analyze_file(
-        filepath=args.file,
+    analyze_files(
+        patterns=args.files,
         top_n=args.top,
         filter_stop_words=not args.no_filter,
         export_format=args.export,
-        output_file=args.output
+        output_file=args.output,
+        chunk_size=args.chunk_size,
+        workers=workers,
+        approx=approx,
+        ngram=args.ngram,
+        min_count=args.min_count,
+        index_path=args.index,
+        export_all=args.export_all,
+        profiler=profiler,
+        tokenizer=tokenizer
     )
+    
+    if function_profiler:
+        function_profiler.disable()
+        function_profiler.dump_stats(args.pstats)
+    if profiler:
+        profiler.report()
+        if args.pstats:
+            print(f"✅ cProfile stats written to {args.pstats} (python -m pstats {args.pstats})")
+        if args.profile_json:
+            report = dict(profiler.summary(), config={
+                'files': args.files, 'workers': workers, 'chunk_size': args.chunk_size,
+                'approx': args.approx, 'ngram': args.ngram, 'index': args.index,
+                'filter_stop_words': not args.no_filter, 'tokenizer': repr(tokenizer),
+            })
+            with open(args.profile_json, 'w') as f:
+                json.dump(report, f, indent=2)
+            print(f"✅ Profile written to {args.profile_json}")
 
 
 if __name__ == "__main__":